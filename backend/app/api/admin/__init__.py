@@ -1,5 +1,5 @@
 """Admin API module"""
 
-from . import articles, crawler, analytics
+from . import articles, crawler, analytics, duplicates, failures, cache
 
-__all__ = ["articles", "crawler", "analytics"]
+__all__ = ["articles", "crawler", "analytics", "duplicates", "failures", "cache"]
@@ -3,45 +3,51 @@
 from typing import List
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_, and_
+from sqlalchemy import select, func, and_, tuple_
+from sqlalchemy.orm import undefer, undefer_group
 
 from app.database import get_db
-from app.models import Article, Source
+from app.models import Article, Source, CONTENT_GROUP
 from app.schemas import (
     ArticleResponse,
     ArticleDetailResponse,
+    ArticleDetailBatchResponse,
+    ArticleSearchResponse,
     ArticleUpdateRequest,
     BatchDeleteRequest
 )
+from app.services.cache_service import article_cache
+from app.services.source_service import source_name_cache, UNKNOWN_SOURCE_NAME
 from app.services.translation_service import translate_article_html, detect_chinese_content
+from app.utils.batch import parse_id_list, BATCH_MAX_IDS
+from app.utils.fulltext import build_tsquery
+from app.utils.pagination import (
+    apply_keyset,
+    keyset_page,
+    encode_score_cursor,
+    decode_score_cursor,
+    article_count_cache
+)
 
 router = APIRouter(prefix="/articles", tags=["Admin-Articles"])
 
+# Columns needed by ArticleResponse (list queries never read the content fields)
+LIST_COLUMNS = [getattr(Article, name) for name in ArticleResponse.model_fields]
 
-@router.get("/", response_model=dict)
-async def get_articles(
-    page: int = Query(1, ge=1, description="Page number"),
-    page_size: int = Query(20, ge=1, le=100, description="Page size"),
-    keyword: str = Query(None, description="Search keyword"),
-    category: str = Query(None, description="Category filter"),
-    content_source: str = Query(None, description="Content source"),
-    from_date: str = Query(None, description="From date YYYY-MM-DD"),
-    to_date: str = Query(None, description="To date YYYY-MM-DD"),
-    db: AsyncSession = Depends(get_db)
-):
-    """Get article list with pagination, search, and filters"""
 
-    query = select(Article).where(Article.is_deleted == False)
+def _search_query(keyword: str):
+    """tsquery for a search box input (400 when it has no terms)"""
+    try:
+        return build_tsquery(keyword)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    if keyword:
-        search_filter = or_(
-            Article.title.ilike(f"%{keyword}%"),
-            Article.summary.ilike(f"%{keyword}%"),
-            Article.author.ilike(f"%{keyword}%")
-        )
-        query = query.where(search_filter)
 
+def _apply_filters(query, category: str, content_source: str, from_date: str, to_date: str):
+    """Category / content source / date range filters shared by list and search"""
     if category:
         query = query.where(Article.category == category)
 
@@ -55,26 +61,159 @@ async def get_articles(
         to_dt = datetime.strptime(to_date, "%Y-%m-%d").replace(hour=23, minute=59, second=59)
         query = query.where(Article.published_at <= to_dt)
 
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
+    return query
 
-    query = query.order_by(Article.published_at.desc())
-    query = query.offset((page - 1) * page_size).limit(page_size)
+
+@router.get("/", response_model=dict, response_class=ORJSONResponse)
+async def get_articles(
+    page: int = Query(1, ge=1, description="Page number"),
+    page_size: int = Query(20, ge=1, le=100, description="Page size"),
+    keyword: str = Query(None, description="Search keyword"),
+    category: str = Query(None, description="Category filter"),
+    content_source: str = Query(None, description="Content source"),
+    from_date: str = Query(None, description="From date YYYY-MM-DD"),
+    to_date: str = Query(None, description="To date YYYY-MM-DD"),
+    cursor: str = Query(None, description="next_cursor of the previous page (keyset pagination, page is ignored)"),
+    with_total: bool = Query(None, description="Include total count (default: true with page, false with cursor)"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get article list with pagination, search, and filters (keyword: full-text match, newest first)"""
+
+    query = select(*LIST_COLUMNS).where(Article.is_deleted == False)
+
+    if keyword:
+        query = query.where(Article.search_vector.op("@@")(_search_query(keyword)))
+
+    query = _apply_filters(query, category, content_source, from_date, to_date)
+
+    total = None
+    if with_total if with_total is not None else cursor is None:
+        async def count():
+            total_result = await db.execute(select(func.count()).select_from(query.subquery()))
+            return total_result.scalar()
+        cache_key = ("admin", keyword, category, content_source, from_date, to_date)
+        total = await article_count_cache.get(cache_key, count)
+
+    if cursor:
+        try:
+            query = apply_keyset(query, Article.published_at, Article.id, cursor, page_size)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    else:
+        query = query.order_by(Article.published_at.desc(), Article.id.desc())
+        query = query.offset((page - 1) * page_size).limit(page_size + 1)
 
     result = await db.execute(query)
-    articles = result.scalars().all()
+    articles, next_cursor = keyset_page(result.all(), page_size)
 
     return {
         "total": total,
-        "page": page,
+        "page": None if cursor else page,
         "page_size": page_size,
-        "total_pages": (total + page_size - 1) // page_size,
+        "total_pages": (total + page_size - 1) // page_size if total is not None else None,
+        "next_cursor": next_cursor,
+        "has_more": next_cursor is not None,
         "items": [ArticleResponse.model_validate(article) for article in articles]
     }
 
 
-@router.get("/{article_id}", response_model=ArticleDetailResponse)
+@router.get("/search", response_model=dict, response_class=ORJSONResponse)
+async def search_articles(
+    q: str = Query(..., min_length=1, max_length=200, description="Search terms (space-separated, all must match)"),
+    page_size: int = Query(20, ge=1, le=100, description="Page size"),
+    category: str = Query(None, description="Category filter"),
+    content_source: str = Query(None, description="Content source"),
+    from_date: str = Query(None, description="From date YYYY-MM-DD"),
+    to_date: str = Query(None, description="To date YYYY-MM-DD"),
+    cursor: str = Query(None, description="next_cursor of the previous page"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Full-text search over title, summary, author and body, ranked by relevance (keyset pagination)"""
+
+    tsquery = _search_query(q)
+    rank = func.ts_rank_cd(Article.search_vector, tsquery)
+    query = (
+        select(*LIST_COLUMNS, rank.label("rank"))
+        .where(Article.is_deleted == False, Article.search_vector.op("@@")(tsquery))
+    )
+    query = _apply_filters(query, category, content_source, from_date, to_date)
+
+    if cursor:
+        try:
+            last_rank, last_id = decode_score_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        query = query.where(tuple_(rank, Article.id) < tuple_(last_rank, last_id))
+
+    result = await db.execute(query.order_by(rank.desc(), Article.id.desc()).limit(page_size + 1))
+    rows, next_cursor = keyset_page(result.all(), page_size, sort_attr="rank", encode=encode_score_cursor)
+
+    return {
+        "page_size": page_size,
+        "next_cursor": next_cursor,
+        "has_more": next_cursor is not None,
+        "items": [ArticleSearchResponse.model_validate(row) for row in rows]
+    }
+
+
+@router.get("/batch", response_model=ArticleDetailBatchResponse, response_class=ORJSONResponse)
+async def get_article_details_batch(
+    ids: str = Query(..., description=f"Comma-separated article IDs (max {BATCH_MAX_IDS})"),
+    fields: str = Query(None, description="Comma-separated ArticleDetailResponse fields (default: all)"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get several article details in one query, in request order; unknown/deleted ids are listed in missing"""
+
+    try:
+        article_ids = parse_id_list(ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    requested = None
+    if fields:
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = requested - ArticleDetailResponse.model_fields.keys()
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+        requested.add("id")
+
+    # Only load the content columns that were asked for
+    content_columns = [
+        column for column in (Article.content_text, Article.content_html, Article.translated_content_html)
+        if requested is None or column.key in requested
+    ]
+    result = await db.execute(
+        select(Article)
+        .where(and_(Article.id.in_(article_ids), Article.is_deleted == False))
+        .options(*(undefer(column) for column in content_columns))
+    )
+    articles = {article.id: article for article in result.scalars().all()}
+
+    source_names = await source_name_cache.get_names(db, (a.source_id for a in articles.values()))
+    items = []
+    for article_id in article_ids:
+        article = articles.get(article_id)
+        if article is None:
+            continue
+        source_name = source_names.get(article.source_id, UNKNOWN_SOURCE_NAME)
+        if requested is None:
+            detail = ArticleDetailResponse.model_validate(article)
+            detail.source_name = source_name
+            items.append(detail)
+        else:
+            items.append({
+                name: source_name if name == "source_name" else getattr(article, name)
+                for name in ArticleDetailResponse.model_fields if name in requested
+            })
+
+    # Partial items would fail ArticleDetailResponse validation, so bypass response_model
+    return ORJSONResponse(content=jsonable_encoder({
+        "items": items,
+        "missing": [article_id for article_id in article_ids if article_id not in articles],
+    }))
+
+
+@router.get("/{article_id}", response_model=ArticleDetailResponse, response_class=ORJSONResponse)
 async def get_article_detail(
     article_id: int,
     db: AsyncSession = Depends(get_db)
@@ -82,16 +221,18 @@ async def get_article_detail(
     """Get article detail"""
 
     result = await db.execute(
-        select(Article).where(
-            and_(Article.id == article_id, Article.is_deleted == False)
-        )
+        select(Article)
+        .where(and_(Article.id == article_id, Article.is_deleted == False))
+        .options(undefer_group(CONTENT_GROUP))
     )
     article = result.scalar_one_or_none()
 
     if not article:
         raise HTTPException(status_code=404, detail="Article not found")
 
-    return ArticleDetailResponse.model_validate(article)
+    detail = ArticleDetailResponse.model_validate(article)
+    detail.source_name = await source_name_cache.get_name(db, article.source_id)
+    return detail
 
 
 @router.put("/{article_id}", response_model=ArticleResponse)
@@ -118,6 +259,7 @@ async def update_article(
 
     await db.commit()
     await db.refresh(article)
+    await article_cache.invalidate_article(article_id)
 
     return ArticleResponse.model_validate(article)
 
@@ -141,6 +283,8 @@ async def delete_article(
 
     article.is_deleted = True
     await db.commit()
+    article_count_cache.clear()
+    await article_cache.invalidate_article(article_id)
 
     return {"message": "Deleted successfully", "article_id": article_id}
 
@@ -165,6 +309,8 @@ async def batch_delete_articles(
         deleted_count += 1
 
     await db.commit()
+    article_count_cache.clear()
+    await article_cache.invalidate_articles([article.id for article in articles])
 
     return {
         "message": "Batch delete successful",
@@ -183,7 +329,9 @@ async def translate_article(
 
     # 获取文章
     result = await db.execute(
-        select(Article).where(Article.id == article_id, Article.is_deleted == False)
+        select(Article)
+        .where(Article.id == article_id, Article.is_deleted == False)
+        .options(undefer_group(CONTENT_GROUP))
     )
     article = result.scalar_one_or_none()
 
@@ -211,6 +359,7 @@ async def translate_article(
             # 中文文章不需要翻译，直接返回原HTML
             article.translated_content_html = article.content_html
             await db.commit()
+            await article_cache.invalidate_article(article.id, lists=False)
 
             return {
                 "success": True,
@@ -228,6 +377,7 @@ async def translate_article(
         # 更新文章的翻译字段
         article.translated_content_html = translated_html
         await db.commit()
+        await article_cache.invalidate_article(article.id, lists=False)
 
         return {
             "success": True,
@@ -0,0 +1,21 @@
+"""Admin API - Article Response Cache"""
+
+from fastapi import APIRouter
+
+from app.schemas import ArticleCacheStats
+from app.services.cache_service import article_cache
+
+router = APIRouter(prefix="/cache", tags=["Admin-Cache"])
+
+
+@router.get("/stats", response_model=ArticleCacheStats)
+async def get_cache_stats():
+    """Hit/miss counters of the article cache (this worker process only)"""
+    return ArticleCacheStats(**article_cache.report())
+
+
+@router.post("/invalidate")
+async def invalidate_cache():
+    """Invalidate all cached article lists"""
+    await article_cache.invalidate_lists()
+    return {"message": "Article list cache invalidated"}
@@ -6,13 +6,17 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.database import get_db
-from app.models import CrawlerTask
+from app.models import CrawlerTask, CrawlSchedule
 from app.schemas import (
     CrawlerConfigRequest,
     CrawlerTaskResponse,
-    CrawlerStatusResponse
+    CrawlerStatusResponse,
+    CrawlScheduleResponse,
+    CrawlScheduleUpdateRequest
 )
 from app.services.crawler_service import crawler_service
+from app.services.revisit_service import revisit_scheduler
+from app.utils import timezone as tz
 from crawler.crawler_factory import CrawlerFactory
 
 router = APIRouter(prefix="/crawler", tags=["Admin-Crawler"])
@@ -140,3 +144,35 @@ async def cancel_crawler_task(task_id: int):
         status_code=501,
         detail="Cancel not supported in current version"
     )
+
+
+@router.get("/schedules", response_model=List[CrawlScheduleResponse])
+async def get_crawl_schedules(db: AsyncSession = Depends(get_db)):
+    """获取各数据源的增量爬取调度（重访间隔、估计发布率、下次爬取时间）"""
+
+    await revisit_scheduler.ensure_schedules()
+    result = await db.execute(select(CrawlSchedule).order_by(CrawlSchedule.next_run_at))
+    return [CrawlScheduleResponse.model_validate(s) for s in result.scalars().all()]
+
+
+@router.patch("/schedules/{source}", response_model=CrawlScheduleResponse)
+async def update_crawl_schedule(
+    source: str,
+    request: CrawlScheduleUpdateRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """启用/停用数据源的增量爬取，或让其立即到期"""
+
+    result = await db.execute(select(CrawlSchedule).where(CrawlSchedule.source == source))
+    schedule = result.scalar_one_or_none()
+    if not schedule:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+
+    if request.enabled is not None:
+        schedule.enabled = request.enabled
+    if request.run_now:
+        schedule.next_run_at = tz.now()
+
+    await db.commit()
+    await db.refresh(schedule)
+    return CrawlScheduleResponse.model_validate(schedule)
@@ -0,0 +1,96 @@
+"""Admin API - Near-duplicate Clusters"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+
+from app.database import get_db
+from app.models import Article, ArticleDuplicate
+from app.schemas import ArticleResponse, ArticleDuplicateResponse, DuplicateClusterResponse
+
+router = APIRouter(prefix="/duplicates", tags=["Admin-Duplicates"])
+
+
+@router.get("/clusters", response_model=dict)
+async def get_duplicate_clusters(
+    page: int = Query(1, ge=1, description="Page number"),
+    page_size: int = Query(20, ge=1, le=100, description="Page size"),
+    db: AsyncSession = Depends(get_db)
+):
+    """List duplicate clusters, most recently hit first"""
+
+    cluster_stats = (
+        select(
+            ArticleDuplicate.article_id,
+            func.count(ArticleDuplicate.id).label("duplicate_count"),
+            func.max(ArticleDuplicate.created_at).label("last_seen_at")
+        )
+        .group_by(ArticleDuplicate.article_id)
+        .subquery()
+    )
+
+    total_result = await db.execute(select(func.count()).select_from(cluster_stats))
+    total = total_result.scalar()
+
+    result = await db.execute(
+        select(Article, cluster_stats.c.duplicate_count)
+        .join(cluster_stats, cluster_stats.c.article_id == Article.id)
+        .order_by(cluster_stats.c.last_seen_at.desc(), Article.id.desc())
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+    )
+    rows = result.all()
+
+    # 一次查询取出本页所有簇的成员
+    article_ids = [article.id for article, _ in rows]
+    members = {}
+    if article_ids:
+        dup_result = await db.execute(
+            select(ArticleDuplicate)
+            .where(ArticleDuplicate.article_id.in_(article_ids))
+            .order_by(ArticleDuplicate.created_at.desc())
+        )
+        for duplicate in dup_result.scalars().all():
+            members.setdefault(duplicate.article_id, []).append(
+                ArticleDuplicateResponse.model_validate(duplicate)
+            )
+
+    return {
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "total_pages": (total + page_size - 1) // page_size,
+        "items": [
+            DuplicateClusterResponse(
+                article=ArticleResponse.model_validate(article),
+                duplicate_count=count,
+                duplicates=members.get(article.id, [])
+            )
+            for article, count in rows
+        ]
+    }
+
+
+@router.get("/clusters/{article_id}", response_model=DuplicateClusterResponse)
+async def get_duplicate_cluster(
+    article_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the duplicate cluster of an article"""
+
+    article = await db.get(Article, article_id)
+    if not article:
+        raise HTTPException(status_code=404, detail="Article not found")
+
+    result = await db.execute(
+        select(ArticleDuplicate)
+        .where(ArticleDuplicate.article_id == article_id)
+        .order_by(ArticleDuplicate.created_at.desc())
+    )
+    duplicates = [ArticleDuplicateResponse.model_validate(d) for d in result.scalars().all()]
+
+    return DuplicateClusterResponse(
+        article=ArticleResponse.model_validate(article),
+        duplicate_count=len(duplicates),
+        duplicates=duplicates
+    )
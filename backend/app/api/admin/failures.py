@@ -0,0 +1,122 @@
+"""Admin API - Failed Article Ingests (dead letters)"""
+
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, case
+
+from app.database import get_db
+from app.models import IngestFailure
+from app.schemas import (
+    IngestFailureResponse,
+    IngestFailureReasonItem,
+    IngestFailureStats,
+    IngestRetryRequest
+)
+from app.services.crawler_service import crawler_service
+from app.services.dead_letter_service import requeue_failures, STATUS_PENDING, STATUS_ABANDONED
+
+router = APIRouter(prefix="/failures", tags=["Admin-Failures"])
+
+
+@router.get("/stats", response_model=IngestFailureStats)
+async def get_failure_stats(
+    include_resolved: bool = Query(False, description="Include resolved failures in by_reason"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Failure counts by status and by reason (stage + error type)"""
+
+    status_result = await db.execute(
+        select(IngestFailure.status, func.count(IngestFailure.id))
+        .group_by(IngestFailure.status)
+    )
+    by_status = {status: count for status, count in status_result.all()}
+
+    reason_query = (
+        select(
+            IngestFailure.stage,
+            IngestFailure.error_type,
+            func.count(IngestFailure.id).label("count"),
+            func.count(case((IngestFailure.status == STATUS_PENDING, 1))).label("pending"),
+            func.count(case((IngestFailure.status == STATUS_ABANDONED, 1))).label("abandoned"),
+            func.max(IngestFailure.last_failed_at).label("last_failed_at")
+        )
+        .group_by(IngestFailure.stage, IngestFailure.error_type)
+        .order_by(func.count(IngestFailure.id).desc())
+    )
+    if not include_resolved:
+        reason_query = reason_query.where(IngestFailure.status.in_([STATUS_PENDING, STATUS_ABANDONED]))
+
+    reason_result = await db.execute(reason_query)
+
+    return IngestFailureStats(
+        total=sum(by_status.values()),
+        by_status=by_status,
+        by_reason=[
+            IngestFailureReasonItem(
+                stage=row.stage,
+                error_type=row.error_type,
+                count=row.count,
+                pending=row.pending,
+                abandoned=row.abandoned,
+                last_failed_at=row.last_failed_at
+            )
+            for row in reason_result.all()
+        ]
+    )
+
+
+@router.get("/", response_model=dict)
+async def get_failures(
+    page: int = Query(1, ge=1, description="Page number"),
+    page_size: int = Query(20, ge=1, le=100, description="Page size"),
+    status: str = Query(None, description="pending/resolved/abandoned"),
+    stage: str = Query(None, description="Pipeline stage"),
+    error_type: str = Query(None, description="Exception type"),
+    db: AsyncSession = Depends(get_db)
+):
+    """List failed ingests, most recent failure first"""
+
+    query = select(IngestFailure)
+    if status:
+        query = query.where(IngestFailure.status == status)
+    if stage:
+        query = query.where(IngestFailure.stage == stage)
+    if error_type:
+        query = query.where(IngestFailure.error_type == error_type)
+
+    total_result = await db.execute(select(func.count()).select_from(query.subquery()))
+    total = total_result.scalar()
+
+    result = await db.execute(
+        query.order_by(IngestFailure.last_failed_at.desc(), IngestFailure.id.desc())
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+    )
+
+    return {
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "total_pages": (total + page_size - 1) // page_size,
+        "items": [IngestFailureResponse.model_validate(f) for f in result.scalars().all()]
+    }
+
+
+@router.post("/retry", response_model=dict)
+async def retry_failures(request: IngestRetryRequest):
+    """Requeue failures (given IDs, or all abandoned) and optionally start a retry run"""
+
+    requeued = await requeue_failures(request.ids)
+
+    started = False
+    if request.run_now:
+        if crawler_service.is_running():
+            raise HTTPException(
+                status_code=400,
+                detail=f"A task is already running; {requeued} failures requeued for the next scheduled retry"
+            )
+        asyncio.create_task(crawler_service.run_retry())
+        started = True
+
+    return {"requeued": requeued, "started": started}
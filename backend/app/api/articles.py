@@ -1,71 +1,380 @@
 """Articles API endpoints"""
 
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, Request
+from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
+from sqlalchemy.orm import undefer, undefer_group
+from app.config import settings
 from app.database import get_db
-from app.models import Article, ArticleAIOutput, Source
-from app.schemas import ArticleListResponse, ArticleListItem, ArticleDetail
+from app.models import Article, ArticleAIOutput, CONTENT_GROUP
+from app.schemas import (
+    ArticleListResponse,
+    ArticleListItem,
+    ArticleDetail,
+    ArticleContentResponse,
+    ArticleBatchResponse,
+    ArticleFacetsResponse,
+    FacetValue
+)
 from app.services.ai_service import analyze_article
 from app.services.translation_service import translate_article_html, detect_chinese_content
-from typing import Optional
+from app.services.cache_service import article_cache, encode_json
+from app.services.source_service import source_name_cache, UNKNOWN_SOURCE_NAME
+from app.services.facet_service import ArticleFilters, apply_filters, facet_index
+from app.utils.pagination import apply_keyset, keyset_page, article_count_cache
+from app.utils.batch import parse_id_list, BATCH_MAX_IDS
+from app.utils.http_cache import make_etag, validator_headers, is_not_modified, not_modified_response
+from app.utils import timezone as tz
+from typing import List, Optional, Tuple
 from datetime import datetime
 
 router = APIRouter()
 
+# 列表只需要这些列（不读取正文字段）
+LIST_COLUMNS = (
+    Article.id,
+    Article.title,
+    Article.summary,
+    Article.author,
+    Article.source_id,
+    Article.category,
+    Article.tags,
+    Article.published_at,
+)
+
+# 详情接口 fields 参数中需要单独加载的正文字段
+DETAIL_CONTENT_FIELDS = {
+    "content_text": Article.content_text,
+    "content_html": Article.content_html,
+    "translated_content_html": Article.translated_content_html,
+}
+
+# /content?format= 对应的列
+CONTENT_FORMATS = {
+    "html": Article.content_html,
+    "text": Article.content_text,
+    "translated": Article.translated_content_html,
+}
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[set]:
+    """解析 fields 参数（逗号分隔的 ArticleDetail 字段名）；未传时返回None表示全部字段"""
+    if not fields:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - ArticleDetail.model_fields.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}. "
+                   f"Available: {', '.join(ArticleDetail.model_fields)}"
+        )
+    return requested | {"id"}
+
+
+def _article_filters(
+    category: Optional[str] = None,
+    from_date: Optional[str] = None,
+    tag: Optional[List[str]] = Query(None, description="Tag (repeatable, all must match)"),
+    source_id: Optional[int] = None,
+    content_source: Optional[str] = None,
+    author: Optional[str] = None,
+    entity: Optional[List[str]] = Query(None, description="Drug / disease / company from AI analysis (repeatable, all must match)"),
+) -> ArticleFilters:
+    """列表和分面共用的过滤参数"""
+    try:
+        return ArticleFilters.parse(
+            category=category, from_date=from_date, source_id=source_id, content_source=content_source,
+            author=author, tags=tag, entities=entity
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _list_query(columns, filters: ArticleFilters):
+    """未删除文章 + 过滤条件"""
+    return apply_filters(select(*columns).where(Article.is_deleted == False), filters)
+
+
+def _page_window(query, page: int, page_size: int, cursor: Optional[str]):
+    """排序和分页（多取一行用于判断是否还有下一页）"""
+    if cursor:
+        try:
+            return apply_keyset(query, Article.published_at, Article.id, cursor, page_size)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    query = query.order_by(Article.published_at.desc(), Article.id.desc())
+    return query.offset((page - 1) * page_size).limit(page_size + 1)
+
+
+async def _article_validators(db: AsyncSession, article_id: int, *variant) -> Tuple[str, Optional[datetime]]:
+    """文章的 ETag 和 Last-Modified（主键查询，不读取正文）；文章不存在时返回404"""
+    result = await db.execute(
+        select(Article.updated_at, Article.version_no)
+        .where(Article.id == article_id, Article.is_deleted == False)
+    )
+    row = result.first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Article not found")
+    return make_etag(article_id, row.updated_at, row.version_no, *variant), row.updated_at
+
 
 @router.get("", response_model=ArticleListResponse)
 async def list_articles(
+    request: Request,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    category: Optional[str] = None,
-    from_date: Optional[str] = None,
+    filters: ArticleFilters = Depends(_article_filters),
+    cursor: Optional[str] = None,
+    with_total: Optional[bool] = None,
     db: AsyncSession = Depends(get_db)
 ):
     """
     List articles with pagination and filters
 
-    - page: Page number (default 1)
+    - page: Page number (default 1, ignored when cursor is given)
     - page_size: Items per page (default 20, max 100)
     - category: Filter by category
     - from_date: Filter by date (YYYY-MM-DD)
+    - tag / source_id / content_source / author / entity: Facet filters (see /facets)
+    - cursor: next_cursor from the previous page (keyset pagination, same cost on every page)
+    - with_total: Include the total count (default true with page, false with cursor)
+
+    Supports If-None-Match (304 when the page window is unchanged).
+    """
+    params = {
+        "page": None if cursor else page,
+        "page_size": page_size,
+        "filters": filters.key(),
+        "cursor": cursor,
+        "with_total": with_total,
+    }
+    window_query = _list_query((Article.id, Article.updated_at), filters)
+
+    # Get total count (cached per filter combination)
+    total = None
+    if with_total if with_total is not None else cursor is None:
+        async def count():
+            total_result = await db.execute(select(func.count()).select_from(window_query.subquery()))
+            return total_result.scalar()
+        total = await article_count_cache.get(("public", filters.key()), count)
+
+    # 校验器：当前页窗口的文章ID和最大 updated_at（只读两列）
+    window_result = await db.execute(_page_window(window_query, page, page_size, cursor))
+    window = window_result.all()
+    last_modified = max((row.updated_at for row in window if row.updated_at), default=None)
+    etag = make_etag(*params.values(), total, last_modified, *(row.id for row in window))
+    headers = validator_headers(etag, last_modified)
+    # 窗口中的文章被删除后，较旧的文章移入窗口时最大 updated_at 不变，列表只按 ETag 判断
+    if is_not_modified(request, etag):
+        return not_modified_response(headers)
+
+    async def load():
+        result = await db.execute(_page_window(_list_query(LIST_COLUMNS, filters), page, page_size, cursor))
+        articles, next_cursor = keyset_page(result.all(), page_size)
+
+        # Build response（数据源名称来自进程内缓存，不再逐篇查询）
+        source_names = await source_name_cache.get_names(db, (a.source_id for a in articles))
+        items = []
+        for article in articles:
+            items.append(ArticleListItem(
+                id=article.id,
+                title=article.title,
+                summary=article.summary,
+                author=article.author,
+                source_name=source_names.get(article.source_id, UNKNOWN_SOURCE_NAME),
+                category=article.category,
+                tags=article.tags,
+                published_at=article.published_at
+            ))
+
+        return ArticleListResponse(
+            data=items,
+            pagination={
+                "total": total,
+                "page": None if cursor else page,
+                "page_size": page_size,
+                "next_cursor": next_cursor,
+                "has_more": next_cursor is not None
+            }
+        )
+
+    # 缓存键带上 ETag，响应体与校验器始终一致
+    body = await article_cache.get_or_load(
+        "list", {**params, "etag": etag}, load, settings.ARTICLE_LIST_CACHE_TTL_SECONDS
+    )
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/facets", response_model=ArticleFacetsResponse)
+async def get_article_facets(
+    request: Request,
+    filters: ArticleFilters = Depends(_article_filters),
+    facet_limit: int = Query(20, ge=1, le=100, description="Max values per facet"),
+    db: AsyncSession = Depends(get_db)
+):
     """
-    # Build query
-    query = select(Article).where(Article.is_deleted == False)
+    Facet counts for the article list with the same filters
 
-    if category:
-        query = query.where(Article.category == category)
+    Returns the number of matching articles and, for each facet (category,
+    source, content_source, author, tag, drug, disease, company), the values
+    with the most matching articles. Counts come from the in-memory facet
+    index (refreshed every few seconds), not from the database.
+    Supports If-None-Match (304 while the counts are unchanged).
+    """
+    result = facet_index.counts(filters, facet_limit)
+    if result is None:
+        raise HTTPException(status_code=503, detail="Facet index is loading, try again later")
+
+    # 各进程的索引版本号不同，ETag 取自计数本身
+    etag = make_etag("facets", filters.key(), facet_limit, result["total"], result["facets"])
+    headers = validator_headers(etag, None)
+    if is_not_modified(request, etag):
+        return not_modified_response(headers)
+
+    source_names = await source_name_cache.get_names(db, (value for value, _ in result["facets"]["source"]))
+    facets = {
+        name: [
+            FacetValue(
+                value=value,
+                count=count,
+                label=source_names.get(value, UNKNOWN_SOURCE_NAME) if name == "source" else None
+            )
+            for value, count in values
+        ]
+        for name, values in result["facets"].items()
+    }
+    body = encode_json(ArticleFacetsResponse(total=result["total"], facets=facets))
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/batch", response_model=ArticleBatchResponse)
+async def get_articles_batch(
+    ids: str = Query(..., description=f"Comma-separated article IDs (max {BATCH_MAX_IDS}), e.g. 12,7,30"),
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated fields to return, same as the detail endpoint (default: all)"
+    ),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get several article details in one request
 
-    if from_date:
-        try:
-            date_obj = datetime.strptime(from_date, "%Y-%m-%d")
-            query = query.where(Article.published_at >= date_obj)
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    Articles are returned in the order of `ids`; ids that do not exist or
+    were deleted are listed in `missing`. Loads all articles with one query.
+    """
+    try:
+        article_ids = parse_id_list(ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    requested = _parse_fields(fields)
 
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
+    details = await _load_article_details(db, article_ids, requested)
+    body = encode_json({
+        "data": [details[article_id] for article_id in article_ids if article_id in details],
+        "missing": [article_id for article_id in article_ids if article_id not in details],
+    })
+    return Response(content=body, media_type="application/json")
 
-    # Apply pagination and sorting
-    query = query.order_by(Article.published_at.desc())
-    query = query.offset((page - 1) * page_size).limit(page_size)
 
-    result = await db.execute(query)
+@router.get("/{article_id}", response_model=ArticleDetail)
+async def get_article(
+    request: Request,
+    article_id: int,
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated fields to return, e.g. title,published_at,content_html (default: all)"
+    ),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get article detail by ID
+
+    Returns full article with AI analysis. With `fields`, only those fields
+    (plus id) are returned and only the requested content columns are loaded.
+    Supports If-None-Match / If-Modified-Since (304 without loading the content).
+    """
+    requested = _parse_fields(fields)
+    params = {"fields": sorted(requested) if requested is not None else None}
+
+    etag, last_modified = await _article_validators(db, article_id, "detail", params["fields"])
+    headers = validator_headers(etag, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(headers)
+
+    async def load():
+        return await _load_article_detail(db, article_id, requested)
+
+    body = await article_cache.get_or_load(
+        "detail", {**params, "etag": etag}, load, settings.ARTICLE_CACHE_TTL_SECONDS, article_id=article_id
+    )
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def _load_article_detail(db: AsyncSession, article_id: int, requested: Optional[set]):
+    details = await _load_article_details(db, [article_id], requested)
+    if article_id not in details:
+        raise HTTPException(status_code=404, detail="Article not found")
+    return details[article_id]
+
+
+async def _load_article_details(db: AsyncSession, article_ids: List[int], requested: Optional[set]) -> dict:
+    """
+    批量加载文章详情（文章、AI分析各一次查询，数据源名称来自缓存）
+
+    Returns:
+        {article_id: ArticleDetail（requested 为 None 时）或部分字段的字典}，不存在或已删除的文章不在结果中
+    """
+    def wanted(name: str) -> bool:
+        return requested is None or name in requested
+
+    content_columns = [column for name, column in DETAIL_CONTENT_FIELDS.items() if wanted(name)]
+    result = await db.execute(
+        select(Article)
+        .where(Article.id.in_(article_ids), Article.is_deleted == False)
+        .options(*(undefer(column) for column in content_columns))
+    )
     articles = result.scalars().all()
+    if not articles:
+        return {}
 
-    # Build response
-    items = []
-    for article in articles:
-        # 获取数据源名称
-        source_result = await db.execute(
-            select(Source).where(Source.id == article.source_id)
+    # 获取数据源名称
+    source_names = {}
+    if wanted("source_name"):
+        source_names = await source_name_cache.get_names(db, (a.source_id for a in articles))
+
+    # Get AI analysis: latest output per article (an updated article may also have stale outputs of older versions)
+    ai_analyses = {}
+    if wanted("ai_analysis"):
+        ai_result = await db.execute(
+            select(ArticleAIOutput)
+            .where(ArticleAIOutput.article_id.in_([a.id for a in articles]))
+            .order_by(ArticleAIOutput.article_id, ArticleAIOutput.is_stale, ArticleAIOutput.created_at.desc())
+            .distinct(ArticleAIOutput.article_id)
         )
-        source = source_result.scalar_one_or_none()
-        source_name = source.name if source else "未知来源"
+        ai_analyses = {
+            ai_output.article_id: {
+                "analysis": ai_output.summary  # 使用简化格式，与AI分析API保持一致
+            }
+            for ai_output in ai_result.scalars().all()
+        }
 
-        items.append(ArticleListItem(
+    details = {}
+    for article in articles:
+        source_name = source_names.get(article.source_id, UNKNOWN_SOURCE_NAME) if wanted("source_name") else None
+        ai_analysis = ai_analyses.get(article.id)
+
+        if requested is not None:
+            # 部分字段：不经过 ArticleDetail 校验（必填字段可能未请求）
+            computed = {"source_name": source_name, "ai_analysis": ai_analysis}
+            details[article.id] = {
+                name: computed[name] if name in computed else getattr(article, name)
+                for name in ArticleDetail.model_fields if name in requested
+            }
+            continue
+
+        details[article.id] = ArticleDetail(
             id=article.id,
             title=article.title,
             summary=article.summary,
@@ -73,68 +382,58 @@ async def list_articles(
             source_name=source_name,
             category=article.category,
             tags=article.tags,
-            published_at=article.published_at
-        ))
-
-    return ArticleListResponse(
-        data=items,
-        pagination={"total": total, "page": page, "page_size": page_size}
-    )
+            published_at=article.published_at,
+            content_url=article.content_url,
+            content_text=article.content_text,
+            content_html=article.content_html,
+            content_source=article.content_source,
+            translated_content_html=article.translated_content_html,
+            ai_analysis=ai_analysis
+        )
+    return details
 
 
-@router.get("/{article_id}", response_model=ArticleDetail)
-async def get_article(
+@router.get("/{article_id}/content", response_model=ArticleContentResponse)
+async def get_article_content(
+    request: Request,
     article_id: int,
+    format: str = Query("html", description="html / text / translated"),
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Get article detail by ID
+    Get one content column of an article
 
-    Returns full article with AI analysis
+    Lighter than the detail endpoint when the client renders a single
+    representation; only that column is read from the database.
     """
-    result = await db.execute(
-        select(Article).where(Article.id == article_id, Article.is_deleted == False)
-    )
-    article = result.scalar_one_or_none()
+    column = CONTENT_FORMATS.get(format)
+    if column is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid format: {format}. Use one of: {', '.join(CONTENT_FORMATS)}"
+        )
 
-    if not article:
-        raise HTTPException(status_code=404, detail="Article not found")
+    etag, last_modified = await _article_validators(db, article_id, "content", format)
+    headers = validator_headers(etag, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(headers)
 
-    # 获取数据源名称
-    source_result = await db.execute(
-        select(Source).where(Source.id == article.source_id)
-    )
-    source = source_result.scalar_one_or_none()
-    source_name = source.name if source else "未知来源"
+    async def load():
+        result = await db.execute(
+            select(column).where(Article.id == article_id, Article.is_deleted == False)
+        )
+        row = result.first()
 
-    # Get AI analysis
-    ai_result = await db.execute(
-        select(ArticleAIOutput).where(ArticleAIOutput.article_id == article_id)
-    )
-    ai_output = ai_result.scalar_one_or_none()
+        if row is None:
+            raise HTTPException(status_code=404, detail="Article not found")
 
-    ai_analysis = None
-    if ai_output:
-        ai_analysis = {
-            "analysis": ai_output.summary  # 使用简化格式，与AI分析API保持一致
-        }
+        return ArticleContentResponse(id=article_id, format=format, content=row[0])
 
-    return ArticleDetail(
-        id=article.id,
-        title=article.title,
-        summary=article.summary,
-        author=article.author,
-        source_name=source_name,
-        category=article.category,
-        tags=article.tags,
-        published_at=article.published_at,
-        content_url=article.content_url,
-        content_text=article.content_text,
-        content_html=article.content_html,
-        content_source=article.content_source,
-        translated_content_html=article.translated_content_html,
-        ai_analysis=ai_analysis
+    body = await article_cache.get_or_load(
+        "content", {"format": format, "etag": etag}, load, settings.ARTICLE_CACHE_TTL_SECONDS,
+        article_id=article_id
     )
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 
@@ -154,7 +453,9 @@ async def generate_ai_analysis(
     """
     # 获取文章
     result = await db.execute(
-        select(Article).where(Article.id == article_id, Article.is_deleted == False)
+        select(Article)
+        .where(Article.id == article_id, Article.is_deleted == False)
+        .options(undefer_group(CONTENT_GROUP))
     )
     article = result.scalar_one_or_none()
 
@@ -170,8 +471,8 @@ async def generate_ai_analysis(
     )
     existing_ai = ai_result.scalar_one_or_none()
 
-    # 如果已有分析且不是强制重新生成，直接返回现有的
-    if existing_ai and not force_regenerate:
+    # 如果已有分析（且文章之后没有更新）且不是强制重新生成，直接返回现有的
+    if existing_ai and not existing_ai.is_stale and not force_regenerate:
         return {
             "success": True,
             "message": "返回已有AI分析",
@@ -192,6 +493,8 @@ async def generate_ai_analysis(
             existing_ai.key_points = []
             existing_ai.entities = {}
             existing_ai.model_name = "deepseek-chat"
+            existing_ai.version_no = article.version_no
+            existing_ai.is_stale = False
         else:
             # 创建新记录
             ai_output = ArticleAIOutput(
@@ -204,7 +507,11 @@ async def generate_ai_analysis(
             )
             db.add(ai_output)
 
+        # AI分析属于详情内容，更新 updated_at 使详情的 ETag 变化
+        article.updated_at = tz.now()
         await db.commit()
+        # AI分析只出现在详情中
+        await article_cache.invalidate_article(article.id, lists=False)
 
         return {
             "success": True,
@@ -235,7 +542,9 @@ async def generate_translation(
     """
     # 获取文章
     result = await db.execute(
-        select(Article).where(Article.id == article_id, Article.is_deleted == False)
+        select(Article)
+        .where(Article.id == article_id, Article.is_deleted == False)
+        .options(undefer_group(CONTENT_GROUP))
     )
     article = result.scalar_one_or_none()
 
@@ -263,6 +572,7 @@ async def generate_translation(
             # 中文文章不需要翻译，直接返回原HTML
             article.translated_content_html = article.content_html
             await db.commit()
+            await article_cache.invalidate_article(article.id, lists=False)
 
             return {
                 "success": True,
@@ -280,6 +590,7 @@ async def generate_translation(
         # 更新文章的翻译字段
         article.translated_content_html = translated_html
         await db.commit()
+        await article_cache.invalidate_article(article.id, lists=False)
 
         return {
             "success": True,
@@ -0,0 +1,63 @@
+"""Search API endpoints"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db
+from app.schemas import SearchRequest, SearchResponse, SearchResultItem, SuggestItem, SuggestResponse
+from app.services.search_service import hybrid_search
+from app.services.suggest_service import suggest_index
+
+router = APIRouter()
+
+
+@router.post("", response_model=SearchResponse)
+async def search(
+    request: SearchRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Hybrid article search (full-text + vector, reciprocal-rank fusion)
+
+    - filters: category, source_id, content_source, from_date / to_date (YYYY-MM-DD)
+    - top_k: number of articles returned (one result per article)
+
+    Without embeddings (EMBEDDING_ENABLED=false) only full-text matches are returned.
+    """
+    try:
+        hits, total = await hybrid_search(db, request.query, request.filters, request.top_k)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return SearchResponse(
+        results=[
+            SearchResultItem(
+                id=hit.article_id,  # one result per article
+                article_id=hit.article_id,
+                title=hit.title,
+                snippet=hit.snippet,
+                score=hit.score,
+                published_at=hit.published_at
+            )
+            for hit in hits
+        ],
+        total=total
+    )
+
+
+@router.get("/suggest", response_model=SuggestResponse)
+async def suggest(
+    q: str = Query(..., min_length=1, max_length=50, description="Search box input (prefix)"),
+    limit: int = Query(10, ge=1, le=20)
+):
+    """
+    Search box suggestions: tags, AI entities (drugs / diseases / companies) and article titles
+
+    Served from an in-memory prefix index and never queries the database;
+    empty until the index has loaded after startup.
+    """
+    return SuggestResponse(
+        suggestions=[
+            SuggestItem(text=s.text, type=s.type, weight=round(s.weight, 6), article_id=s.article_id)
+            for s in suggest_index.suggest(q, limit)
+        ]
+    )
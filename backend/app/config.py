@@ -20,6 +20,70 @@ class Settings(BaseSettings):
     S3_BUCKET_RAW: str = "medical-news-raw"
     S3_BUCKET_CLEAN: str = "medical-news-clean"
     S3_BUCKET_ATTACHMENTS: str = "medical-news-attachments"
+    S3_PUBLIC_URL: str = ""  # 对外访问附件的地址（如nginx/CDN），未配置时入库不转存图片
+
+    # 图片转存（入库时把外链图片下载到附件桶）
+    IMAGE_REHOST_CONCURRENCY: int = 4  # 并发下载数
+    IMAGE_REHOST_TIMEOUT: int = 20  # 单张图片下载超时（秒）
+    IMAGE_MAX_BYTES: int = 10 * 1024 * 1024  # 单张图片大小上限
+    IMAGE_VARIANT_WIDTH: int = 750  # 缩略版本宽度（移动端）
+
+    # 原始页面归档（用于离线重新解析）
+    PAGE_ARCHIVE_ENABLED: bool = True
+    PAGE_ARCHIVE_SEGMENT_MB: int = 8  # 单个归档分段大小上限
+
+    # 近似重复检测（SimHash）
+    NEAR_DUP_ENABLED: bool = True
+    NEAR_DUP_MAX_DISTANCE: int = 6  # 汉明距离阈值（不超过分段数-1）
+    NEAR_DUP_MIN_LENGTH: int = 200  # 正文过短时不做近似比较
+
+    # 文章更新检测（同一URL重新爬取到不同内容时升级版本，而不是新建文章）
+    ARTICLE_VERSIONING_ENABLED: bool = True
+
+    # 文章列表总数缓存（秒）；游标分页默认不计算总数
+    ARTICLE_COUNT_CACHE_SECONDS: int = 60
+    SOURCE_CACHE_SECONDS: int = 300  # 数据源名称缓存（sources表整表缓存）
+
+    # 文章接口Redis缓存（列表/详情/正文响应体，写入时按事件失效）
+    ARTICLE_CACHE_ENABLED: bool = True
+    ARTICLE_CACHE_TTL_SECONDS: int = 600  # 详情和正文
+    ARTICLE_LIST_CACHE_TTL_SECONDS: int = 60
+    ARTICLE_CACHE_LOCK_SECONDS: int = 5  # 防击穿锁（同一键只有一个请求查库）
+    ARTICLE_CACHE_REDIS_TIMEOUT: float = 0.5  # Redis 超时后直接查库
+    # 文章接口的 Cache-Control（供 nginx 微缓存，过期后用 ETag 重新验证）
+    ARTICLE_CACHE_CONTROL: str = "public, max-age=10, stale-while-revalidate=30"
+
+    # 响应压缩（安装 brotli 包时优先 br，否则 gzip）
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # 小于该字节数的响应不压缩
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4  # 0-11，动态内容用 4-5 兼顾速度和压缩率
+
+    # 入库流水线（各阶段并发数，格式 "stage=n,..."；未列出的阶段为1）
+    INGEST_STAGE_CONCURRENCY: str = "fetch=1,clean=2,dedup=1,enrich=4,store=2,analyze=2,embed=2"
+    INGEST_QUEUE_SIZE: int = 16  # 每个阶段的输入队列长度（队列满时上游阻塞）
+
+    # 入库失败重试（指数退避：BASE * 2^(失败次数-1)，不超过MAX）
+    INGEST_RETRY_MAX_ATTEMPTS: int = 5  # 超过后标记为 abandoned，需在后台手动重试
+    INGEST_RETRY_BASE_SECONDS: int = 300
+    INGEST_RETRY_MAX_SECONDS: int = 6 * 3600
+    INGEST_RETRY_BATCH_SIZE: int = 20  # 每批重试文章数
+    INGEST_RETRY_INTERVAL_MINUTES: int = 30  # 定时重试间隔
+
+    # 自适应增量爬取（按数据源发布频率调整重访间隔）
+    REVISIT_ENABLED: bool = True
+    REVISIT_SOURCES: str = "pharnexcloud"  # 参与定时爬取的数据源（逗号分隔）
+    REVISIT_MIN_MINUTES: int = 30  # 最短重访间隔
+    REVISIT_MAX_MINUTES: int = 720  # 最长重访间隔
+    REVISIT_TARGET_ARTICLES: int = 1  # 每次爬取期望的新文章数（越小越新鲜，爬取越频繁）
+    REVISIT_ACTIVE_HOURS: str = "7-23"  # 活跃时段（小时，含起点不含终点），其余时间不爬取
+    REVISIT_HISTORY_DAYS: int = 28  # 估计发布频率的历史天数
+    REVISIT_CRAWL_PAGES: int = 2  # 增量爬取的列表页数
+    REVISIT_DAYS_BACK: int = 2  # 增量爬取的时间范围（天）
+    REVISIT_TICK_MINUTES: int = 5  # 检查到期数据源的频率
+
+    # 药渡云栏目（"路径=分类,..."，并发爬取并按URL去重）
+    PHARNEX_SECTIONS: str = "/zixun/shiye/qy=前沿研究"
+    PHARNEX_MAX_PAGES: int = 4  # 共享浏览器中同时打开的标签页数
 
     # AI服务配置（支持OpenAI和DeepSeek）
     AI_API_KEY: str = "sk-placeholder"  # AI API密钥（OpenAI或DeepSeek）
@@ -30,6 +94,25 @@ class Settings(BaseSettings):
     EMBEDDING_ENABLED: bool = False
     OPENAI_API_KEY: str = "sk-placeholder"  # 仅用于embedding
 
+    # 混合检索（/v1/search：全文检索 + 向量检索，RRF融合）
+    SEARCH_CANDIDATES: int = 50  # 每路检索的候选文章数
+    SEARCH_RRF_K: int = 60  # RRF 平滑常数（越大排名靠后的候选权重越接近）
+    SEARCH_EMBEDDING_MODEL: str = "text-embedding-3-small"  # 需与分块嵌入使用的模型一致
+    SEARCH_EMBEDDING_TIMEOUT: float = 2.0  # 查询向量超时（秒），超时后只用全文检索
+
+    # 内存倒排索引（标题/摘要/分块 BM25，/v1/search 无过滤条件时代替 Postgres 全文检索）
+    SEARCH_INDEX_ENABLED: bool = True
+    SEARCH_INDEX_PATH: str = "data/search_index"  # 快照目录（scripts/build_search_index.py 生成）
+    SEARCH_INDEX_REFRESH_SECONDS: int = 30  # 增量更新间隔
+
+    # 搜索框联想（/v1/search/suggest：标题/标签/实体的内存前缀索引，查询不访问数据库）
+    SUGGEST_ENABLED: bool = True
+    SUGGEST_REFRESH_SECONDS: int = 30  # 增量更新间隔
+
+    # 文章分面计数（/v1/articles/facets：内存中的分面索引，不对数据库做 GROUP BY）
+    FACETS_ENABLED: bool = True
+    FACETS_REFRESH_SECONDS: int = 30  # 增量更新间隔
+
     # JWT
     JWT_SECRET_KEY: str = "your-secret-key-change-this-in-production"
     JWT_ALGORITHM: str = "HS256"
@@ -62,6 +145,26 @@ class Settings(BaseSettings):
         """Parse CORS origins string to list"""
         return [origin.strip() for origin in self.API_CORS_ORIGINS.split(",")]
 
+    @property
+    def pharnex_sections(self) -> dict[str, str]:
+        """Parse PHARNEX_SECTIONS to {path: category}"""
+        result = {}
+        for pair in self.PHARNEX_SECTIONS.split(","):
+            path, sep, category = pair.partition("=")
+            if sep and path.strip() and category.strip():
+                result[path.strip()] = category.strip()
+        return result
+
+    @property
+    def ingest_stage_concurrency(self) -> dict[str, int]:
+        """Parse INGEST_STAGE_CONCURRENCY to {stage: workers}"""
+        result = {}
+        for pair in self.INGEST_STAGE_CONCURRENCY.split(","):
+            name, sep, value = pair.partition("=")
+            if sep and value.strip().isdigit():
+                result[name.strip()] = max(1, int(value))
+        return result
+
     class Config:
         env_file = "../.env"  # 指向项目根目录的.env文件
         case_sensitive = True
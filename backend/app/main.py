@@ -14,10 +14,20 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from app.api import auth, articles, chat
-from app.api.admin import articles as admin_articles, crawler as admin_crawler, analytics as admin_analytics
+from app.api import auth, articles, chat, search
+from app.api.admin import articles as admin_articles, crawler as admin_crawler, analytics as admin_analytics, duplicates as admin_duplicates, failures as admin_failures, cache as admin_cache
 from app.config import settings
+from app.services.cache_service import article_cache
+from app.services.search_index import search_index
+from app.services.suggest_service import suggest_index
+from app.services.facet_service import facet_index
+from app.utils.compression import CompressionMiddleware
 from app.tasks.cleanup import schedule_cleanup_task
+from app.tasks.retry_ingest import schedule_retry_task
+from app.tasks.revisit_crawl import schedule_revisit_task
+from app.tasks.search_index import schedule_search_index_task
+from app.tasks.suggest_index import schedule_suggest_task
+from app.tasks.facet_index import schedule_facet_task
 
 # Windows 平台 UTF-8 编码配置
 if sys.platform == 'win32':
@@ -55,6 +65,19 @@ async def lifespan(app: FastAPI):
 
     # 配置清理任务
     schedule_cleanup_task(scheduler)
+    schedule_retry_task(scheduler)
+    schedule_revisit_task(scheduler)
+    schedule_search_index_task(scheduler)
+    schedule_suggest_task(scheduler)
+    schedule_facet_task(scheduler)
+
+    # 内存检索索引在后台加载，就绪前 /v1/search 使用 Postgres 全文检索
+    if settings.SEARCH_INDEX_ENABLED:
+        search_index.start()
+    if settings.SUGGEST_ENABLED:
+        suggest_index.start()
+    if settings.FACETS_ENABLED:
+        facet_index.start()
 
     # 启动调度器
     scheduler.start()
@@ -66,6 +89,10 @@ async def lifespan(app: FastAPI):
     logger.info("🛑 关闭定时任务调度器...")
     scheduler.shutdown()
     logger.info("✅ 定时任务调度器已关闭")
+    await article_cache.close()
+    await search_index.close()
+    await suggest_index.close()
+    await facet_index.close()
 
 
 # Create FastAPI app
@@ -87,15 +114,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 响应压缩（br/gzip 按 Accept-Encoding 协商，小于阈值的响应不压缩）
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+)
+
 # Include routers
 app.include_router(auth.router, prefix="/v1/auth", tags=["Authentication"])
 app.include_router(articles.router, prefix="/v1/articles", tags=["Articles"])
 app.include_router(chat.router, prefix="/v1/chat", tags=["Chat"])
+app.include_router(search.router, prefix="/v1/search", tags=["Search"])
 
 # Include admin routers
 app.include_router(admin_articles.router, prefix="/v1/admin")
 app.include_router(admin_crawler.router, prefix="/v1/admin")
 app.include_router(admin_analytics.router, prefix="/v1/admin")
+app.include_router(admin_duplicates.router, prefix="/v1/admin")
+app.include_router(admin_failures.router, prefix="/v1/admin")
+app.include_router(admin_cache.router, prefix="/v1/admin")
 
 
 @app.get("/")
@@ -1,11 +1,16 @@
 """SQLAlchemy database models"""
 
-from sqlalchemy import Column, Integer, String, Text, Boolean, TIMESTAMP, ForeignKey, JSON, func
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy import Column, Integer, BigInteger, Float, String, Text, Boolean, TIMESTAMP, ForeignKey, JSON, Index, Computed, func, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY, TSVECTOR
+from sqlalchemy.orm import deferred
 from pgvector.sqlalchemy import Vector
 from app.database import Base
+from app.utils.fulltext import SEARCH_VECTOR_SQL
 import uuid
 
+# Article 正文字段的延迟加载分组
+CONTENT_GROUP = "content"
+
 
 class Source(Base):
     """Data source table (e.g., 药渡云, 药智网)"""
@@ -23,6 +28,20 @@ class Article(Base):
     """文章主表"""
 
     __tablename__ = "articles"
+    __table_args__ = (
+        # 列表按 (published_at, id) 倒序游标分页，只索引未删除的文章
+        Index(
+            "idx_articles_active_published_id",
+            "published_at",
+            "id",
+            postgresql_where=text("NOT is_deleted")
+        ),
+        # 全文检索（search_vector 为生成列，见 app/utils/fulltext.py）
+        Index("idx_articles_search_vector", "search_vector", postgresql_using="gin"),
+        # 分面过滤：标签包含（tags @> ）和作者
+        Index("idx_articles_tags_gin", "tags", postgresql_using="gin"),
+        Index("idx_articles_author", "author", postgresql_where=text("NOT is_deleted")),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(Text, nullable=False)  # 文章标题
@@ -35,14 +54,19 @@ class Article(Base):
     crawled_at = Column(TIMESTAMP, server_default=func.now())  # 爬取时间
 
     # 内容字段
-    content_url = Column(Text)  # 药渡云等平台的文章URL
-    content_text = Column(Text)  # 文章纯文本内容
-    content_html = Column(Text)  # 文章完整HTML内容（通用字段，无论来源）
+    content_url = Column(Text, index=True)  # 药渡云等平台的文章URL（重新爬取时按URL检测文章更新）
+    # 正文字段很大（常为数百KB），默认延迟加载；需要正文时查询加 undefer_group(CONTENT_GROUP)，
+    # 未加载时访问直接报错（raiseload），不会逐篇触发额外查询
+    content_text = deferred(Column(Text), group=CONTENT_GROUP, raiseload=True)  # 文章纯文本内容
+    content_html = deferred(Column(Text), group=CONTENT_GROUP, raiseload=True)  # 文章完整HTML内容（通用字段，无论来源）
     content_source = Column(String(50), default="pharnexcloud")  # 内容来源标记：pharnexcloud/wechat
     original_source_url = Column(Text)  # 原文链接（微信公众号等）
 
     # AI翻译字段
-    translated_content_html = Column(Text)  # 翻译后的HTML内容
+    translated_content_html = deferred(Column(Text), group=CONTENT_GROUP, raiseload=True)  # 翻译后的HTML内容
+
+    # 全文检索向量：标题/摘要/作者/正文加权的二元分词，由数据库生成，只在查询条件中使用（不加载）
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True)))
 
     # 系统字段
     canonical_hash = Column(String(64), unique=True, nullable=False, index=True)  # 内容去重哈希
@@ -57,6 +81,10 @@ class ArticleAIOutput(Base):
     """AI analysis results for articles"""
 
     __tablename__ = "article_ai_outputs"
+    __table_args__ = (
+        # 分面过滤：实体包含（entities @> ）
+        Index("idx_ai_outputs_entities_gin", "entities", postgresql_using="gin", postgresql_ops={"entities": "jsonb_path_ops"}),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     article_id = Column(Integer, ForeignKey("articles.id"), nullable=False)
@@ -65,6 +93,7 @@ class ArticleAIOutput(Base):
     key_points = Column(JSONB)
     entities = Column(JSONB)  # {drugs: [], diseases: [], companies: []}
     model_name = Column(String(100))
+    is_stale = Column(Boolean, nullable=False, default=False, server_default="false")  # 文章已更新，需要重新分析
     created_at = Column(TIMESTAMP, server_default=func.now())
 
 
@@ -79,6 +108,7 @@ class ArticleChunk(Base):
     chunk_text = Column(Text, nullable=False)
     embedding = Column(Vector(1536))  # OpenAI text-embedding-3-small dimension
     chunk_metadata = Column(JSONB)  # Renamed from 'metadata' to avoid SQLAlchemy reserved word
+    is_stale = Column(Boolean, nullable=False, default=False, server_default="false", index=True)  # Article changed, re-embed
     created_at = Column(TIMESTAMP, server_default=func.now())
 
 
@@ -120,3 +150,127 @@ class CrawlerTask(Base):
     completed_at = Column(TIMESTAMP)
     error_message = Column(Text)  # 错误信息
     created_at = Column(TIMESTAMP, server_default=func.now(), index=True)
+
+
+class ImageAsset(Base):
+    """转存图片索引（原图URL -> 附件桶对象），避免重复下载"""
+
+    __tablename__ = "image_assets"
+
+    id = Column(Integer, primary_key=True, index=True)
+    source_url = Column(Text, nullable=False, unique=True, index=True)  # 原图地址（如mmbiz）
+    object_key = Column(String(300), nullable=False)  # 附件桶中的对象键
+    srcset = Column(Text)  # 响应式图片地址（含缩略版本）
+    created_at = Column(TIMESTAMP, server_default=func.now())
+
+
+class PageArchiveRecord(Base):
+    """原始页面归档索引（页面内容以压缩分段的形式存放在对象存储中）"""
+
+    __tablename__ = "page_archive_records"
+    __table_args__ = (
+        Index("idx_page_archive_url_fetched", "url", "fetched_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    url = Column(Text, nullable=False)  # 页面URL
+    page_kind = Column(String(30), nullable=False, index=True)  # pharnex_list/pharnex_detail/wechat_article
+    fetched_at = Column(TIMESTAMP, nullable=False)  # 抓取时间
+    segment_key = Column(String(300), nullable=False)  # 分段对象键
+    offset = Column(BigInteger, nullable=False)  # 记录在分段中的字节偏移
+    length = Column(Integer, nullable=False)  # 压缩后记录长度
+    content_hash = Column(String(64), nullable=False)  # 页面内容SHA-256
+    created_at = Column(TIMESTAMP, server_default=func.now())
+
+
+class ArticleFingerprint(Base):
+    """文章SimHash指纹（近似重复检测，bands 上的GIN索引用于分段查找候选）"""
+
+    __tablename__ = "article_fingerprints"
+    __table_args__ = (
+        Index("idx_article_fingerprints_bands", "bands", postgresql_using="gin"),
+    )
+
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), primary_key=True)
+    simhash = Column(BigInteger, nullable=False)  # 64位SimHash（按有符号BIGINT存储）
+    bands = Column(ARRAY(Integer), nullable=False)  # 带位置标记的分段值
+    created_at = Column(TIMESTAMP, server_default=func.now())
+
+
+class ArticleDuplicate(Base):
+    """近似重复文章（未入库，归入已有文章所在的簇）"""
+
+    __tablename__ = "article_duplicates"
+
+    id = Column(Integer, primary_key=True, index=True)
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), nullable=False, index=True)  # 簇代表文章
+    title = Column(Text, nullable=False)
+    content_url = Column(Text)
+    original_source_url = Column(Text)
+    content_source = Column(String(50))
+    canonical_hash = Column(String(64), nullable=False, unique=True)  # 重复内容的精确哈希，避免重复记录
+    distance = Column(Integer, nullable=False)  # 与簇代表文章的汉明距离
+    published_at = Column(TIMESTAMP)
+    created_at = Column(TIMESTAMP, server_default=func.now(), index=True)
+
+
+class IngestFailure(Base):
+    """入库失败记录（死信），由重试任务按指数退避分批重新入库"""
+
+    __tablename__ = "ingest_failures"
+    __table_args__ = (
+        Index("idx_ingest_failures_status_retry", "status", "next_retry_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    item_key = Column(Text, nullable=False, unique=True)  # 文章URL（同一文章再次失败时更新同一行）
+    title = Column(Text)
+    stage = Column(String(30), nullable=False, index=True)  # 失败的流水线阶段
+    error_type = Column(String(100), nullable=False, index=True)  # 异常类型
+    error_message = Column(Text)
+    traceback = Column(Text)
+    payload = Column(JSONB, nullable=False)  # 列表页文章数据（重试时从fetch阶段重新开始）
+    attempts = Column(Integer, nullable=False, default=1)  # 失败次数
+    status = Column(String(20), nullable=False, default="pending", index=True)  # pending/resolved/abandoned
+    next_retry_at = Column(TIMESTAMP)  # 下次重试时间
+    last_failed_at = Column(TIMESTAMP)
+    resolved_at = Column(TIMESTAMP)
+    created_at = Column(TIMESTAMP, server_default=func.now())
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+
+
+class CrawlSchedule(Base):
+    """数据源增量爬取调度（间隔按发布频率自适应）"""
+
+    __tablename__ = "crawl_schedules"
+
+    id = Column(Integer, primary_key=True, index=True)
+    source = Column(String(50), nullable=False, unique=True)  # 爬虫数据源标识（pharnexcloud等）
+    enabled = Column(Boolean, nullable=False, default=True)
+    interval_minutes = Column(Integer)  # 当前重访间隔
+    publish_rate_per_day = Column(Float)  # 估计的每日发布量
+    last_run_at = Column(TIMESTAMP)
+    last_new_articles = Column(Integer)  # 上次爬取的新文章数
+    next_run_at = Column(TIMESTAMP, nullable=False, index=True)
+    created_at = Column(TIMESTAMP, server_default=func.now())
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+
+
+class ArticleVersion(Base):
+    """文章历史版本（重新爬取发现内容变化时记录上一版本相对新版本的差异）"""
+
+    __tablename__ = "article_versions"
+    __table_args__ = (
+        Index("idx_article_versions_article_version", "article_id", "version_no", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), nullable=False)
+    version_no = Column(Integer, nullable=False)  # 被替换的版本号
+    canonical_hash = Column(String(64), nullable=False)  # 该版本的内容哈希
+    changed_fields = Column(JSONB, nullable=False)  # 变化的字段名
+    previous_values = Column(JSONB)  # 变化的元数据字段（标题、摘要等）的旧值
+    text_delta = Column(JSONB)  # 由新版本正文还原旧版本正文的行级差异（见 app/utils/text_delta.py）
+    lines_added = Column(Integer, nullable=False, default=0)
+    lines_removed = Column(Integer, nullable=False, default=0)
+    created_at = Column(TIMESTAMP, server_default=func.now(), index=True)
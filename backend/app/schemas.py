@@ -1,7 +1,7 @@
 """Pydantic schemas for API request/response validation"""
 
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Dict, Union
 from datetime import datetime
 from uuid import UUID
 
@@ -58,10 +58,36 @@ class ArticleDetail(BaseModel):
         from_attributes = True
 
 
+class ArticleContentResponse(BaseModel):
+    """Single content column of an article (GET /articles/{id}/content)"""
+    id: int
+    format: str  # html/text/translated
+    content: Optional[str] = None  # None when not available (e.g. not translated yet)
+
+
 class ArticleListResponse(BaseModel):
     """Paginated article list response"""
     data: List[ArticleListItem]
-    pagination: dict  # {total, page, page_size}
+    pagination: dict  # {total, page, page_size, next_cursor, has_more}
+
+
+class FacetValue(BaseModel):
+    """One facet value and the number of matching articles"""
+    value: Union[str, int]  # Source ID for the `source` facet
+    count: int
+    label: Optional[str] = None  # Source name for the `source` facet
+
+
+class ArticleFacetsResponse(BaseModel):
+    """Facet counts for the current article filters"""
+    total: int  # Articles matching the filters
+    facets: Dict[str, List[FacetValue]]  # category / source / content_source / author / tag / drug / disease / company
+
+
+class ArticleBatchResponse(BaseModel):
+    """Several article details (GET /articles/batch), in request order"""
+    data: List[ArticleDetail]  # partial objects when `fields` is given
+    missing: List[int]  # requested ids that do not exist or were deleted
 
 
 # ============ Search Schemas ============
@@ -89,6 +115,19 @@ class SearchResponse(BaseModel):
     total: int
 
 
+class SuggestItem(BaseModel):
+    """Search box suggestion"""
+    text: str
+    type: str  # title / tag / drug / disease / company
+    weight: float  # Article count for tags/entities, recency (0-1] for titles
+    article_id: Optional[int] = None  # Only for titles
+
+
+class SuggestResponse(BaseModel):
+    """Search box suggestions"""
+    suggestions: List[SuggestItem]
+
+
 # ============ Chat Schemas ============
 
 class ChatRequest(BaseModel):
@@ -160,13 +199,25 @@ class ArticleResponse(BaseModel):
         from_attributes = True
 
 
+class ArticleSearchResponse(ArticleResponse):
+    """Admin full-text search hit"""
+    rank: float  # ts_rank_cd relevance (title > summary > author > body)
+
+
 class ArticleDetailResponse(ArticleResponse):
     """Article detail response with full content"""
+    source_name: Optional[str] = None
     content_text: Optional[str] = None
     content_html: Optional[str] = None
     translated_content_html: Optional[str] = None
 
 
+class ArticleDetailBatchResponse(BaseModel):
+    """Several article details (admin batch), in request order"""
+    items: List[ArticleDetailResponse]  # partial objects when `fields` is given
+    missing: List[int]
+
+
 class ArticleUpdateRequest(BaseModel):
     """Article update request"""
     title: Optional[str] = None
@@ -239,3 +290,102 @@ class CategoryDistributionItem(BaseModel):
     """Category distribution item"""
     category: str
     count: int
+
+
+class ArticleDuplicateResponse(BaseModel):
+    """Near-duplicate article linked to a cluster"""
+    id: int
+    article_id: int
+    title: str
+    content_url: Optional[str]
+    original_source_url: Optional[str]
+    content_source: Optional[str]
+    distance: int
+    published_at: Optional[datetime]
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class DuplicateClusterResponse(BaseModel):
+    """Duplicate cluster: the stored article and the copies linked to it"""
+    article: ArticleResponse
+    duplicate_count: int
+    duplicates: List[ArticleDuplicateResponse]
+
+
+class IngestFailureResponse(BaseModel):
+    """Failed article ingest (dead letter)"""
+    id: int
+    item_key: str
+    title: Optional[str]
+    stage: str
+    error_type: str
+    error_message: Optional[str]
+    attempts: int
+    status: str
+    next_retry_at: Optional[datetime]
+    last_failed_at: Optional[datetime]
+    resolved_at: Optional[datetime]
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class IngestFailureReasonItem(BaseModel):
+    """Failure count for one stage + error type"""
+    stage: str
+    error_type: str
+    count: int
+    pending: int
+    abandoned: int
+    last_failed_at: Optional[datetime]
+
+
+class IngestFailureStats(BaseModel):
+    """Failure counts by status and by reason"""
+    total: int
+    by_status: dict
+    by_reason: List[IngestFailureReasonItem]
+
+
+class IngestRetryRequest(BaseModel):
+    """Requeue failed ingests"""
+    ids: Optional[List[int]] = Field(None, description="Failure IDs; empty requeues all abandoned")
+    run_now: bool = Field(True, description="Start a retry run immediately")
+
+
+class CrawlScheduleResponse(BaseModel):
+    """Adaptive revisit schedule of a crawler source"""
+    id: int
+    source: str
+    enabled: bool
+    interval_minutes: Optional[int]
+    publish_rate_per_day: Optional[float]
+    last_run_at: Optional[datetime]
+    last_new_articles: Optional[int]
+    next_run_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class CrawlScheduleUpdateRequest(BaseModel):
+    """Update revisit schedule"""
+    enabled: Optional[bool] = None
+    run_now: bool = Field(False, description="Make the source due immediately")
+
+
+class ArticleCacheStats(BaseModel):
+    """Article response cache counters (current process)"""
+    enabled: bool
+    available: bool
+    hits: int
+    misses: int
+    coalesced: int
+    lock_waits: int
+    errors: int
+    invalidations: int
+    hit_ratio: float
@@ -0,0 +1,110 @@
+"""文章版本服务 - 重新爬取时按URL检测内容更新
+
+同一URL重新爬取到不同的内容哈希时，不再新建文章（也不会被当作重复跳过），而是：
+- 在 article_versions 中记录上一版本（变化的元数据旧值 + 正文的行级反向差异）
+- 文章 version_no 加1，内容替换为新版本
+- 该文章的AI分析和向量分块标记为 is_stale，由 analyze_and_embed.py 只重新处理这些文章；
+  重新嵌入时正文未变的分块直接复用已有向量（只有HTML变化、纯文本和标题不变时不标记）
+
+入库（crawl_and_ingest.py）和离线重新解析（reextract_archive.py）都通过 apply_update 写入新内容。
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import select, update
+
+from app.models import Article, ArticleAIOutput, ArticleChunk, ArticleVersion
+from app.utils.text_delta import make_delta, delta_stats
+
+logger = logging.getLogger(__name__)
+
+# 记录旧值的元数据字段（正文通过 text_delta 记录，HTML 原文已归档到S3和页面归档）
+METADATA_FIELDS = (
+    "title", "summary", "author", "category", "tags", "published_at",
+    "content_source", "original_source_url",
+)
+
+# AI分析和分块的输入，变化时才需要重新处理
+PROCESSED_FIELDS = ("title", "content_text")
+
+
+def _json_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+async def find_article_by_url(db, url: str) -> Optional[Article]:
+    """按URL查找未删除的文章（历史上同一URL有多行时取最新一行）"""
+    result = await db.execute(
+        select(Article)
+        .where(Article.content_url == url, Article.is_deleted == False)
+        .order_by(Article.id.desc())
+        .limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
+async def apply_update(db, article: Article, values: Dict, canonical_hash: str) -> ArticleVersion:
+    """
+    把文章更新为新版本（调用方提交事务）
+
+    Args:
+        db: 数据库会话
+        article: 当前版本的文章
+        values: 新版本的字段值（Article 属性名 -> 值，需包含 content_text）
+        canonical_hash: 新版本的内容哈希
+
+    Returns:
+        记录上一版本的 ArticleVersion
+    """
+    changed = [
+        name for name, value in values.items()
+        if getattr(article, name) != value
+    ]
+    previous_values = {
+        name: _json_value(getattr(article, name))
+        for name in changed if name in METADATA_FIELDS
+    }
+
+    text_delta = None
+    lines_added = lines_removed = 0
+    if "content_text" in changed:
+        text_delta = make_delta(article.content_text or "", values["content_text"])
+        lines_added, lines_removed = delta_stats(text_delta)
+
+    version = ArticleVersion(
+        article_id=article.id,
+        version_no=article.version_no or 1,
+        canonical_hash=article.canonical_hash,
+        changed_fields=changed,
+        previous_values=previous_values,
+        text_delta=text_delta,
+        lines_added=lines_added,
+        lines_removed=lines_removed,
+    )
+    db.add(version)
+
+    for name, value in values.items():
+        setattr(article, name, value)
+    article.canonical_hash = canonical_hash
+    article.version_no = (article.version_no or 1) + 1
+
+    # 只标记，不删除：重新处理前旧的分析和分块仍可用于展示和检索
+    if any(name in changed for name in PROCESSED_FIELDS):
+        await db.execute(
+            update(ArticleAIOutput)
+            .where(ArticleAIOutput.article_id == article.id, ArticleAIOutput.is_stale == False)
+            .values(is_stale=True)
+        )
+        await db.execute(
+            update(ArticleChunk)
+            .where(ArticleChunk.article_id == article.id, ArticleChunk.is_stale == False)
+            .values(is_stale=True)
+        )
+
+    logger.info(
+        f"[Version] 文章 {article.id} 更新到 v{article.version_no}: "
+        f"{', '.join(changed)}（+{lines_added}/-{lines_removed} 行）"
+    )
+    return version
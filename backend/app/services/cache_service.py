@@ -0,0 +1,242 @@
+"""文章读缓存 - Redis 读穿透缓存，按事件失效
+
+公开文章接口（列表、详情、正文）的响应体缓存在 Redis 中（JSON字节）：
+- 版本化的键：列表键带全局列表代数，详情键带该文章的代数；失效时只需 INCR 代数，
+  旧键不再被读取，自然过期。失效前开始的慢查询即使晚写入也只会写到旧代数的键上
+- 防击穿：同一进程内相同的键只查一次库（其余请求等待结果）；跨进程用
+  SET NX 锁，拿不到锁的请求短暂轮询缓存，超时后自己查库
+- Redis 不可用时直接查库，不影响接口
+- 入库、后台编辑/删除、翻译和AI分析写入后调用 invalidate_article / invalidate_lists
+
+命中率等计数为当前进程的统计（GET /v1/admin/cache/stats）。
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+import orjson
+from pydantic import BaseModel
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "cache:articles"
+LIST_GENERATION_KEY = f"{KEY_PREFIX}:gen:lists"
+
+# 拿不到锁时轮询缓存的间隔
+LOCK_POLL_SECONDS = 0.05
+
+# Redis 出错后暂停使用的时间（避免每个请求都等待连接超时）
+RETRY_AFTER_ERROR_SECONDS = 30
+
+
+def _article_generation_key(article_id: int) -> str:
+    return f"{KEY_PREFIX}:gen:article:{article_id}"
+
+
+def _variant(params: Dict[str, Any]) -> str:
+    """查询参数 -> 短哈希（参数顺序无关）"""
+    raw = json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+
+def _encode_default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def encode_json(content: Any) -> bytes:
+    """
+    用 orjson 序列化响应体（比 jsonable_encoder + json.dumps 快一个数量级）
+
+    content 可以直接是 Pydantic 模型或包含 datetime 的字典，不需要先经过 jsonable_encoder；
+    输出与 JSONResponse 一致（紧凑、不转义中文、datetime 为 ISO 格式）
+    """
+    return orjson.dumps(content, default=_encode_default)
+
+
+class ArticleCache:
+    """文章接口响应缓存"""
+
+    def __init__(self):
+        self.enabled = settings.ARTICLE_CACHE_ENABLED
+        self._redis = None
+        self._disabled_until = 0.0
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "lock_waits": 0, "errors": 0, "invalidations": 0}
+
+    @property
+    def redis(self):
+        if self._redis is None:
+            from redis import asyncio as aioredis
+
+            self._redis = aioredis.from_url(
+                settings.REDIS_URL,
+                socket_timeout=settings.ARTICLE_CACHE_REDIS_TIMEOUT,
+                socket_connect_timeout=settings.ARTICLE_CACHE_REDIS_TIMEOUT,
+            )
+        return self._redis
+
+    def _available(self) -> bool:
+        return self.enabled and time.monotonic() >= self._disabled_until
+
+    def _on_error(self, action: str, error: Exception):
+        self.stats["errors"] += 1
+        self._disabled_until = time.monotonic() + RETRY_AFTER_ERROR_SECONDS
+        logger.warning(f"[Cache] Redis {action}失败，{RETRY_AFTER_ERROR_SECONDS}秒内直接查库: {error}")
+
+    async def close(self):
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+
+    # ---------- 读 ----------
+
+    async def _key(self, kind: str, params: Dict[str, Any], article_id: Optional[int]) -> str:
+        """带代数的缓存键（列表用列表代数，详情用文章代数）"""
+        generation_key = LIST_GENERATION_KEY if article_id is None else _article_generation_key(article_id)
+        generation = int(await self.redis.get(generation_key) or 0)
+        scope = "" if article_id is None else f":{article_id}"
+        return f"{KEY_PREFIX}:{kind}{scope}:g{generation}:{_variant(params)}"
+
+    async def get_or_load(
+        self,
+        kind: str,
+        params: Dict[str, Any],
+        loader: Callable[[], Awaitable[Any]],
+        ttl: int,
+        article_id: Optional[int] = None
+    ) -> bytes:
+        """
+        读取缓存的响应体，未命中时调用 loader 并写入缓存
+
+        Args:
+            kind: 接口类型（list/detail/content）
+            params: 影响响应的参数
+            loader: 查库并返回响应内容（Pydantic 模型或字典，见 encode_json）的函数；抛出的异常不缓存
+            ttl: 过期时间（秒）
+            article_id: 详情类缓存所属的文章（用于按文章失效）
+
+        Returns:
+            JSON 响应体
+        """
+        if not self._available():
+            return encode_json(await loader())
+
+        try:
+            key = await self._key(kind, params, article_id)
+            cached = await self.redis.get(key)
+        except Exception as e:
+            self._on_error("读取", e)
+            return encode_json(await loader())
+
+        if cached is not None:
+            self.stats["hits"] += 1
+            return cached
+
+        # 同一进程内合并相同键的查询
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            body = await self._load(key, loader, ttl)
+            future.set_result(body)
+            return body
+        except BaseException as e:
+            future.set_exception(e)
+            # 没有其他等待者时避免 "exception was never retrieved"
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _load(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: int) -> bytes:
+        """跨进程防击穿：拿到锁的请求查库，其余请求等待缓存写入"""
+        lock_key = f"{key}:lock"
+        lock_seconds = settings.ARTICLE_CACHE_LOCK_SECONDS
+        try:
+            locked = await self.redis.set(lock_key, b"1", nx=True, ex=lock_seconds)
+        except Exception as e:
+            self._on_error("加锁", e)
+            locked = True
+
+        if not locked:
+            self.stats["lock_waits"] += 1
+            deadline = time.monotonic() + lock_seconds
+            while time.monotonic() < deadline:
+                await asyncio.sleep(LOCK_POLL_SECONDS)
+                try:
+                    cached = await self.redis.get(key)
+                except Exception as e:
+                    self._on_error("读取", e)
+                    break
+                if cached is not None:
+                    self.stats["hits"] += 1
+                    return cached
+
+        self.stats["misses"] += 1
+        try:
+            body = encode_json(await loader())
+            if self._available():
+                try:
+                    await self.redis.set(key, body, ex=ttl)
+                except Exception as e:
+                    self._on_error("写入", e)
+            return body
+        finally:
+            if locked and self._available():
+                try:
+                    await self.redis.delete(lock_key)
+                except Exception as e:
+                    self._on_error("解锁", e)
+
+    # ---------- 失效 ----------
+
+    async def invalidate_lists(self):
+        """所有列表缓存失效（新文章入库、删除等影响列表内容时）"""
+        await self._bump([LIST_GENERATION_KEY])
+
+    async def invalidate_article(self, article_id: int, lists: bool = True):
+        """文章详情缓存失效，默认同时让列表失效（标题、摘要等也出现在列表中）"""
+        await self.invalidate_articles([article_id], lists=lists)
+
+    async def invalidate_articles(self, article_ids: Iterable[int], lists: bool = True):
+        keys = [_article_generation_key(article_id) for article_id in article_ids]
+        if lists:
+            keys.append(LIST_GENERATION_KEY)
+        await self._bump(keys)
+
+    async def _bump(self, generation_keys):
+        if not self.enabled or not generation_keys:
+            return
+        self.stats["invalidations"] += 1
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key in generation_keys:
+                    pipe.incr(key)
+                await pipe.execute()
+        except Exception as e:
+            # 失效失败时缓存最多在 TTL 内过时
+            logger.warning(f"[Cache] 缓存失效失败: {e}")
+
+    def report(self) -> Dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            "enabled": self.enabled,
+            "available": self._available(),
+            **self.stats,
+            "hit_ratio": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+        }
+
+
+article_cache = ArticleCache()
@@ -7,7 +7,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.models import CrawlerTask
+from app.config import settings
 from app.database import get_db_context
+from app.services.page_archive_service import PageArchive
 from app.utils import timezone as tz
 
 
@@ -53,6 +55,10 @@ class CrawlerService:
         """获取所有日志"""
         return self._logs
 
+    def update_pipeline_metrics(self, report: Dict):
+        """记录入库流水线各阶段指标（吞吐量、队列深度等）"""
+        self._progress["pipeline"] = report
+
     def clear_logs(self):
         """清空日志"""
         self._logs = []
@@ -60,6 +66,22 @@ class CrawlerService:
     async def create_and_run_task(self, config: dict) -> int:
         """Create and async run crawler task"""
 
+        task_id = await self._create_task(config)
+        asyncio.create_task(self._run_crawler_task(task_id, config))
+
+        return task_id
+
+    async def run_task(self, config: dict) -> int:
+        """Create crawler task and wait until it finishes (used by scheduled crawls)"""
+
+        task_id = await self._create_task(config)
+        await self._run_crawler_task(task_id, config)
+
+        return task_id
+
+    async def _create_task(self, config: dict) -> int:
+        """Create a pending crawler task row"""
+
         if self._is_running:
             raise RuntimeError("A task is already running")
 
@@ -72,11 +94,7 @@ class CrawlerService:
             db.add(task)
             await db.commit()
             await db.refresh(task)
-            task_id = task.id
-
-        asyncio.create_task(self._run_crawler_task(task_id, config))
-
-        return task_id
+            return task.id
 
     async def _run_crawler_task(self, task_id: int, config: dict):
         """Execute crawler task (background)"""
@@ -85,6 +103,7 @@ class CrawlerService:
         self._is_running = True
         self._progress = {"status": "starting", "articles_crawled": 0}
         self.clear_logs()  # 清空之前的日志
+        page_archive = PageArchive() if settings.PAGE_ARCHIVE_ENABLED else None
 
         try:
             self.add_log(f"任务 #{task_id} 开始执行")
@@ -104,7 +123,7 @@ class CrawlerService:
             # 获取数据源（默认药渡云）
             source = config.get("source", "pharnexcloud")
             self.add_log(f"正在初始化爬虫: {source}")
-            crawler = CrawlerFactory.create_crawler(source, headless=True)
+            crawler = CrawlerFactory.create_crawler(source, headless=True, page_archive=page_archive)
             self.add_log(f"使用爬虫: {crawler.source_name}")
 
             num_pages = config.get("pages", 10)
@@ -140,7 +159,9 @@ class CrawlerService:
             self._progress = {"status": "ingesting", "articles_crawled": len(articles)}
             self.add_log("正在将文章保存到数据库...")
 
-            await ingest_articles(articles)
+            pipeline_report = await ingest_articles(
+                articles, page_archive, on_report=self.update_pipeline_metrics
+            )
             self.add_log("文章保存完成")
 
             async with get_db_context() as db:
@@ -155,7 +176,8 @@ class CrawlerService:
 
             self._progress = {
                 "status": "completed",
-                "articles_crawled": len(articles)
+                "articles_crawled": len(articles),
+                "pipeline": pipeline_report
             }
             self.add_log(f"任务完成！成功爬取 {len(articles)} 篇文章")
 
@@ -175,8 +197,46 @@ class CrawlerService:
             self._progress = {"status": "failed", "error": str(e)}
 
         finally:
+            if page_archive:
+                try:
+                    await page_archive.close()
+                except Exception as e:
+                    self.add_log(f"页面归档写入失败: {e}")
             self._is_running = False
             self._current_task_id = None
 
+    async def run_retry(self, batch_size: Optional[int] = None) -> Optional[Dict]:
+        """
+        重试失败的入库记录（与爬虫任务互斥）
+
+        Returns:
+            重试统计；已有任务在运行时返回None
+        """
+        if self._is_running:
+            return None
+
+        from app.services.dead_letter_service import retry_failed_ingests
+
+        self._is_running = True
+        self._progress = {"status": "retrying"}
+        page_archive = PageArchive() if settings.PAGE_ARCHIVE_ENABLED else None
+        try:
+            self.add_log("开始重试失败的入库记录")
+            stats = await retry_failed_ingests(batch_size=batch_size, page_archive=page_archive)
+            self.add_log(f"重试完成: {stats}")
+            self._progress = {"status": "completed", "retry": stats}
+            return stats
+        except Exception as e:
+            self.add_log(f"重试出错: {e}")
+            self._progress = {"status": "failed", "error": str(e)}
+            raise
+        finally:
+            if page_archive:
+                try:
+                    await page_archive.close()
+                except Exception as e:
+                    self.add_log(f"页面归档写入失败: {e}")
+            self._is_running = False
+
 
 crawler_service = CrawlerService()
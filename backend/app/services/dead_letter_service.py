@@ -0,0 +1,214 @@
+"""入库死信服务 - 持久化失败的文章并按指数退避分批重试
+
+流水线中任一阶段失败的文章写入 ingest_failures 表（阶段、异常、失败次数、
+列表页文章数据）。重试任务取出到期的记录，从 fetch 阶段重新入库：
+成功（或确认重复）的记录标记为 resolved，再次失败的按退避时间推迟，
+超过最大次数的标记为 abandoned，需要在后台手动重新排队。
+"""
+
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import select, update, true
+
+from app.config import settings
+from app.database import get_db_context
+from app.models import IngestFailure
+from app.utils import timezone as tz
+from app.utils.pipeline import DeadLetter, MemoryDeadLetterStore
+
+logger = logging.getLogger(__name__)
+
+STATUS_PENDING = "pending"
+STATUS_RESOLVED = "resolved"
+STATUS_ABANDONED = "abandoned"
+
+_DATETIME_FIELDS_KEY = "__datetime_fields__"
+
+
+def encode_payload(article_data: dict) -> dict:
+    """把文章数据转换为可存入JSONB的字典（datetime转ISO字符串）"""
+    payload = {}
+    datetime_fields = []
+    for key, value in article_data.items():
+        if isinstance(value, datetime):
+            payload[key] = value.isoformat()
+            datetime_fields.append(key)
+        else:
+            payload[key] = value
+    payload[_DATETIME_FIELDS_KEY] = datetime_fields
+    return payload
+
+
+def decode_payload(payload: dict) -> dict:
+    """encode_payload 的逆操作"""
+    article_data = dict(payload)
+    for key in article_data.pop(_DATETIME_FIELDS_KEY, []):
+        if article_data.get(key):
+            article_data[key] = datetime.fromisoformat(article_data[key])
+    return article_data
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """第 attempts 次失败后的退避时间（带±10%抖动，避免同时失败的文章同时重试）"""
+    seconds = settings.INGEST_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0)
+    seconds *= random.uniform(0.9, 1.1)
+    return timedelta(seconds=min(seconds, settings.INGEST_RETRY_MAX_SECONDS))
+
+
+class DatabaseDeadLetterStore(MemoryDeadLetterStore):
+    """
+    把死信写入 ingest_failures 表（同时保留在内存中供本次运行输出）
+
+    死信中的 item 需要有 article_data 属性（列表页文章数据，含 url）。
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.failed_keys = set()
+        self.resolved_keys = set()
+
+    async def add(self, letter: DeadLetter):
+        await super().add(letter)
+
+        article_data = letter.item.article_data
+        item_key = article_data["url"]
+        self.failed_keys.add(item_key)
+        now = tz.now()
+
+        async with get_db_context() as db:
+            result = await db.execute(
+                select(IngestFailure).where(IngestFailure.item_key == item_key)
+            )
+            failure = result.scalar_one_or_none()
+
+            if failure is None:
+                failure = IngestFailure(item_key=item_key, attempts=0)
+                db.add(failure)
+
+            failure.title = article_data.get("title")
+            failure.stage = letter.stage
+            failure.error_type = letter.error_type
+            failure.error_message = letter.error
+            failure.traceback = letter.traceback
+            failure.payload = encode_payload(article_data)
+            failure.attempts = (failure.attempts or 0) + 1
+            failure.last_failed_at = now
+            failure.resolved_at = None
+
+            if failure.attempts >= settings.INGEST_RETRY_MAX_ATTEMPTS:
+                failure.status = STATUS_ABANDONED
+                failure.next_retry_at = None
+            else:
+                failure.status = STATUS_PENDING
+                failure.next_retry_at = now + retry_delay(failure.attempts)
+
+            await db.commit()
+
+    async def resolve(self, item_keys: Iterable[str]):
+        """
+        把已入库或确认重复的文章对应的记录标记为已解决
+
+        调用方只传入确实处理完成的文章；本次失败的文章即使传入也不会标记
+        """
+        keys = [key for key in set(item_keys) if key not in self.failed_keys]
+        self.resolved_keys.update(keys)
+        if not keys:
+            return
+
+        async with get_db_context() as db:
+            await db.execute(
+                update(IngestFailure)
+                .where(
+                    IngestFailure.item_key.in_(keys),
+                    IngestFailure.status != STATUS_RESOLVED
+                )
+                .values(status=STATUS_RESOLVED, resolved_at=tz.now(), next_retry_at=None)
+            )
+            await db.commit()
+
+
+async def requeue_failures(ids: Optional[List[int]] = None) -> int:
+    """
+    把失败记录重新排队（立即到期）
+
+    Args:
+        ids: 记录ID；为空时重新排队所有 abandoned 记录
+
+    Returns:
+        重新排队的记录数
+    """
+    async with get_db_context() as db:
+        query = update(IngestFailure).where(IngestFailure.status != STATUS_RESOLVED)
+        if ids:
+            query = query.where(IngestFailure.id.in_(ids))
+        else:
+            query = query.where(IngestFailure.status == STATUS_ABANDONED)
+
+        result = await db.execute(
+            query.values(status=STATUS_PENDING, next_retry_at=tz.now(), attempts=0)
+        )
+        await db.commit()
+        return result.rowcount
+
+
+async def retry_failed_ingests(
+    batch_size: Optional[int] = None,
+    max_batches: Optional[int] = None,
+    page_archive=None
+) -> Dict[str, int]:
+    """
+    分批重试到期的失败记录
+
+    Args:
+        batch_size: 每批文章数（默认 INGEST_RETRY_BATCH_SIZE）
+        max_batches: 最多批数（默认处理完所有到期记录）
+        page_archive: 可选的页面归档器
+
+    Returns:
+        {"retried", "resolved", "failed"}
+    """
+    from scripts.crawl_and_ingest import ingest_articles
+
+    batch_size = batch_size or settings.INGEST_RETRY_BATCH_SIZE
+    stats = {"retried": 0, "resolved": 0, "failed": 0}
+    retried_ids = set()
+    batches = 0
+
+    while max_batches is None or batches < max_batches:
+        async with get_db_context() as db:
+            result = await db.execute(
+                select(IngestFailure)
+                .where(
+                    IngestFailure.status == STATUS_PENDING,
+                    IngestFailure.next_retry_at <= tz.now(),
+                    IngestFailure.id.notin_(retried_ids) if retried_ids else true()
+                )
+                .order_by(IngestFailure.next_retry_at)
+                .limit(batch_size)
+            )
+            failures = result.scalars().all()
+
+        if not failures:
+            break
+        batches += 1
+        retried_ids.update(failure.id for failure in failures)
+
+        logger.info(f"🔁 重试第 {batches} 批失败文章: {len(failures)} 篇")
+        store = DatabaseDeadLetterStore()
+        report = await ingest_articles(
+            [decode_payload(failure.payload) for failure in failures],
+            page_archive,
+            dead_letter_store=store
+        )
+        if not report:
+            break
+
+        stats["retried"] += len(failures)
+        stats["failed"] += len(store.failed_keys)
+        stats["resolved"] += len(store.resolved_keys)
+
+    logger.info(f"✅ 重试完成: {stats}")
+    return stats
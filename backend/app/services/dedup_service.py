@@ -0,0 +1,107 @@
+"""近似重复检测服务 - 基于SimHash指纹和分段索引
+
+同一篇报道换了页脚再次发布、或先后从药渡云和微信抓到时，正文的精确哈希
+（canonical_hash）不同，但SimHash只差几个比特。入库前用分段索引查找候选，
+汉明距离不超过阈值的视为重复：不再入库，而是记录到已有文章所在的簇中。
+"""
+
+import logging
+from typing import Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models import Article, ArticleDuplicate, ArticleFingerprint
+from app.utils.simhash import (
+    simhash,
+    band_keys,
+    hamming_distance,
+    normalize_text,
+    to_signed,
+    to_unsigned,
+    MAX_INDEXED_DISTANCE,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class NearDuplicateIndex:
+    """近似重复索引（指纹存放在 article_fingerprints 表）"""
+
+    def __init__(self, max_distance: Optional[int] = None, min_length: Optional[int] = None):
+        max_distance = settings.NEAR_DUP_MAX_DISTANCE if max_distance is None else max_distance
+        # 超过分段数-1时分段查找无法保证召回
+        self.max_distance = min(max_distance, MAX_INDEXED_DISTANCE)
+        self.min_length = settings.NEAR_DUP_MIN_LENGTH if min_length is None else min_length
+
+    def fingerprint(self, content_text: str) -> Optional[int]:
+        """计算正文指纹；正文过短（比较不可靠）时返回None"""
+        if len(normalize_text(content_text)) < self.min_length:
+            return None
+        return simhash(content_text)
+
+    async def find(self, db: AsyncSession, fingerprint: int) -> Optional[Tuple[int, int]]:
+        """
+        查找最相近的未删除文章
+
+        Returns:
+            (文章ID, 汉明距离)；没有近似重复时返回None
+        """
+        result = await db.execute(
+            select(ArticleFingerprint.article_id, ArticleFingerprint.simhash)
+            .join(Article, Article.id == ArticleFingerprint.article_id)
+            .where(
+                ArticleFingerprint.bands.overlap(band_keys(fingerprint)),
+                Article.is_deleted == False
+            )
+        )
+
+        best = None
+        for article_id, value in result.all():
+            distance = hamming_distance(fingerprint, to_unsigned(value))
+            if distance <= self.max_distance and (best is None or distance < best[1]):
+                best = (article_id, distance)
+        return best
+
+    async def add(self, db: AsyncSession, article_id: int, fingerprint: int):
+        """写入（或更新）文章指纹，由调用方提交"""
+        await db.merge(ArticleFingerprint(
+            article_id=article_id,
+            simhash=to_signed(fingerprint),
+            bands=band_keys(fingerprint),
+        ))
+
+    async def is_recorded(self, db: AsyncSession, canonical_hash: str) -> bool:
+        """该内容是否已作为重复记录过"""
+        result = await db.execute(
+            select(ArticleDuplicate.id).where(ArticleDuplicate.canonical_hash == canonical_hash)
+        )
+        return result.scalar_one_or_none() is not None
+
+    def record_duplicate(
+        self,
+        db: AsyncSession,
+        article_id: int,
+        distance: int,
+        article_data: dict,
+        canonical_hash: str,
+        content_source: str,
+        original_source_url: Optional[str] = None
+    ) -> ArticleDuplicate:
+        """把重复文章记录到簇中，由调用方提交"""
+        duplicate = ArticleDuplicate(
+            article_id=article_id,
+            title=article_data["title"],
+            content_url=article_data.get("url"),
+            original_source_url=original_source_url or None,
+            content_source=content_source,
+            canonical_hash=canonical_hash,
+            distance=distance,
+            published_at=article_data.get("published_at"),
+        )
+        db.add(duplicate)
+        return duplicate
+
+
+near_duplicate_index = NearDuplicateIndex()
@@ -0,0 +1,374 @@
+"""文章分面过滤和分面计数
+
+过滤（文章列表 SQL）：标签（tags @> ，GIN索引 idx_articles_tags_gin）、数据源、内容来源、作者、
+AI提取的实体（article_ai_outputs.entities @> ，GIN索引 idx_ai_outputs_entities_gin），可与分类、日期组合。
+
+分面计数（/v1/articles/facets）不对数据库做 GROUP BY，由进程内的分面索引计算：
+
+- 每篇未删除的文章一行；单值分面（分类/数据源/内容来源/作者）存为值编码数组，
+  多值分面（标签/药物/疾病/公司）存为 (行, 值) 对和按值排序的倒排（值 -> 行）
+- 一次请求：过滤条件求出行掩码（编码比较 + 倒排置位），每个分面 np.bincount 一次
+- 结果按 (索引版本, 过滤条件) 缓存；索引更新（定时任务按 updated_at 水位读取变更的文章，
+  在线程中重新生成数组）后版本号加一，旧缓存自然失效
+
+分面计数与列表使用同样的过滤条件，实体取未过期（与文章当前版本一致）的AI分析。
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select, or_
+
+from app.models import Article, ArticleAIOutput
+
+logger = logging.getLogger(__name__)
+
+# 单值分面 -> 文章列
+SINGLE_FACETS = {
+    "category": "category",
+    "source": "source_id",
+    "content_source": "content_source",
+    "author": "author",
+}
+
+# 多值分面：标签 + 实体类型（ArticleAIOutput.entities 的键）
+ENTITY_FACETS = {"drug": "drugs", "disease": "diseases", "company": "companies"}
+MULTI_FACETS = ("tag",) + tuple(ENTITY_FACETS)
+
+FACET_NAMES = tuple(SINGLE_FACETS) + MULTI_FACETS
+
+# 分面计数缓存的过滤组合数
+COUNT_CACHE_SIZE = 512
+
+BATCH_SIZE = 1000
+
+# 变更水位的回看窗口（同 search_index.REFRESH_OVERLAP）
+REFRESH_OVERLAP = timedelta(minutes=5)
+
+
+@dataclass(frozen=True)
+class ArticleFilters:
+    """文章列表/分面的过滤条件（多个标签、多个实体之间为"且"）"""
+    category: Optional[str] = None
+    from_date: Optional[datetime] = None
+    source_id: Optional[int] = None
+    content_source: Optional[str] = None
+    author: Optional[str] = None
+    tags: Tuple[str, ...] = field(default_factory=tuple)
+    entities: Tuple[str, ...] = field(default_factory=tuple)
+
+    @classmethod
+    def parse(cls, category=None, from_date=None, source_id=None, content_source=None,
+              author=None, tags=None, entities=None) -> "ArticleFilters":
+        """
+        从查询参数构建（空值忽略，标签/实体去重排序）
+
+        Raises:
+            ValueError: 日期格式错误
+        """
+        date_obj = None
+        if from_date:
+            try:
+                date_obj = datetime.strptime(from_date, "%Y-%m-%d")
+            except ValueError:
+                raise ValueError("Invalid date format. Use YYYY-MM-DD")
+        return cls(
+            category=category or None,
+            from_date=date_obj,
+            source_id=source_id,
+            content_source=content_source or None,
+            author=author or None,
+            tags=tuple(sorted({t.strip() for t in tags or [] if t.strip()})),
+            entities=tuple(sorted({e.strip() for e in entities or [] if e.strip()})),
+        )
+
+    def key(self) -> tuple:
+        """缓存键"""
+        return (
+            self.category, self.from_date.isoformat() if self.from_date else None, self.source_id,
+            self.content_source, self.author, self.tags, self.entities,
+        )
+
+
+def apply_filters(query, filters: ArticleFilters):
+    """SQL 过滤（query 需已包含 articles 表）"""
+    if filters.category:
+        query = query.where(Article.category == filters.category)
+    if filters.from_date:
+        query = query.where(Article.published_at >= filters.from_date)
+    if filters.source_id is not None:
+        query = query.where(Article.source_id == filters.source_id)
+    if filters.content_source:
+        query = query.where(Article.content_source == filters.content_source)
+    if filters.author:
+        query = query.where(Article.author == filters.author)
+    if filters.tags:
+        query = query.where(Article.tags.contains(list(filters.tags)))
+    for name in filters.entities:
+        # 每个实体：任一类型包含该名称的未过期AI分析
+        query = query.where(Article.id.in_(
+            select(ArticleAIOutput.article_id).where(
+                ArticleAIOutput.is_stale == False,
+                or_(*(ArticleAIOutput.entities.contains({key: [name]}) for key in ENTITY_FACETS.values())),
+            )
+        ))
+    return query
+
+
+class _SingleFacet:
+    """单值分面：每行一个值编码（-1 表示空）"""
+
+    def __init__(self, values: list):
+        self.vocab = sorted({v for v in values if v is not None}, key=str)
+        self.codes_of = {v: i for i, v in enumerate(self.vocab)}
+        self.codes = np.fromiter(
+            (self.codes_of[v] if v is not None else -1 for v in values), dtype=np.int32, count=len(values)
+        )
+
+    def mask(self, value) -> np.ndarray:
+        code = self.codes_of.get(value)
+        if code is None:
+            return np.zeros(len(self.codes), dtype=bool)
+        return self.codes == code
+
+    def counts(self, mask: np.ndarray) -> np.ndarray:
+        codes = self.codes[mask]
+        return np.bincount(codes[codes >= 0], minlength=len(self.vocab))
+
+
+class _MultiFacet:
+    """多值分面：(行, 值编码) 对，以及按值排序的行（值 -> 行）"""
+
+    def __init__(self, value_lists: List[tuple]):
+        self.vocab = sorted({v for values in value_lists for v in values})
+        self.codes_of = {v: i for i, v in enumerate(self.vocab)}
+        rows, codes = [], []
+        for row, values in enumerate(value_lists):
+            for v in values:
+                rows.append(row)
+                codes.append(self.codes_of[v])
+        self.rows = np.array(rows, dtype=np.int32)
+        self.values = np.array(codes, dtype=np.int32)
+        self.size = len(value_lists)
+
+        order = np.argsort(self.values, kind="stable")
+        self.rows_by_value = self.rows[order]
+        self.value_offsets = np.zeros(len(self.vocab) + 1, dtype=np.int64)
+        self.value_offsets[1:] = np.cumsum(np.bincount(self.values, minlength=len(self.vocab)))
+
+    def rows_of(self, value) -> np.ndarray:
+        code = self.codes_of.get(value)
+        if code is None:
+            return self.rows_by_value[:0]
+        return self.rows_by_value[self.value_offsets[code]:self.value_offsets[code + 1]]
+
+    def counts(self, mask: np.ndarray) -> np.ndarray:
+        return np.bincount(self.values[mask[self.rows]], minlength=len(self.vocab))
+
+
+class _FacetArrays:
+    """某一时刻的分面索引（只读，整体替换）"""
+
+    def __init__(self, rows: Dict[int, dict]):
+        article_ids = sorted(rows)
+        records = [rows[a] for a in article_ids]
+        self.size = len(records)
+        self.published = np.array([r["published_at"] for r in records], dtype="datetime64[s]")
+        self.single = {
+            name: _SingleFacet([r[name] for r in records]) for name in SINGLE_FACETS
+        }
+        self.multi = {
+            name: _MultiFacet([r[name] for r in records]) for name in MULTI_FACETS
+        }
+
+    def mask(self, filters: ArticleFilters) -> np.ndarray:
+        mask = np.ones(self.size, dtype=bool)
+        if filters.category:
+            mask &= self.single["category"].mask(filters.category)
+        if filters.from_date:
+            mask &= self.published >= np.datetime64(filters.from_date, "s")
+        if filters.source_id is not None:
+            mask &= self.single["source"].mask(filters.source_id)
+        if filters.content_source:
+            mask &= self.single["content_source"].mask(filters.content_source)
+        if filters.author:
+            mask &= self.single["author"].mask(filters.author)
+        for tag in filters.tags:
+            tagged = np.zeros(self.size, dtype=bool)
+            tagged[self.multi["tag"].rows_of(tag)] = True
+            mask &= tagged
+        for name in filters.entities:
+            mentioned = np.zeros(self.size, dtype=bool)
+            for facet in ENTITY_FACETS:
+                mentioned[self.multi[facet].rows_of(name)] = True
+            mask &= mentioned
+        return mask
+
+    def counts(self, filters: ArticleFilters, limit: int) -> dict:
+        mask = self.mask(filters)
+        facets = {}
+        for name in FACET_NAMES:
+            facet = self.single.get(name) or self.multi[name]
+            counts = facet.counts(mask)
+            nonzero = np.flatnonzero(counts)
+            # 按数量从多到少，同数量按值排序（vocab 已排序，编码小的在前）
+            top = nonzero[np.lexsort((nonzero, -counts[nonzero]))][:limit]
+            facets[name] = [(facet.vocab[i], int(counts[i])) for i in top]
+        return {"total": int(mask.sum()), "facets": facets}
+
+
+class FacetIndex:
+    """分面索引：按文章维护分面值，变更后重新生成数组"""
+
+    def __init__(self):
+        self.ready = False
+        self.generation = 0
+        self._rows: Dict[int, dict] = {}
+        self._arrays: Optional[_FacetArrays] = None
+        self._counts: "OrderedDict[tuple, dict]" = OrderedDict()
+        self._mark: Optional[datetime] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """后台全量加载"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._initialize())
+
+    async def _initialize(self):
+        from app.database import get_db_context
+
+        try:
+            async with get_db_context() as db:
+                await self.refresh(db)
+        except Exception as e:
+            logger.error(f"[Facets] 分面索引加载失败: {e!r}")
+
+    async def close(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+    def counts(self, filters: ArticleFilters, limit: int = 20) -> Optional[dict]:
+        """
+        当前过滤条件下的结果数和各分面取值计数（每个分面最多 limit 个值，按数量从多到少）
+
+        Returns:
+            {"total": n, "facets": {分面: [(值, 数量)]}}；索引未就绪时为 None
+        """
+        if self._arrays is None:
+            return None
+        key = (self.generation, filters.key(), limit)
+        cached = self._counts.get(key)
+        if cached is not None:
+            self._counts.move_to_end(key)
+            return cached
+
+        result = self._arrays.counts(filters, limit)
+        self._counts[key] = result
+        if len(self._counts) > COUNT_CACHE_SIZE:
+            self._counts.popitem(last=False)
+        return result
+
+    async def refresh(self, db) -> int:
+        """
+        重新读取水位之后变更的文章（首次调用读取全部文章），有变化时重新生成数组
+
+        Returns:
+            有变化的文章数
+        """
+        async with self._lock:
+            query = select(Article.id, Article.updated_at)
+            if self._mark is not None:
+                query = query.where(Article.updated_at > self._mark - REFRESH_OVERLAP)
+            changed = (await db.execute(query)).all()
+
+            mark = self._mark
+            for row in changed:
+                if row.updated_at and (mark is None or row.updated_at > mark):
+                    mark = row.updated_at
+
+            ids = sorted(row.id for row in changed)
+            updated = 0
+            for start in range(0, len(ids), BATCH_SIZE):
+                batch = ids[start:start + BATCH_SIZE]
+                rows = await self._load(db, batch)
+                for article_id in batch:
+                    row = rows.get(article_id)
+                    if self._rows.get(article_id) != row:
+                        updated += 1
+                        if row is None:
+                            del self._rows[article_id]
+                        else:
+                            self._rows[article_id] = row
+
+            if updated or not self.ready:
+                # 刷新期间持有锁，线程中读取的行不会被修改
+                self._arrays = await asyncio.to_thread(_FacetArrays, self._rows)
+                self.generation += 1
+                self._counts.clear()
+            self._mark = mark
+            if not self.ready:
+                self.ready = True
+                logger.info(f"[Facets] 分面索引已加载: {len(self._rows)} 篇文章")
+            return updated
+
+    @staticmethod
+    async def _load(db, article_ids: List[int]) -> Dict[int, dict]:
+        """{文章ID: 分面值}，已删除的文章不返回"""
+        result = await db.execute(
+            select(
+                Article.id, Article.category, Article.source_id, Article.content_source,
+                Article.author, Article.tags, Article.published_at
+            )
+            .where(Article.id.in_(article_ids), Article.is_deleted == False)
+        )
+        articles = result.all()
+        if not articles:
+            return {}
+
+        ai_result = await db.execute(
+            select(ArticleAIOutput.article_id, ArticleAIOutput.entities)
+            .where(ArticleAIOutput.article_id.in_([a.id for a in articles]), ArticleAIOutput.is_stale == False)
+            .order_by(ArticleAIOutput.article_id, ArticleAIOutput.created_at.desc())
+            .distinct(ArticleAIOutput.article_id)
+        )
+        entities = {row.article_id: row.entities for row in ai_result.all()}
+
+        rows = {}
+        for a in articles:
+            row = {
+                "category": a.category,
+                "source": a.source_id,
+                "content_source": a.content_source,
+                "author": a.author,
+                "published_at": a.published_at,
+                "tag": _names(a.tags),
+            }
+            article_entities = entities.get(a.id)
+            for facet, key in ENTITY_FACETS.items():
+                row[facet] = _names(article_entities.get(key) if isinstance(article_entities, dict) else None)
+            rows[a.id] = row
+        return rows
+
+    def report(self) -> dict:
+        return {
+            "ready": self.ready,
+            "generation": self.generation,
+            "articles": len(self._rows),
+            "cached_counts": len(self._counts),
+        }
+
+
+def _names(values) -> tuple:
+    """JSONB 数组 -> 去重排序的非空字符串"""
+    if not isinstance(values, list):
+        return ()
+    return tuple(sorted({v.strip() for v in values if isinstance(v, str) and v.strip()}))
+
+
+facet_index = FacetIndex()
@@ -0,0 +1,383 @@
+"""图片转存服务 - 入库时把文章外链图片（mmbiz等）下载到附件桶并改写src
+
+下载的内容会发布到公开的附件桶，因此只访问公网地址：每次请求（包括每一跳重定向）前解析域名，
+回环/内网/链路本地等非公网地址一律拒绝，避免内网服务的响应被转存成公开链接（SSRF）。
+httpx 连接时会再解析一次域名，所以连接建立后还要校验实际连接的对端地址，
+防止两次解析之间域名被改指向内网地址（DNS rebinding）；对端不是公网地址时不读取响应内容。
+"""
+
+import asyncio
+import hashlib
+import io
+import ipaddress
+import logging
+import socket
+from typing import Dict, Optional, Set
+from urllib.parse import urlparse, parse_qs
+
+import httpx
+from lxml import etree
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models import ImageAsset
+from app.utils.html_sanitizer import parse_fragment, serialize_fragment
+from app.utils.s3_client import get_s3_client, S3Client
+
+try:
+    from PIL import Image
+except ImportError:  # 未安装Pillow时只转存原图，不生成缩略版本
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+# MIME类型 -> 文件扩展名
+IMAGE_EXTENSIONS = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/gif": "gif",
+    "image/webp": "webp",
+    "image/bmp": "bmp",
+}
+# 不转存 SVG：从我们自己的域名提供的 SVG 可以执行脚本（存储型XSS）
+
+# 可以缩放的格式（gif可能是动图）
+RESIZABLE_FORMATS = {"jpg": "JPEG", "png": "PNG", "webp": "WEBP"}
+
+# 下载时最多跟随的重定向次数
+MAX_REDIRECTS = 5
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+
+def _guess_content_type(url: str, header: Optional[str]) -> Optional[str]:
+    """根据响应头或微信图片的 wx_fmt 参数判断图片类型"""
+    content_type = (header or "").split(";")[0].strip().lower()
+    if content_type in IMAGE_EXTENSIONS:
+        return content_type
+
+    # 微信图片: https://mmbiz.qpic.cn/...?wx_fmt=png
+    wx_fmt = parse_qs(urlparse(url).query).get("wx_fmt", [""])[0].lower()
+    if wx_fmt in ("jpg", "jpeg"):
+        return "image/jpeg"
+    if f"image/{wx_fmt}" in IMAGE_EXTENSIONS:
+        return f"image/{wx_fmt}"
+    return None
+
+
+def _is_public_ip(address: str) -> bool:
+    """是否公网地址（回环、内网、链路本地、保留地址等均不是）"""
+    ip = ipaddress.ip_address(address.split("%", 1)[0])  # 去掉IPv6的zone
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    return ip.is_global
+
+
+async def ensure_public_url(url: str):
+    """
+    校验URL是 http(s) 且域名只解析到公网地址
+
+    Raises:
+        ValueError: 协议不支持、域名无法解析或解析到非公网地址
+    """
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        raise ValueError(f"不支持的图片地址: {url}")
+
+    port = parsed.port or (443 if parsed.scheme == "https" else 80)
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(parsed.hostname, port, type=socket.SOCK_STREAM)
+    except socket.gaierror as e:
+        raise ValueError(f"域名解析失败: {parsed.hostname} ({e})")
+
+    for info in infos:
+        address = info[4][0]
+        if not _is_public_ip(address):
+            raise ValueError(f"拒绝访问非公网地址: {parsed.hostname} -> {address}")
+
+
+def ensure_public_peer(response: httpx.Response):
+    """
+    校验响应实际来自公网地址（连接建立后的对端IP）
+
+    Raises:
+        ValueError: 无法获取对端地址或对端不是公网地址
+    """
+    stream = response.extensions.get("network_stream")
+    server_addr = stream.get_extra_info("server_addr") if stream is not None else None
+    if not server_addr:
+        raise ValueError(f"无法获取对端地址: {response.url}")
+    if not _is_public_ip(server_addr[0]):
+        raise ValueError(f"拒绝访问非公网地址: {response.url.host} -> {server_addr[0]}")
+
+
+def _make_variant(data: bytes, ext: str, max_width: int) -> Optional[tuple[bytes, int, int]]:
+    """
+    生成缩略版本（同步，放在线程池中执行）
+
+    Returns:
+        (图片数据, 原图宽度, 缩略图宽度)；无需或无法缩放时返回None
+    """
+    if Image is None or ext not in RESIZABLE_FORMATS:
+        return None
+
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            width, height = image.size
+            if width <= max_width:
+                return None
+
+            variant_height = max(1, round(height * max_width / width))
+            resized = image.resize((max_width, variant_height), Image.LANCZOS)
+            if RESIZABLE_FORMATS[ext] == "JPEG" and resized.mode not in ("RGB", "L"):
+                resized = resized.convert("RGB")
+
+            output = io.BytesIO()
+            resized.save(output, format=RESIZABLE_FORMATS[ext], quality=85, optimize=True)
+            return output.getvalue(), width, max_width
+    except Exception as e:
+        logger.warning(f"⚠️  生成缩略图失败: {e}")
+        return None
+
+
+def create_image_rehoster(s3_client: Optional[S3Client] = None) -> Optional["ImageRehoster"]:
+    """
+    创建图片转存器；未配置 S3_PUBLIC_URL 时返回 None（不转存，保留原图地址）
+
+    入库和重新提取脚本通过它创建转存器，配置缺失只跳过图片转存，不影响入库。
+    """
+    if not settings.S3_PUBLIC_URL:
+        logger.warning("⚠️  未配置 S3_PUBLIC_URL，跳过图片转存（保留原图地址）")
+        return None
+    return ImageRehoster(s3_client)
+
+
+class ImageRehoster:
+    """
+    图片转存器
+
+    - 限制并发下载数（IMAGE_REHOST_CONCURRENCY）
+    - 按内容SHA-256去重：相同图片只存一份，已存在的对象不再上传
+    - 同一实例内按URL缓存结果，批量入库时跨文章复用
+    - 传入数据库会话时通过 image_assets 表持久化URL索引，已转存过的图片不再下载
+    """
+
+    def __init__(self, s3_client: Optional[S3Client] = None, concurrency: Optional[int] = None):
+        if not settings.S3_PUBLIC_URL:
+            raise ValueError("启用图片转存时必须配置 S3_PUBLIC_URL（客户端访问附件的地址）")
+        self.s3_client = s3_client or get_s3_client()
+        self.bucket = settings.S3_BUCKET_ATTACHMENTS
+        self.semaphore = asyncio.Semaphore(concurrency or settings.IMAGE_REHOST_CONCURRENCY)
+        self._cache: Dict[str, asyncio.Future] = {}
+        self._stored_keys: Set[str] = set()
+        self._indexed_urls: Set[str] = set()
+        self.stats = {"downloaded": 0, "uploaded": 0, "deduplicated": 0, "failed": 0}
+
+    def _is_rehosted(self, url: str) -> bool:
+        """是否已经是我们自己的附件地址"""
+        return url.startswith(self.s3_client.get_public_url(self.bucket, ""))
+
+    async def _download(self, client: httpx.AsyncClient, url: str) -> Optional[tuple[bytes, str]]:
+        """
+        下载图片，返回 (数据, MIME类型)
+
+        重定向逐跳处理，每一跳都先校验目标地址，连接后再校验对端地址
+
+        Raises:
+            ValueError: 地址（或重定向目标）不是公网地址
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            await ensure_public_url(url)
+            async with client.stream("GET", url) as response:
+                ensure_public_peer(response)
+                if response.next_request is not None:
+                    url = str(response.next_request.url)
+                    continue
+
+                if response.status_code != 200:
+                    logger.warning(f"⚠️  图片下载失败 ({response.status_code}): {url}")
+                    return None
+
+                content_type = _guess_content_type(url, response.headers.get("content-type"))
+                if not content_type:
+                    logger.warning(f"⚠️  非图片内容，跳过: {url}")
+                    return None
+
+                chunks = []
+                size = 0
+                async for chunk in response.aiter_bytes():
+                    size += len(chunk)
+                    if size > settings.IMAGE_MAX_BYTES:
+                        logger.warning(f"⚠️  图片超过大小限制，跳过: {url}")
+                        return None
+                    chunks.append(chunk)
+
+            return b"".join(chunks), content_type
+
+        logger.warning(f"⚠️  图片重定向次数过多，跳过: {url}")
+        return None
+
+    async def _store(self, data: bytes, key: str, content_type: str) -> bool:
+        """上传到附件桶（对象已存在时跳过）"""
+        if key in self._stored_keys:
+            self.stats["deduplicated"] += 1
+            return True
+        # 先登记，避免并发下载到相同内容时重复上传
+        self._stored_keys.add(key)
+
+        if await asyncio.to_thread(self.s3_client.object_exists, self.bucket, key):
+            self.stats["deduplicated"] += 1
+            return True
+
+        uploaded = await asyncio.to_thread(
+            self.s3_client.upload_bytes, data, self.bucket, key, content_type
+        )
+        if uploaded:
+            self.stats["uploaded"] += 1
+        else:
+            self._stored_keys.discard(key)
+        return uploaded
+
+    async def _rehost_image(self, client: httpx.AsyncClient, url: str) -> Optional[dict]:
+        """
+        转存单张图片
+
+        Returns:
+            {"key": 对象键, "src": 原图地址, "srcset": 响应式地址或None}；失败时返回None
+        """
+        async with self.semaphore:
+            try:
+                downloaded = await self._download(client, url)
+            except (httpx.HTTPError, ValueError) as e:
+                logger.warning(f"⚠️  图片下载出错: {url} ({e})")
+                downloaded = None
+
+            if not downloaded:
+                self.stats["failed"] += 1
+                return None
+
+            data, content_type = downloaded
+            self.stats["downloaded"] += 1
+
+            ext = IMAGE_EXTENSIONS[content_type]
+            digest = hashlib.sha256(data).hexdigest()
+            key = f"images/{digest[:2]}/{digest}.{ext}"
+            if not await self._store(data, key, content_type):
+                self.stats["failed"] += 1
+                return None
+
+            result = {
+                "key": key,
+                "src": self.s3_client.get_public_url(self.bucket, key),
+                "srcset": None,
+            }
+
+            variant = await asyncio.to_thread(
+                _make_variant, data, ext, settings.IMAGE_VARIANT_WIDTH
+            )
+            if variant:
+                variant_data, width, variant_width = variant
+                variant_key = f"images/{digest[:2]}/{digest}_w{variant_width}.{ext}"
+                if await self._store(variant_data, variant_key, content_type):
+                    variant_url = self.s3_client.get_public_url(self.bucket, variant_key)
+                    result["srcset"] = f"{variant_url} {variant_width}w, {result['src']} {width}w"
+
+            return result
+
+    async def rehost_url(self, client: httpx.AsyncClient, url: str) -> Optional[dict]:
+        """转存图片（按URL缓存，并发请求同一URL只下载一次）"""
+        if url not in self._cache:
+            self._cache[url] = asyncio.ensure_future(self._rehost_image(client, url))
+        return await self._cache[url]
+
+    async def _load_index(self, db: AsyncSession, urls: list):
+        """从 image_assets 表加载已转存图片的结果"""
+        unknown = [url for url in set(urls) if url not in self._cache]
+        if not unknown:
+            return
+
+        result = await db.execute(
+            select(ImageAsset).where(ImageAsset.source_url.in_(unknown))
+        )
+        loop = asyncio.get_running_loop()
+        for asset in result.scalars().all():
+            future = loop.create_future()
+            future.set_result({
+                "key": asset.object_key,
+                "src": self.s3_client.get_public_url(self.bucket, asset.object_key),
+                "srcset": asset.srcset,
+            })
+            self._cache[asset.source_url] = future
+            self._indexed_urls.add(asset.source_url)
+
+    async def rehost_html(self, html_content: str, db: Optional[AsyncSession] = None, download: bool = True) -> str:
+        """
+        转存HTML中的所有外链图片并改写 src/srcset
+
+        下载失败的图片保留原地址。传入 db 时新转存的图片会加入会话
+        （由调用方随文章一起提交）。
+
+        Args:
+            html_content: 文章HTML片段
+            db: 可选的数据库会话，用于读写 image_assets 索引
+            download: 为False时只按已有的转存结果（image_assets 索引）改写，不下载也不上传
+
+        Returns:
+            改写后的HTML
+        """
+        if not html_content or "<img" not in html_content:
+            return html_content
+
+        try:
+            container = parse_fragment(html_content)
+        except etree.ParserError:
+            return html_content
+
+        images = []
+        for img in container.iter("img"):
+            # 微信懒加载图片的真实地址在 data-src 中
+            url = (img.get("data-src") or img.get("src") or "").strip()
+            if url.startswith("//"):
+                url = f"https:{url}"
+            if url.startswith(("http://", "https://")) and not self._is_rehosted(url):
+                images.append((img, url))
+
+        if not images:
+            return html_content
+
+        if db is not None:
+            await self._load_index(db, [url for _, url in images])
+
+        if download:
+            async with httpx.AsyncClient(
+                timeout=settings.IMAGE_REHOST_TIMEOUT,
+                follow_redirects=False,  # 重定向在 _download 中逐跳校验
+                trust_env=False,  # 不走环境变量中的代理，对端地址才是图片源站
+                headers={"User-Agent": USER_AGENT},
+            ) as client:
+                results = await asyncio.gather(
+                    *(self.rehost_url(client, url) for _, url in images)
+                )
+        else:
+            results = [
+                self._cache[url].result() if url in self._cache and self._cache[url].done() else None
+                for _, url in images
+            ]
+
+        for (img, url), result in zip(images, results):
+            if not result:
+                continue
+            if db is not None and url not in self._indexed_urls:
+                db.add(ImageAsset(source_url=url, object_key=result["key"], srcset=result["srcset"]))
+                self._indexed_urls.add(url)
+            img.set("src", result["src"])
+            if "data-src" in img.attrib:
+                img.set("data-src", result["src"])
+            if result["srcset"]:
+                img.set("srcset", result["srcset"])
+
+        return serialize_fragment(container)
@@ -0,0 +1,174 @@
+"""原始页面归档服务 - 把抓取到的页面HTML写入压缩分段，支持离线重新解析
+
+存储格式（类WARC）:
+- 每个页面是一条独立的 gzip 成员，头部为 WARC 风格的字段，正文为页面HTML
+- 多条记录顺序拼接成一个分段对象，存放在 S3_BUCKET_RAW 的 archive/ 前缀下
+- page_archive_records 表按 (url, fetched_at) 索引每条记录的分段、偏移和长度
+"""
+
+import asyncio
+import gzip
+import hashlib
+import logging
+import uuid
+from datetime import datetime
+from itertools import groupby
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.config import settings
+from app.database import get_db_context
+from app.models import PageArchiveRecord
+from app.utils import timezone as tz
+from app.utils.s3_client import get_s3_client, S3Client
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_PREFIX = "archive"
+
+# 页面类型
+PAGE_KIND_PHARNEX_LIST = "pharnex_list"
+PAGE_KIND_PHARNEX_DETAIL = "pharnex_detail"
+PAGE_KIND_WECHAT_ARTICLE = "wechat_article"
+
+
+def encode_record(url: str, page_kind: str, fetched_at: datetime, html: str) -> bytes:
+    """把一个页面编码为一条 gzip 压缩的类WARC记录"""
+    body = html.encode("utf-8")
+    header = (
+        "WARC/1.0\r\n"
+        "WARC-Type: response\r\n"
+        f"WARC-Target-URI: {url}\r\n"
+        f"WARC-Date: {fetched_at.isoformat()}\r\n"
+        f"X-Page-Kind: {page_kind}\r\n"
+        "Content-Type: text/html; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "\r\n"
+    ).encode("utf-8")
+    return gzip.compress(header + body + b"\r\n\r\n", compresslevel=6)
+
+
+def decode_record(data: bytes) -> Dict:
+    """解码一条记录，返回 {url, page_kind, fetched_at, html}"""
+    raw = gzip.decompress(data)
+    header, _, rest = raw.partition(b"\r\n\r\n")
+
+    fields = {}
+    for line in header.decode("utf-8").split("\r\n")[1:]:
+        name, _, value = line.partition(": ")
+        fields[name] = value
+
+    length = int(fields["Content-Length"])
+    return {
+        "url": fields["WARC-Target-URI"],
+        "page_kind": fields["X-Page-Kind"],
+        "fetched_at": datetime.fromisoformat(fields["WARC-Date"]),
+        "html": rest[:length].decode("utf-8"),
+    }
+
+
+class PageArchive:
+    """
+    页面归档写入器
+
+    页面先缓存在内存中，累计达到分段大小（PAGE_ARCHIVE_SEGMENT_MB）时
+    上传为一个分段并写入索引；抓取结束时调用 close() 写出剩余页面。
+    """
+
+    def __init__(self, s3_client: Optional[S3Client] = None, segment_max_bytes: Optional[int] = None):
+        self.s3_client = s3_client or get_s3_client()
+        self.bucket = settings.S3_BUCKET_RAW
+        self.segment_max_bytes = segment_max_bytes or settings.PAGE_ARCHIVE_SEGMENT_MB * 1024 * 1024
+        self._buffer: List[bytes] = []
+        self._entries: List[Dict] = []
+        self._size = 0
+        self._lock = asyncio.Lock()
+        self.stats = {"pages": 0, "segments": 0, "bytes": 0}
+
+    async def add(self, url: str, page_kind: str, html: str):
+        """归档一个页面"""
+        if not html:
+            return
+
+        fetched_at = tz.now()
+        record = encode_record(url, page_kind, fetched_at, html)
+        async with self._lock:
+            self._entries.append({
+                "url": url,
+                "page_kind": page_kind,
+                "fetched_at": fetched_at,
+                "offset": self._size,
+                "length": len(record),
+                "content_hash": hashlib.sha256(html.encode("utf-8")).hexdigest(),
+            })
+            self._buffer.append(record)
+            self._size += len(record)
+            self.stats["pages"] += 1
+
+            if self._size >= self.segment_max_bytes:
+                await self._flush_locked()
+
+    async def flush(self):
+        """把缓存的页面写为一个分段"""
+        async with self._lock:
+            await self._flush_locked()
+
+    async def close(self):
+        """结束归档（写出剩余页面）"""
+        await self.flush()
+        if self.stats["pages"]:
+            logger.info(
+                f"📦 页面归档完成: {self.stats['pages']} 个页面, "
+                f"{self.stats['segments']} 个分段, {self.stats['bytes'] / 1024:.1f} KB"
+            )
+
+    async def _flush_locked(self):
+        if not self._buffer:
+            return
+
+        now = tz.now()
+        segment_key = f"{ARCHIVE_PREFIX}/{now:%Y/%m/%d}/{now:%H%M%S}-{uuid.uuid4().hex[:8]}.warc.gz"
+        data = b"".join(self._buffer)
+        entries = self._entries
+        self._buffer, self._entries, self._size = [], [], 0
+
+        uploaded = await asyncio.to_thread(
+            self.s3_client.upload_bytes, data, self.bucket, segment_key, "application/warc"
+        )
+        if not uploaded:
+            logger.error(f"❌ 归档分段上传失败，丢弃 {len(entries)} 个页面: {segment_key}")
+            return
+
+        async with get_db_context() as db:
+            db.add_all(PageArchiveRecord(segment_key=segment_key, **entry) for entry in entries)
+            await db.commit()
+
+        self.stats["segments"] += 1
+        self.stats["bytes"] += len(data)
+
+
+def read_records(
+    records: Iterable[PageArchiveRecord],
+    s3_client: Optional[S3Client] = None
+) -> Iterator[Tuple[PageArchiveRecord, str]]:
+    """
+    读取归档页面（同步，按分段批量下载）
+
+    Args:
+        records: 索引记录
+        s3_client: S3客户端
+
+    Yields:
+        (索引记录, 页面HTML)
+    """
+    s3_client = s3_client or get_s3_client()
+    ordered = sorted(records, key=lambda r: (r.segment_key, r.offset))
+
+    for segment_key, group in groupby(ordered, key=lambda r: r.segment_key):
+        segment = s3_client.download_bytes(settings.S3_BUCKET_RAW, segment_key)
+        if segment is None:
+            logger.warning(f"⚠️  归档分段缺失: {segment_key}")
+            continue
+
+        for record in group:
+            data = segment[record.offset:record.offset + record.length]
+            yield record, decode_record(data)["html"]
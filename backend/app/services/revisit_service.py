@@ -0,0 +1,226 @@
+"""自适应重访调度 - 按各数据源的发布频率安排增量爬取
+
+每个数据源的下次爬取时间由历史发布频率（Article.published_at）推算：
+- 发布率 = max(近几天的发布率, 同一星期几的历史发布率)，突发时近期发布率占优
+- 文章集中在活跃时段（REVISIT_ACTIVE_HOURS）发布，间隔 = 目标新文章数 / 活跃时段每小时发布率
+- 上次爬取没有新文章时放大间隔，积压较多时缩小间隔
+- 间隔限制在 [REVISIT_MIN_MINUTES, REVISIT_MAX_MINUTES]，落在非活跃时段时顺延到下一个活跃时段开始
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from sqlalchemy import select, func
+
+from app.config import settings
+from app.database import get_db_context
+from app.models import Article, CrawlSchedule, Source
+from app.utils import timezone as tz
+
+logger = logging.getLogger(__name__)
+
+# 计算近期发布率的天数
+RECENT_DAYS = 3
+
+
+def parse_active_hours(value: str) -> Tuple[int, int]:
+    """解析 "7-23" 为 (7, 23)（含起点、不含终点）"""
+    start, _, end = value.partition("-")
+    start, end = int(start), int(end)
+    if not (0 <= start < end <= 24):
+        raise ValueError(f"无效的活跃时段: {value}")
+    return start, end
+
+
+def estimate_daily_rate(published: List[datetime], now: datetime, history_days: int) -> float:
+    """
+    估计当前每天的发布量
+
+    Args:
+        published: 最近 history_days 天内的发布时间
+        now: 当前时间
+        history_days: 历史窗口天数
+
+    Returns:
+        每天文章数
+    """
+    if not published:
+        return 0.0
+
+    today = now.date()
+    recent_start = today - timedelta(days=RECENT_DAYS - 1)
+    recent = sum(1 for p in published if p.date() >= recent_start)
+    recent_rate = recent / RECENT_DAYS
+
+    # 同一星期几的历史发布率（工作日和周末差异较大）
+    weekday = today.weekday()
+    same_weekday_days = sum(
+        1 for offset in range(1, history_days + 1)
+        if (today - timedelta(days=offset)).weekday() == weekday
+    )
+    same_weekday = sum(
+        1 for p in published if p.date() < today and p.weekday() == weekday
+    )
+    weekday_rate = same_weekday / same_weekday_days if same_weekday_days else 0.0
+
+    return max(recent_rate, weekday_rate)
+
+
+def is_active_time(moment: datetime, active_hours: Tuple[int, int]) -> bool:
+    """moment 是否在活跃时段内"""
+    return active_hours[0] <= moment.hour < active_hours[1]
+
+
+def next_active_time(moment: datetime, active_hours: Tuple[int, int]) -> datetime:
+    """moment 落在非活跃时段时顺延到下一个活跃时段开始"""
+    start = active_hours[0]
+    if is_active_time(moment, active_hours):
+        return moment
+    day_start = moment.replace(hour=start, minute=0, second=0, microsecond=0)
+    return day_start if moment.hour < start else day_start + timedelta(days=1)
+
+
+def compute_revisit_interval(
+    daily_rate: float,
+    last_new_articles: Optional[int],
+    active_hours: Tuple[int, int]
+) -> timedelta:
+    """
+    根据发布率和上次爬取结果计算重访间隔
+
+    Args:
+        daily_rate: 每天文章数
+        last_new_articles: 上次爬取的新文章数（首次为None）
+        active_hours: 活跃时段
+
+    Returns:
+        重访间隔（已限制在最小/最大间隔之间）
+    """
+    min_minutes = settings.REVISIT_MIN_MINUTES
+    max_minutes = settings.REVISIT_MAX_MINUTES
+    target = settings.REVISIT_TARGET_ARTICLES
+
+    active_span = active_hours[1] - active_hours[0]
+    hourly_rate = daily_rate / active_span
+    minutes = target / hourly_rate * 60 if hourly_rate > 0 else max_minutes
+
+    # 爬取结果反馈：空跑时放慢，积压时加快
+    if last_new_articles is not None:
+        if last_new_articles == 0:
+            minutes *= 1.5
+        elif last_new_articles >= 2 * target:
+            minutes *= 0.5
+
+    return timedelta(minutes=min(max(minutes, min_minutes), max_minutes))
+
+
+class RevisitScheduler:
+    """增量爬取调度器（状态保存在 crawl_schedules 表）"""
+
+    def __init__(self):
+        self.active_hours = parse_active_hours(settings.REVISIT_ACTIVE_HOURS)
+        self.sources = [s.strip() for s in settings.REVISIT_SOURCES.split(",") if s.strip()]
+
+    async def ensure_schedules(self):
+        """为配置的数据源创建调度记录（首次立即到期）"""
+        async with get_db_context() as db:
+            result = await db.execute(select(CrawlSchedule.source))
+            existing = set(result.scalars().all())
+            for source in self.sources:
+                if source not in existing:
+                    db.add(CrawlSchedule(source=source, enabled=True, next_run_at=tz.now()))
+            await db.commit()
+
+    async def _daily_rate(self, db, source_name: str, now: datetime) -> float:
+        """从发布历史估计数据源的每日发布量"""
+        since = (now - timedelta(days=settings.REVISIT_HISTORY_DAYS)).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        result = await db.execute(
+            select(Article.published_at)
+            .join(Source, Source.id == Article.source_id)
+            .where(
+                Source.name == source_name,
+                Article.published_at >= since,
+                Article.published_at <= now
+            )
+        )
+        return estimate_daily_rate(result.scalars().all(), now, settings.REVISIT_HISTORY_DAYS)
+
+    async def _count_new_articles(self, db, source_name: str, since: datetime) -> int:
+        result = await db.execute(
+            select(func.count(Article.id))
+            .join(Source, Source.id == Article.source_id)
+            .where(Source.name == source_name, Article.created_at >= since)
+        )
+        return result.scalar()
+
+    async def reschedule(self, schedule: CrawlSchedule, source_name: str, db):
+        """根据发布历史和上次结果计算下次爬取时间"""
+        now = tz.now()
+        rate = await self._daily_rate(db, source_name, now)
+        interval = compute_revisit_interval(rate, schedule.last_new_articles, self.active_hours)
+
+        schedule.publish_rate_per_day = round(rate, 2)
+        schedule.interval_minutes = int(interval.total_seconds() // 60)
+        schedule.next_run_at = next_active_time(now + interval, self.active_hours)
+
+    async def tick(self):
+        """执行所有到期的数据源爬取（爬虫任务互斥，一次只跑一个）"""
+        from app.services.crawler_service import crawler_service
+        from crawler.crawler_factory import CrawlerFactory
+
+        await self.ensure_schedules()
+
+        async with get_db_context() as db:
+            result = await db.execute(
+                select(CrawlSchedule)
+                .where(CrawlSchedule.enabled == True, CrawlSchedule.next_run_at <= tz.now())
+                .order_by(CrawlSchedule.next_run_at)
+            )
+            due = result.scalars().all()
+
+        for schedule in due:
+            if crawler_service.is_running():
+                logger.info("⏭️  爬虫任务运行中，推迟增量爬取")
+                return
+
+            # 非活跃时段只推迟，不爬取
+            if not is_active_time(tz.now(), self.active_hours):
+                async with get_db_context() as db:
+                    schedule = await db.get(CrawlSchedule, schedule.id)
+                    schedule.next_run_at = next_active_time(tz.now(), self.active_hours)
+                    await db.commit()
+                continue
+
+            source_name = CrawlerFactory.create_crawler(schedule.source).source_name
+            started_at = tz.now()
+            config = {
+                "source": schedule.source,
+                "pages": settings.REVISIT_CRAWL_PAGES,
+                "days_back": settings.REVISIT_DAYS_BACK,
+                "scheduled": True,
+            }
+            logger.info(f"🕒 增量爬取 {schedule.source}（间隔 {schedule.interval_minutes} 分钟）")
+
+            try:
+                await crawler_service.run_task(config)
+            except RuntimeError as e:
+                logger.warning(f"⚠️  增量爬取未启动: {e}")
+                return
+
+            async with get_db_context() as db:
+                schedule = await db.get(CrawlSchedule, schedule.id)
+                schedule.last_run_at = started_at
+                schedule.last_new_articles = await self._count_new_articles(db, source_name, started_at)
+                await self.reschedule(schedule, source_name, db)
+                await db.commit()
+
+                logger.info(
+                    f"✅ {schedule.source}: 新文章 {schedule.last_new_articles} 篇，"
+                    f"发布率 {schedule.publish_rate_per_day}/天，下次 {schedule.next_run_at:%m-%d %H:%M}"
+                )
+
+
+revisit_scheduler = RevisitScheduler()
@@ -0,0 +1,722 @@
+"""内存倒排索引 - 标题/摘要/正文分块的 BM25 检索，查询不访问数据库
+
+用于联想式搜索和混合检索的全文候选（/v1/search 无过滤条件时），避免高并发下每次查询都走 Postgres 全文检索。
+
+- 文档：每篇文章一个"标题+摘要"文档（chunk_id 为空），每个正文分块一个文档
+- 分词：与 search_vector 相同的 CJK 二元分词，文档另加每段汉字的末字（app/utils/fulltext.index_terms），
+  查询用 app/utils/fulltext.tokenize
+- 倒排表：文档ID升序，差值 + 变长字节（varint）编码，numpy 向量化解码；词频单独存 uint8
+- 打分：BM25；文档频率超过 HIGH_DF_RATIO 的词（近似停用词，解码最慢、区分度最低）不参与打分，
+  查询全是这样的词时只用最少见的一个
+
+快照：scripts/build_search_index.py 从数据库全量构建，写入 SEARCH_INDEX_PATH 目录（.npy 文件），
+倒排表和词频以 mmap 只读打开，多个 worker 共享页缓存。启动时在后台加载快照，没有快照时从数据库构建；
+就绪前 /v1/search 使用 Postgres 全文检索。
+
+增量更新：定时任务（app/tasks/search_index.py）按 articles.updated_at / article_chunks.created_at 水位
+拉取变更的文章，旧文档标记删除，新文档写入内存增量段。回看窗口内已按相同时间戳索引过的文章跳过，
+每次修改只写入一次。增量段在重新生成快照时合并，worker 发现快照更新后自动重新加载；
+标记删除的文档超过阈值时（例如一直没有磁盘快照）在内存中从数据库重建。
+"""
+
+import asyncio
+import bisect
+import json
+import logging
+import math
+import re
+import shutil
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select, func
+
+from app.config import settings
+from app.models import Article, ArticleChunk
+from app.utils import timezone as tz
+from app.utils.fulltext import CJK_RANGE, index_terms, tokenize
+
+logger = logging.getLogger(__name__)
+
+# 分词或文件格式变化时递增，旧版本快照不再加载（从数据库重新构建）
+SNAPSHOT_VERSION = 2
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# 文档频率超过该比例的词在查询还有其他词时不参与打分（全是这样的词时只用最少见的一个）
+HIGH_DF_RATIO = 0.05
+
+# 单个汉字查询匹配该字本身（段末字），并展开为以它开头的二元词，按文档频率取前N个
+PREFIX_EXPANSION = 32
+
+# 标题+摘要文档的 chunk_id
+HEAD_CHUNK = -1
+
+# 每批从数据库读取的文章数
+BUILD_BATCH_SIZE = 500
+
+# 增量更新的回看窗口：updated_at 由应用或数据库时钟写入、事务提交有延迟，窗口内的文章重新读取，
+# 时间戳比已索引的新时才重新索引
+REFRESH_OVERLAP = timedelta(minutes=5)
+
+# 标记删除的文档超过总文档数的该比例（且不少于 COMPACT_MIN_DEAD_DOCS）时从数据库重建
+COMPACT_DEAD_RATIO = 0.2
+COMPACT_MIN_DEAD_DOCS = 10000
+
+_SINGLE_CJK = re.compile(f"[{CJK_RANGE}]")
+
+_POSTING_FILES = ("postings", "tfs")
+_ARRAY_FILES = ("term_bytes", "term_postings", "doc_article", "doc_chunk", "doc_len")
+
+
+@dataclass
+class IndexHit:
+    """一个命中的文档"""
+    article_id: int
+    chunk_id: Optional[int]  # None 表示标题+摘要
+    score: float
+
+
+def _encode_varint(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """非负整数 -> (varint 字节, 每个值的字节数)；每字节低7位存数据，最高位表示后面还有字节"""
+    values = values.astype(np.uint32)
+    nbytes = np.ones(len(values), dtype=np.int8)
+    for shift in (7, 14, 21, 28):
+        nbytes += values >= (1 << shift)
+    ends = np.cumsum(nbytes, dtype=np.int64)
+    starts = ends - nbytes
+
+    out = np.empty(int(ends[-1]) if len(values) else 0, dtype=np.uint8)
+    for k in range(5):
+        mask = nbytes > k
+        if not mask.any():
+            break
+        low = (values[mask] >> np.uint32(7 * k)) & np.uint32(0x7F)
+        more = (nbytes[mask] > k + 1).astype(np.uint32) << np.uint32(7)
+        out[starts[mask] + k] = low | more
+    return out, nbytes
+
+
+def decode_postings(buf: np.ndarray, count: int) -> np.ndarray:
+    """varint 差值字节 -> 升序文档ID（count 为文档数；全部是单字节时不需要逐字节拼接）"""
+    if len(buf) == count:
+        deltas = buf.astype(np.uint32)
+    else:
+        ends = np.flatnonzero(buf < 0x80)
+        starts = np.empty_like(ends)
+        starts[0] = 0
+        starts[1:] = ends[:-1] + 1
+        shift = (np.arange(len(buf)) - np.repeat(starts, ends - starts + 1)) * 7
+        deltas = np.add.reduceat((buf & 0x7F).astype(np.uint32) << shift.astype(np.uint32), starts)
+    return np.cumsum(deltas, dtype=np.uint32)
+
+
+class _Segment:
+    """快照段（只读）：升序词典 + 每个词的 varint 倒排表和词频"""
+
+    def __init__(self, terms: List[str], term_bytes: np.ndarray, term_postings: np.ndarray,
+                 postings: np.ndarray, tfs: np.ndarray):
+        self.terms = terms  # 下标即词ID
+        self.term_bytes = term_bytes  # int64[词数+1]：词在 postings 中的字节区间
+        self.term_postings = term_postings  # int64[词数+1]：词在 tfs 中的区间，差值即文档频率
+        self.postings = postings
+        self.tfs = tfs
+        self.df = np.diff(term_postings)
+
+    def term_id(self, term: str) -> Optional[int]:
+        idx = bisect.bisect_left(self.terms, term)
+        if idx < len(self.terms) and self.terms[idx] == term:
+            return idx
+        return None
+
+    def prefix_range(self, prefix: str) -> Tuple[int, int]:
+        return (
+            bisect.bisect_left(self.terms, prefix),
+            bisect.bisect_left(self.terms, prefix + "\U0010ffff"),
+        )
+
+    def read(self, tid: int) -> Tuple[np.ndarray, np.ndarray]:
+        lo, hi = self.term_postings[tid], self.term_postings[tid + 1]
+        docs = decode_postings(self.postings[self.term_bytes[tid]:self.term_bytes[tid + 1]], hi - lo)
+        return docs, self.tfs[lo:hi]
+
+
+class _SegmentBuilder:
+    """从文档流构建快照段，文档ID按添加顺序递增"""
+
+    def __init__(self):
+        self.vocab: Dict[str, int] = {}
+        self.term_ids = array("I")
+        self.doc_ids = array("I")
+        self.freqs = array("B")
+        self.doc_article = array("i")
+        self.doc_chunk = array("i")
+        self.doc_len = array("I")
+
+    def add_articles(self, documents: Dict[int, List[Tuple[Optional[int], str]]]):
+        """添加一批文章的文档（{文章ID: [(分块ID, 文本)]}，按文章ID升序）"""
+        for article_id in sorted(documents):
+            self._add_article(article_id, documents[article_id])
+
+    def _add_article(self, article_id: int, documents: List[Tuple[Optional[int], str]]):
+        for chunk_id, text in documents:
+            counts = Counter(index_terms(text))
+            doc_id = len(self.doc_article)
+            self.doc_article.append(article_id)
+            self.doc_chunk.append(HEAD_CHUNK if chunk_id is None else chunk_id)
+            self.doc_len.append(sum(counts.values()))
+            for term, tf in counts.items():
+                tid = self.vocab.get(term)
+                if tid is None:
+                    tid = self.vocab[term] = len(self.vocab)
+                self.term_ids.append(tid)
+                self.doc_ids.append(doc_id)
+                self.freqs.append(min(tf, 255))
+
+    def finish(self) -> dict:
+        """排序词典并编码倒排表，返回快照数组"""
+        vocab = list(self.vocab)
+        order = sorted(range(len(vocab)), key=vocab.__getitem__)
+        remap = np.empty(len(vocab), dtype=np.int64)
+        remap[order] = np.arange(len(vocab))
+
+        tids = remap[np.frombuffer(self.term_ids, dtype=np.uint32)]
+        perm = np.argsort(tids, kind="stable")  # 同一个词内保持文档ID升序
+        tids = tids[perm]
+        docs = np.frombuffer(self.doc_ids, dtype=np.uint32)[perm].astype(np.int64)
+        tfs = np.frombuffer(self.freqs, dtype=np.uint8)[perm]
+
+        term_postings = np.zeros(len(vocab) + 1, dtype=np.int64)
+        term_postings[1:] = np.cumsum(np.bincount(tids, minlength=len(vocab)))
+
+        # 每个词的第一个文档存绝对ID，其余存与前一个文档的差值
+        deltas = np.diff(docs, prepend=0)
+        deltas[term_postings[:-1]] = docs[term_postings[:-1]]
+        postings, nbytes = _encode_varint(deltas)
+        term_bytes = np.zeros(len(vocab) + 1, dtype=np.int64)
+        if len(docs):
+            term_bytes[1:] = np.cumsum(nbytes, dtype=np.int64)[term_postings[1:] - 1]
+
+        return {
+            "terms": [vocab[i] for i in order],
+            "term_bytes": term_bytes,
+            "term_postings": term_postings,
+            "postings": postings,
+            "tfs": tfs,
+            "doc_article": np.frombuffer(self.doc_article, dtype=np.int32).copy(),
+            "doc_chunk": np.frombuffer(self.doc_chunk, dtype=np.int32).copy(),
+            "doc_len": np.frombuffer(self.doc_len, dtype=np.uint32).copy(),
+        }
+
+
+class _DocTable:
+    """文档表：文档ID -> 文章ID、分块ID、长度、是否有效（容量按倍数增长）"""
+
+    def __init__(self, article: np.ndarray, chunk: np.ndarray, length: np.ndarray):
+        size = len(article)
+        capacity = max(1024, size + size // 8)
+        self.article = np.zeros(capacity, dtype=np.int32)
+        self.chunk = np.zeros(capacity, dtype=np.int32)
+        self.length = np.zeros(capacity, dtype=np.float32)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.article[:size] = article
+        self.chunk[:size] = chunk
+        self.length[:size] = length
+        self.alive[:size] = True
+        self.size = size
+        self.alive_count = size
+        self.total_length = float(np.sum(length, dtype=np.float64))
+
+        # 快照文档按文章ID排序的下标，用于找到一篇文章的全部文档
+        self.base_size = size
+        self.base_order = np.argsort(self.article[:size], kind="stable")
+        self.base_sorted = self.article[:size][self.base_order]
+
+    def append(self, article_id: int, chunk_id: int, length: int) -> int:
+        if self.size == len(self.article):
+            capacity = len(self.article) * 2
+            for name in ("article", "chunk", "length", "alive"):
+                grown = np.zeros(capacity, dtype=getattr(self, name).dtype)
+                grown[:self.size] = getattr(self, name)[:self.size]
+                setattr(self, name, grown)
+        doc_id = self.size
+        self.article[doc_id] = article_id
+        self.chunk[doc_id] = chunk_id
+        self.length[doc_id] = length
+        self.alive[doc_id] = True
+        self.size += 1
+        self.alive_count += 1
+        self.total_length += length
+        return doc_id
+
+    def base_docs(self, article_id: int) -> np.ndarray:
+        lo = np.searchsorted(self.base_sorted, article_id, side="left")
+        hi = np.searchsorted(self.base_sorted, article_id, side="right")
+        return self.base_order[lo:hi]
+
+    def kill(self, doc_ids):
+        doc_ids = np.asarray(doc_ids, dtype=np.int64)
+        doc_ids = doc_ids[self.alive[doc_ids]]
+        self.alive[doc_ids] = False
+        self.alive_count -= len(doc_ids)
+        self.total_length -= float(np.sum(self.length[doc_ids], dtype=np.float64))
+
+
+def _count_terms(documents: Dict[int, List[Tuple[Optional[int], str]]]) -> Dict[int, list]:
+    """{文章ID: [(分块ID, 文本)]} -> {文章ID: [(分块ID, 词频)]}（在线程中执行）"""
+    return {
+        article_id: [(chunk_id, Counter(index_terms(text))) for chunk_id, text in docs]
+        for article_id, docs in documents.items()
+    }
+
+
+async def _load_documents(db, article_ids: List[int]) -> Dict[int, List[Tuple[Optional[int], str]]]:
+    """读取文章的标题+摘要和正文分块（已删除的文章不返回）"""
+    result = await db.execute(
+        select(Article.id, Article.title, Article.summary)
+        .where(Article.id.in_(article_ids), Article.is_deleted == False)
+    )
+    documents = {row.id: [(None, f"{row.title}\n{row.summary or ''}")] for row in result.all()}
+    if not documents:
+        return documents
+
+    result = await db.execute(
+        select(ArticleChunk.id, ArticleChunk.article_id, ArticleChunk.chunk_text)
+        .where(ArticleChunk.article_id.in_(list(documents)))
+        .order_by(ArticleChunk.article_id, ArticleChunk.chunk_index)
+    )
+    for row in result.all():
+        documents[row.article_id].append((row.id, row.chunk_text))
+    return documents
+
+
+async def _watermarks(db) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """当前的 (max(articles.updated_at), max(article_chunks.created_at))"""
+    article_mark = await db.scalar(select(func.max(Article.updated_at)))
+    chunk_mark = await db.scalar(select(func.max(ArticleChunk.created_at)))
+    return article_mark, chunk_mark
+
+
+async def build_snapshot_arrays(db) -> Tuple[dict, dict]:
+    """
+    从数据库全量构建索引
+
+    Returns:
+        (快照数组, 元数据)；水位在读取前记录，构建期间的变更由增量更新补上
+    """
+    article_mark, chunk_mark = await _watermarks(db)
+    builder = _SegmentBuilder()
+    last_id = 0
+    articles = 0
+    while True:
+        result = await db.execute(
+            select(Article.id)
+            .where(Article.id > last_id, Article.is_deleted == False)
+            .order_by(Article.id)
+            .limit(BUILD_BATCH_SIZE)
+        )
+        ids = list(result.scalars().all())
+        if not ids:
+            break
+        last_id = ids[-1]
+        documents = await _load_documents(db, ids)
+        await asyncio.to_thread(builder.add_articles, documents)
+        articles += len(documents)
+
+    arrays = await asyncio.to_thread(builder.finish)
+    meta = {
+        "version": SNAPSHOT_VERSION,
+        "built_at": tz.now().isoformat(),
+        "article_watermark": article_mark.isoformat() if article_mark else None,
+        "chunk_watermark": chunk_mark.isoformat() if chunk_mark else None,
+        "articles": articles,
+        "documents": len(arrays["doc_article"]),
+        "terms": len(arrays["terms"]),
+        "posting_bytes": int(len(arrays["postings"])),
+    }
+    return arrays, meta
+
+
+def write_snapshot(path: Path, arrays: dict, meta: dict):
+    """写入快照目录（先写临时目录再替换，加载中的 worker 不会读到写了一半的文件）"""
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    old = path.with_name(path.name + ".old")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    (tmp / "terms.txt").write_text("\n".join(arrays["terms"]), encoding="utf-8")
+    for name in _POSTING_FILES + _ARRAY_FILES:
+        np.save(tmp / f"{name}.npy", arrays[name])
+    (tmp / "meta.json").write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    shutil.rmtree(old, ignore_errors=True)
+    if path.exists():
+        path.rename(old)
+    tmp.rename(path)
+    shutil.rmtree(old, ignore_errors=True)
+
+
+def read_snapshot_meta(path: Path) -> Optional[dict]:
+    try:
+        meta = json.loads((Path(path) / "meta.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("version") == SNAPSHOT_VERSION else None
+
+
+def read_snapshot(path: Path) -> Tuple[dict, dict]:
+    """读取快照：倒排表和词频 mmap，其余数组读入内存"""
+    path = Path(path)
+    meta = read_snapshot_meta(path)
+    if meta is None:
+        raise FileNotFoundError(f"No search index snapshot at {path}")
+    text = (path / "terms.txt").read_text(encoding="utf-8")
+    arrays = {"terms": text.split("\n") if text else []}
+    for name in _POSTING_FILES:
+        arrays[name] = np.load(path / f"{name}.npy", mmap_mode="r")
+    for name in _ARRAY_FILES:
+        arrays[name] = np.load(path / f"{name}.npy")
+    return arrays, meta
+
+
+def _parse_mark(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _is_newer(mark: Optional[datetime], seen: Optional[datetime]) -> bool:
+    """时间戳 mark 是否比 seen 新（没有时间戳的不算更新；seen 为空时任何时间戳都算）"""
+    return mark is not None and (seen is None or mark > seen)
+
+
+class SearchIndex:
+    """进程内倒排索引：快照段 + 内存增量段"""
+
+    def __init__(self, path: str = settings.SEARCH_INDEX_PATH):
+        self.path = Path(path)
+        self.ready = False
+        self.snapshot_built_at: Optional[str] = None
+        self._segment: Optional[_Segment] = None
+        self._docs: Optional[_DocTable] = None
+        self._delta: Dict[str, Tuple[array, array]] = {}
+        self._delta_articles: Dict[int, List[int]] = {}
+        self._article_mark: Optional[datetime] = None
+        self._chunk_mark: Optional[datetime] = None
+        # 回看窗口内已索引文章的 (updated_at, 分块最大 created_at)
+        self._indexed_marks: Dict[int, Tuple[Optional[datetime], Optional[datetime]]] = {}
+        self._scores = np.zeros(0, dtype=np.float32)
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    # ---------- 加载 / 构建 ----------
+
+    def _install(self, arrays: dict, meta: dict):
+        """替换为新的快照（同步执行，查询不会看到一半的状态）"""
+        self._segment = _Segment(
+            arrays["terms"], arrays["term_bytes"], arrays["term_postings"], arrays["postings"], arrays["tfs"]
+        )
+        self._docs = _DocTable(arrays["doc_article"], arrays["doc_chunk"], arrays["doc_len"])
+        self._delta = {}
+        self._delta_articles = {}
+        self._indexed_marks = {}
+        self._article_mark = _parse_mark(meta.get("article_watermark"))
+        self._chunk_mark = _parse_mark(meta.get("chunk_watermark"))
+        self.snapshot_built_at = meta.get("built_at")
+        self.ready = True
+        logger.info(
+            f"[SearchIndex] 已加载: {meta.get('documents')} 个文档, {meta.get('terms')} 个词, "
+            f"快照时间 {self.snapshot_built_at}"
+        )
+
+    def start(self):
+        """后台加载快照（没有快照时从数据库构建），然后追上快照之后的变更"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._initialize())
+
+    async def _initialize(self):
+        from app.database import get_db_context
+
+        try:
+            async with self._lock:
+                if read_snapshot_meta(self.path) is not None:
+                    arrays, meta = await asyncio.to_thread(read_snapshot, self.path)
+                else:
+                    logger.warning(f"[SearchIndex] 未找到快照 {self.path}，从数据库构建（就绪前使用 Postgres 全文检索）")
+                    async with get_db_context() as db:
+                        arrays, meta = await self._build_in_memory(db)
+                self._install(arrays, meta)
+            async with get_db_context() as db:
+                await self.refresh(db)
+        except Exception as e:
+            logger.error(f"[SearchIndex] 初始化失败，/v1/search 使用 Postgres 全文检索: {e!r}")
+
+    async def _build_in_memory(self, db) -> Tuple[dict, dict]:
+        """从数据库构建（不写磁盘）；保留已加载快照的时间，磁盘上出现更新的快照时再加载它"""
+        arrays, meta = await build_snapshot_arrays(db)
+        meta["built_at"] = self.snapshot_built_at
+        return arrays, meta
+
+    def needs_compaction(self) -> bool:
+        """标记删除的文档是否已超过阈值"""
+        if not self.ready:
+            return False
+        dead = self._docs.size - self._docs.alive_count
+        return dead >= max(COMPACT_MIN_DEAD_DOCS, COMPACT_DEAD_RATIO * self._docs.size)
+
+    async def compact(self, db):
+        """
+        从数据库重建，丢弃标记删除的文档和增量段
+
+        构建期间查询继续使用当前索引；各 worker 各自重建，不写快照（避免多个进程同时写同一目录）。
+        """
+        async with self._lock:
+            dead = self._docs.size - self._docs.alive_count
+            logger.info(f"[SearchIndex] 标记删除的文档 {dead}/{self._docs.size}，从数据库重建")
+            arrays, meta = await self._build_in_memory(db)
+            self._install(arrays, meta)
+
+    async def reload_if_changed(self) -> bool:
+        """磁盘上的快照比已加载的新时重新加载"""
+        meta = read_snapshot_meta(self.path)
+        if meta is None or not self.ready or meta.get("built_at") == self.snapshot_built_at:
+            return False
+        async with self._lock:
+            arrays, meta = await asyncio.to_thread(read_snapshot, self.path)
+            self._install(arrays, meta)
+        return True
+
+    async def close(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+    # ---------- 增量更新 ----------
+
+    def _article_docs(self, article_id: int) -> List[int]:
+        docs = self._docs.base_docs(article_id).tolist()
+        return docs + self._delta_articles.get(article_id, [])
+
+    def _apply(self, article_ids: List[int], counted: Dict[int, list]):
+        """重新索引一批文章：旧文档标记删除，新文档写入增量段"""
+        for article_id in article_ids:
+            self._docs.kill(self._article_docs(article_id))
+            self._delta_articles.pop(article_id, None)
+
+            doc_ids = []
+            for chunk_id, counts in counted.get(article_id, []):
+                doc_id = self._docs.append(
+                    article_id, HEAD_CHUNK if chunk_id is None else chunk_id, sum(counts.values())
+                )
+                for term, tf in counts.items():
+                    entry = self._delta.get(term)
+                    if entry is None:
+                        entry = self._delta[term] = (array("I"), array("B"))
+                    entry[0].append(doc_id)
+                    entry[1].append(min(tf, 255))
+                doc_ids.append(doc_id)
+            if doc_ids:
+                self._delta_articles[article_id] = doc_ids
+
+    async def refresh(self, db) -> int:
+        """
+        重新索引水位之后变更的文章（新增、更新、删除、重新分块）
+
+        Returns:
+            处理的文章数
+        """
+        if not self.ready:
+            return 0
+
+        async with self._lock:
+            article_query = select(Article.id, Article.updated_at)
+            chunk_query = select(ArticleChunk.article_id, func.max(ArticleChunk.created_at).label("created_at"))
+            if self._article_mark is not None:
+                article_query = article_query.where(Article.updated_at > self._article_mark - REFRESH_OVERLAP)
+            if self._chunk_mark is not None:
+                chunk_query = chunk_query.where(ArticleChunk.created_at > self._chunk_mark - REFRESH_OVERLAP)
+
+            article_mark, chunk_mark = self._article_mark, self._chunk_mark
+            marks: Dict[int, list] = {}
+            for row in (await db.execute(article_query)).all():
+                marks.setdefault(row.id, [None, None])[0] = row.updated_at
+                if row.updated_at and (article_mark is None or row.updated_at > article_mark):
+                    article_mark = row.updated_at
+            for row in (await db.execute(chunk_query.group_by(ArticleChunk.article_id))).all():
+                marks.setdefault(row.article_id, [None, None])[1] = row.created_at
+                if row.created_at and (chunk_mark is None or row.created_at > chunk_mark):
+                    chunk_mark = row.created_at
+
+            # 回看窗口内的文章每次都会读到，时间戳都不比已索引的新时跳过
+            changed = []
+            for article_id, (updated, chunked) in marks.items():
+                indexed = self._indexed_marks.get(article_id)
+                seen_updated, seen_chunked = indexed or (None, None)
+                if indexed is not None and not (_is_newer(updated, seen_updated) or _is_newer(chunked, seen_chunked)):
+                    continue
+                changed.append(article_id)
+                self._indexed_marks[article_id] = (
+                    updated if _is_newer(updated, seen_updated) else seen_updated,
+                    chunked if _is_newer(chunked, seen_chunked) else seen_chunked,
+                )
+            self._forget_indexed(article_mark, chunk_mark)
+
+            ids = sorted(changed)
+            for start in range(0, len(ids), BUILD_BATCH_SIZE):
+                batch = ids[start:start + BUILD_BATCH_SIZE]
+                documents = await _load_documents(db, batch)
+                counted = await asyncio.to_thread(_count_terms, documents)
+                self._apply(batch, counted)
+
+            self._article_mark, self._chunk_mark = article_mark, chunk_mark
+            return len(ids)
+
+    def _forget_indexed(self, article_mark: Optional[datetime], chunk_mark: Optional[datetime]):
+        """移除已经移出回看窗口的文章（之后只有时间戳更新时才会再读到）"""
+        article_floor = article_mark - REFRESH_OVERLAP if article_mark else None
+        chunk_floor = chunk_mark - REFRESH_OVERLAP if chunk_mark else None
+        self._indexed_marks = {
+            article_id: (updated, chunked)
+            for article_id, (updated, chunked) in self._indexed_marks.items()
+            if _is_newer(updated, article_floor) or _is_newer(chunked, chunk_floor)
+        }
+
+    # ---------- 查询 ----------
+
+    def _query_terms(self, query: str) -> List[str]:
+        terms = []
+        for term in dict.fromkeys(tokenize(query)):
+            terms.append(term)
+            if _SINGLE_CJK.fullmatch(term):
+                # 单字只在快照词典中展开（增量段的新词要等下次快照）
+                lo, hi = self._segment.prefix_range(term)
+                if hi - lo > PREFIX_EXPANSION:
+                    top = np.argpartition(-self._segment.df[lo:hi], PREFIX_EXPANSION)[:PREFIX_EXPANSION]
+                    candidates = sorted(lo + int(i) for i in top)
+                else:
+                    candidates = range(lo, hi)
+                terms.extend(self._segment.terms[tid] for tid in candidates if self._segment.terms[tid] != term)
+        return terms
+
+    def _term_df(self, term: str) -> Tuple[Optional[int], int]:
+        tid = self._segment.term_id(term)
+        df = int(self._segment.df[tid]) if tid is not None else 0
+        delta = self._delta.get(term)
+        return tid, df + (len(delta[0]) if delta else 0)
+
+    def _read(self, term: str, tid: Optional[int]) -> Tuple[np.ndarray, np.ndarray]:
+        parts = [self._segment.read(tid)] if tid is not None else []
+        delta = self._delta.get(term)
+        if delta:
+            parts.append((np.frombuffer(delta[0], dtype=np.uint32).copy(), np.frombuffer(delta[1], dtype=np.uint8).copy()))
+        if len(parts) == 1:
+            return parts[0]
+        return np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts])
+
+    def search(self, query: str, limit: int = 10) -> List[IndexHit]:
+        """
+        BM25 检索（任一查询词命中即可，按得分从高到低）
+
+        Args:
+            query: 检索文本
+            limit: 返回的文档数
+
+        Returns:
+            命中的文档；索引未就绪时为空列表
+        """
+        if not self.ready:
+            return []
+        docs_table = self._docs
+        n_docs = max(docs_table.alive_count, 1)
+        avg_length = max(docs_table.total_length / n_docs, 1.0)
+
+        terms = []
+        for term in self._query_terms(query):
+            tid, df = self._term_df(term)
+            if df:
+                terms.append((term, tid, df))
+        if not terms:
+            return []
+        # 高频词的 idf 接近0，对排序几乎没有影响；全是高频词时只用最少见的一个
+        terms = [t for t in terms if t[2] <= HIGH_DF_RATIO * n_docs] or [min(terms, key=lambda t: t[2])]
+
+        # 得分累加到按文档ID寻址的数组（每个词的文档不重复），比按文档排序合并快
+        if len(self._scores) < docs_table.size:
+            self._scores = np.zeros(len(docs_table.alive), dtype=np.float32)
+        accumulator = self._scores
+        doc_parts = []
+        for term, tid, _ in terms:
+            docs, tfs = self._read(term, tid)
+            if docs_table.alive_count < docs_table.size:
+                keep = docs_table.alive[docs]
+                docs, tfs = docs[keep], tfs[keep]
+            if not len(docs):
+                continue
+            tfs = tfs.astype(np.float32)
+            df = len(docs)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * docs_table.length[docs] / avg_length)
+            accumulator[docs] += idf * tfs * (BM25_K1 + 1) / (tfs + norm)
+            doc_parts.append(docs)
+        if not doc_parts:
+            return []
+
+        docs = doc_parts[0] if len(doc_parts) == 1 else np.concatenate(doc_parts)
+        scores = accumulator[docs]
+        accumulator[docs] = 0
+
+        # 一个文档最多重复出现（词数）次，多取这么多倍再去重即可得到前 limit 个不同文档
+        want = min(len(docs), limit * len(doc_parts))
+        if len(docs) > want:
+            top = np.argpartition(-scores, want - 1)[:want]
+        else:
+            top = np.arange(len(docs))
+        top = top[np.lexsort((docs[top], -scores[top]))]
+
+        hits = []
+        seen = set()
+        for idx in top:
+            doc_id = int(docs[idx])
+            if doc_id in seen:
+                continue
+            seen.add(doc_id)
+            chunk_id = int(docs_table.chunk[doc_id])
+            hits.append(IndexHit(
+                article_id=int(docs_table.article[doc_id]),
+                chunk_id=None if chunk_id == HEAD_CHUNK else chunk_id,
+                score=float(scores[idx]),
+            ))
+            if len(hits) >= limit:
+                break
+        return hits
+
+    def search_articles(self, query: str, limit: int = 10) -> List[IndexHit]:
+        """按文章去重的检索结果（每篇文章取其最相关的文档，用于生成摘要片段）"""
+        hits = {}
+        for hit in self.search(query, limit * 4):
+            if hit.article_id not in hits:
+                hits[hit.article_id] = hit
+                if len(hits) >= limit:
+                    break
+        return list(hits.values())
+
+    def report(self) -> dict:
+        if not self.ready:
+            return {"ready": False}
+        return {
+            "ready": True,
+            "snapshot_built_at": self.snapshot_built_at,
+            "documents": self._docs.alive_count,
+            "snapshot_terms": len(self._segment.terms),
+            "delta_terms": len(self._delta),
+            "delta_articles": len(self._delta_articles),
+            "dead_documents": self._docs.size - self._docs.alive_count,
+            "posting_bytes": int(len(self._segment.postings)),
+        }
+
+
+search_index = SearchIndex()
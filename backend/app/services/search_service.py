@@ -0,0 +1,253 @@
+"""混合检索服务 - 全文检索 + 向量检索，用倒数排名融合（RRF）合并
+
+- 词法候选：没有过滤条件且内存倒排索引已就绪时用索引的 BM25（app/services/search_index.py），
+  否则用 articles.search_vector 全文检索（GIN索引，见 app/utils/fulltext.py），按 ts_rank_cd 取前N篇
+- 向量候选：查询文本的嵌入向量在 article_chunks 上做余弦距离检索（HNSW索引），按文章分组取最相近的分块
+- 融合：每篇文章得分 = Σ 1 / (k + 名次)，两路都靠前的文章排在最前；不需要对两种分数做归一化
+- 摘要片段：从命中的短文本中截取并高亮（全文命中的分块 > 向量最相近的分块 > 摘要），不扫描正文（app/utils/snippets.py）
+
+向量检索需要 EMBEDDING_ENABLED；嵌入接口超时或出错时只返回全文检索结果。
+查询向量按查询文本缓存在进程内（同一查询重复搜索不再调用嵌入接口）。
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select, func
+
+from app.config import settings
+from app.models import Article, ArticleChunk
+from app.services.search_index import search_index
+from app.utils.fulltext import build_tsquery
+from app.utils.snippets import build_snippets
+
+logger = logging.getLogger(__name__)
+
+# 支持的过滤条件
+FILTER_KEYS = {"category", "source_id", "content_source", "from_date", "to_date"}
+
+# 进程内缓存的查询向量数
+EMBEDDING_CACHE_SIZE = 1024
+
+
+@dataclass
+class SearchHit:
+    """融合后的一篇文章"""
+    article_id: int
+    title: str
+    published_at: datetime
+    snippet: str
+    score: float
+    chunk_id: Optional[int] = None  # 提供摘要片段的分块（片段取自摘要时为空）
+
+
+class QueryEmbedder:
+    """查询文本 -> 嵌入向量（LRU缓存）"""
+
+    def __init__(self, max_entries: int = EMBEDDING_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._client = None
+        self._cache: "OrderedDict[str, List[float]]" = OrderedDict()
+
+    @property
+    def client(self):
+        if self._client is None:
+            from openai import AsyncOpenAI
+
+            self._client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        return self._client
+
+    async def embed(self, text: str) -> List[float]:
+        cached = self._cache.get(text)
+        if cached is not None:
+            self._cache.move_to_end(text)
+            return cached
+
+        response = await self.client.embeddings.create(model=settings.SEARCH_EMBEDDING_MODEL, input=text)
+        embedding = response.data[0].embedding
+        self._cache[text] = embedding
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return embedding
+
+
+query_embedder = QueryEmbedder()
+
+
+def validate_filters(filters: Optional[dict]) -> dict:
+    """
+    校验过滤条件
+
+    Raises:
+        ValueError: 未知的过滤条件或日期格式错误
+    """
+    filters = {key: value for key, value in (filters or {}).items() if value not in (None, "")}
+    unknown = filters.keys() - FILTER_KEYS
+    if unknown:
+        raise ValueError(f"Unknown filters: {', '.join(sorted(unknown))}. Available: {', '.join(sorted(FILTER_KEYS))}")
+
+    for key in ("from_date", "to_date"):
+        if key in filters:
+            try:
+                filters[key] = datetime.strptime(str(filters[key]), "%Y-%m-%d")
+            except ValueError:
+                raise ValueError(f"Invalid {key}: {filters[key]}. Use YYYY-MM-DD")
+    if "to_date" in filters:
+        filters["to_date"] = filters["to_date"].replace(hour=23, minute=59, second=59)
+    if "source_id" in filters:
+        try:
+            filters["source_id"] = int(filters["source_id"])
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid source_id: {filters['source_id']}")
+    return filters
+
+
+def _apply_filters(query, filters: dict):
+    query = query.where(Article.is_deleted == False)
+    if "category" in filters:
+        query = query.where(Article.category == filters["category"])
+    if "source_id" in filters:
+        query = query.where(Article.source_id == filters["source_id"])
+    if "content_source" in filters:
+        query = query.where(Article.content_source == filters["content_source"])
+    if "from_date" in filters:
+        query = query.where(Article.published_at >= filters["from_date"])
+    if "to_date" in filters:
+        query = query.where(Article.published_at <= filters["to_date"])
+    return query
+
+
+async def _lexical_candidates(db, query: str, filters: dict, limit: int) -> Dict[int, Optional[int]]:
+    """全文检索：{文章ID: 命中的分块ID（标题/摘要命中或 Postgres 全文检索时为空）}，按相关度排列"""
+    if not filters and search_index.ready:
+        return {hit.article_id: hit.chunk_id for hit in search_index.search_articles(query, limit)}
+
+    try:
+        tsquery = build_tsquery(query)
+    except ValueError:
+        return {}
+    rank = func.ts_rank_cd(Article.search_vector, tsquery)
+    stmt = _apply_filters(
+        select(Article.id).where(Article.search_vector.op("@@")(tsquery)),
+        filters
+    )
+    result = await db.execute(stmt.order_by(rank.desc(), Article.id.desc()).limit(limit))
+    return dict.fromkeys(result.scalars().all())
+
+
+async def _vector_candidates(db, embedding: List[float], filters: dict, limit: int) -> dict:
+    """向量检索：{文章ID: 最相近的分块}，按距离从近到远排列"""
+    distance = ArticleChunk.embedding.cosine_distance(embedding)
+    stmt = _apply_filters(
+        select(ArticleChunk.id, ArticleChunk.article_id, ArticleChunk.chunk_text)
+        .join(Article, Article.id == ArticleChunk.article_id),
+        filters
+    )
+    # 一篇文章可能有多个分块命中，多取一些分块以便分组后仍有足够的文章
+    result = await db.execute(stmt.order_by(distance).limit(limit * 3))
+
+    best = {}
+    for row in result.all():
+        if row.article_id not in best:
+            best[row.article_id] = row
+        if len(best) >= limit:
+            break
+    return best
+
+
+async def _query_embedding(query: str) -> Optional[List[float]]:
+    try:
+        return await asyncio.wait_for(query_embedder.embed(query), timeout=settings.SEARCH_EMBEDDING_TIMEOUT)
+    except Exception as e:
+        logger.warning(f"[Search] 查询向量生成失败，只使用全文检索: {e!r}")
+        return None
+
+
+async def hybrid_search(db, query: str, filters: Optional[dict] = None, top_k: int = 10) -> Tuple[List[SearchHit], int]:
+    """
+    混合检索
+
+    Args:
+        db: 数据库会话
+        query: 检索文本
+        filters: 过滤条件（category / source_id / content_source / from_date / to_date）
+        top_k: 返回的文章数
+
+    Returns:
+        (按融合得分排序的前 top_k 篇文章（每篇一条）, 两路候选合并后的文章数)
+
+    Raises:
+        ValueError: 过滤条件无效
+    """
+    filters = validate_filters(filters)
+    limit = max(settings.SEARCH_CANDIDATES, top_k)
+
+    # 嵌入接口是网络请求，与全文检索并行
+    embedding_task = asyncio.create_task(_query_embedding(query)) if settings.EMBEDDING_ENABLED else None
+    try:
+        lexical_hits = await _lexical_candidates(db, query, filters, limit)
+    except BaseException:
+        if embedding_task:
+            embedding_task.cancel()
+        raise
+
+    vector_hits = {}
+    embedding = await embedding_task if embedding_task else None
+    if embedding is not None:
+        vector_hits = await _vector_candidates(db, embedding, filters, limit)
+
+    # 倒数排名融合
+    k = settings.SEARCH_RRF_K
+    scores: Dict[int, float] = {}
+    for ranking in (list(lexical_hits), list(vector_hits)):
+        for position, article_id in enumerate(ranking, start=1):
+            scores[article_id] = scores.get(article_id, 0.0) + 1.0 / (k + position)
+
+    top_ids = sorted(scores, key=lambda article_id: (-scores[article_id], -article_id))[:top_k]
+    if not top_ids:
+        return [], 0
+
+    result = await db.execute(
+        select(Article.id, Article.title, Article.summary, Article.published_at)
+        .where(Article.id.in_(top_ids), Article.is_deleted == False)
+    )
+    articles = {row.id: row for row in result.all()}
+    top_ids = [article_id for article_id in top_ids if article_id in articles]
+
+    # 全文命中的分块（向量命中的分块已随候选读出）
+    chunk_ids = [lexical_hits[a] for a in top_ids if lexical_hits.get(a) is not None]
+    chunk_texts = {}
+    if chunk_ids:
+        result = await db.execute(
+            select(ArticleChunk.id, ArticleChunk.chunk_text).where(ArticleChunk.id.in_(chunk_ids))
+        )
+        chunk_texts = {row.id: row.chunk_text for row in result.all()}
+
+    sources = []
+    for article_id in top_ids:
+        chunk_id = lexical_hits.get(article_id)
+        if chunk_id in chunk_texts:
+            sources.append((chunk_id, chunk_texts[chunk_id]))
+        elif article_id in vector_hits:
+            sources.append((vector_hits[article_id].id, vector_hits[article_id].chunk_text))
+        else:
+            article = articles[article_id]
+            sources.append((None, article.summary or article.title))
+    snippets = build_snippets([text for _, text in sources], query)
+
+    hits = []
+    for article_id, (chunk_id, _), snippet in zip(top_ids, sources, snippets):
+        article = articles[article_id]
+        hits.append(SearchHit(
+            article_id=article_id,
+            title=article.title,
+            published_at=article.published_at,
+            snippet=snippet,
+            score=round(scores[article_id], 6),
+            chunk_id=chunk_id,
+        ))
+    return hits, len(scores)
@@ -0,0 +1,75 @@
+"""数据源名称缓存 - sources 表只有几行且很少变化，整表缓存在进程内
+
+文章列表/详情不再每篇文章查询一次 sources 表（N+1），而是从缓存取名称：
+- 缓存过期（SOURCE_CACHE_SECONDS）或遇到未知的 source_id 时整表重新加载
+- 修改 sources 表后调用 invalidate()
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import select
+
+from app.config import settings
+from app.models import Source
+
+logger = logging.getLogger(__name__)
+
+UNKNOWN_SOURCE_NAME = "未知来源"
+
+# 遇到未知ID时至少间隔这么久才重新加载（避免引用了不存在数据源的文章每次都触发查询）
+MISS_RELOAD_SECONDS = 5
+
+
+class SourceNameCache:
+    """source_id -> 名称"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._names: Dict[int, str] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def invalidate(self):
+        self._loaded_at = None
+
+    def _needs_reload(self, wanted: set) -> bool:
+        if self._loaded_at is None:
+            return True
+        age = time.monotonic() - self._loaded_at
+        return age >= self.ttl or (age >= MISS_RELOAD_SECONDS and not wanted <= self._names.keys())
+
+    async def _reload(self, db):
+        result = await db.execute(select(Source.id, Source.name))
+        self._names = {row.id: row.name for row in result.all()}
+        self._loaded_at = time.monotonic()
+        logger.debug(f"[SourceCache] 已加载 {len(self._names)} 个数据源")
+
+    async def get_names(self, db, source_ids: Iterable[Optional[int]]) -> Dict[int, str]:
+        """
+        批量获取数据源名称（最多一次查询）
+
+        Args:
+            db: 数据库会话（仅在需要重新加载时使用）
+            source_ids: 文章的 source_id（可含None）
+
+        Returns:
+            {source_id: 名称}，未知的ID不在结果中
+        """
+        wanted = {source_id for source_id in source_ids if source_id is not None}
+        if self._needs_reload(wanted):
+            async with self._lock:
+                # 等锁期间其他请求可能已经重新加载
+                if self._needs_reload(wanted):
+                    await self._reload(db)
+        return {source_id: self._names[source_id] for source_id in wanted if source_id in self._names}
+
+    async def get_name(self, db, source_id: Optional[int]) -> str:
+        """单个数据源名称（未知时返回"未知来源"）"""
+        names = await self.get_names(db, [source_id])
+        return names.get(source_id, UNKNOWN_SOURCE_NAME)
+
+
+source_name_cache = SourceNameCache(ttl=settings.SOURCE_CACHE_SECONDS)
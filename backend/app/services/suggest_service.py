@@ -0,0 +1,284 @@
+"""搜索框联想 - 标题、标签和AI实体（药物/疾病/公司）的内存前缀索引
+
+/v1/search/suggest 每次按键都会请求，查询只读内存，不访问数据库：
+
+- 联想词：标签和实体名称（权重 = 提到它的文章数），文章标题（权重 = 时效，新文章靠前，不超过1，排在常见的标签和实体之后）；
+  标题按分隔符（｜：，空格等）切开的片段也能匹配，输入标题中间的关键短语同样有联想
+- 结构：规范化（NFKC + 小写 + 合并空白）后的键排成有序数组，前缀对应一个连续区间（bisect），
+  区间内按权重取前N个（numpy argpartition）
+- 更新：启动时在后台全量加载；定时任务按 articles.updated_at 水位只重新读取变更的文章
+  （AI分析写入时也会更新 updated_at），增量调整计数后在线程中重新生成有序数组并整体替换
+
+索引就绪前返回空列表。
+"""
+
+import asyncio
+import bisect
+import logging
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+
+from app.models import Article, ArticleAIOutput
+from app.utils import timezone as tz
+
+logger = logging.getLogger(__name__)
+
+# 实体类型（ArticleAIOutput.entities 的键）-> 联想类型
+ENTITY_TYPES = {"drugs": "drug", "diseases": "disease", "companies": "company"}
+
+# 标题片段的分隔符
+TITLE_SEPARATORS = re.compile(r"[\s|｜:：,，、;；!！?？()（）\[\]【】《》“”\"]+")
+
+MIN_KEY_CHARS = 2
+MAX_PHRASE_CHARS = 50
+
+# 标题时效权重的半衰期（天）
+TITLE_HALF_LIFE_DAYS = 30
+
+BATCH_SIZE = 1000
+
+# 变更水位的回看窗口（同 search_index.REFRESH_OVERLAP）
+REFRESH_OVERLAP = timedelta(minutes=5)
+
+
+@dataclass
+class Suggestion:
+    """一条联想"""
+    text: str
+    type: str  # title / tag / drug / disease / company
+    weight: float
+    article_id: Optional[int] = None  # 仅标题
+
+
+def normalize(text: str) -> str:
+    """联想键：NFKC（全角转半角）+ 小写 + 合并空白"""
+    return " ".join(unicodedata.normalize("NFKC", text).lower().split())
+
+
+def _title_keys(title: str) -> List[str]:
+    """标题本身和按分隔符切开的片段"""
+    keys = [normalize(title)]
+    for part in TITLE_SEPARATORS.split(title):
+        key = normalize(part)
+        if len(key) >= MIN_KEY_CHARS and key not in keys:
+            keys.append(key)
+    return keys
+
+
+def _article_phrases(tags, entities) -> set:
+    """文章的 {(类型, 名称)}"""
+    phrases = set()
+    for tag in tags or []:
+        if isinstance(tag, str):
+            phrases.add(("tag", tag.strip()))
+    if isinstance(entities, dict):
+        for key, kind in ENTITY_TYPES.items():
+            for name in entities.get(key) or []:
+                if isinstance(name, str):
+                    phrases.add((kind, name.strip()))
+    return {(kind, name) for kind, name in phrases if MIN_KEY_CHARS <= len(name) <= MAX_PHRASE_CHARS}
+
+
+class _PrefixArray:
+    """有序键数组：keys[i] 对应 entries[entry_ids[i]]，weights[i] 为该条目的权重"""
+
+    def __init__(self, items: List[Tuple[List[str], Suggestion]]):
+        rows = []
+        self.entries = []
+        for keys, suggestion in items:
+            entry_id = len(self.entries)
+            self.entries.append(suggestion)
+            rows.extend((key, entry_id) for key in keys)
+        rows.sort()
+        self.keys = [key for key, _ in rows]
+        self.entry_ids = np.fromiter((entry_id for _, entry_id in rows), dtype=np.int32, count=len(rows))
+        self.weights = np.array([self.entries[entry_id].weight for entry_id in self.entry_ids], dtype=np.float32)
+
+    def lookup(self, prefix: str, limit: int) -> List[Suggestion]:
+        lo = bisect.bisect_left(self.keys, prefix)
+        hi = bisect.bisect_left(self.keys, prefix + "\U0010ffff")
+        if lo == hi:
+            return []
+
+        # 一个标题有多个键（片段），多取一些再去重
+        want = limit * 4
+        candidates = np.arange(lo, hi)
+        if hi - lo > want:
+            candidates = lo + np.argpartition(-self.weights[lo:hi], want - 1)[:want]
+        candidates = sorted(candidates.tolist(), key=lambda i: (-self.weights[i], self.keys[i]))
+
+        results, seen = [], set()
+        for i in candidates:
+            entry_id = int(self.entry_ids[i])
+            if entry_id not in seen:
+                seen.add(entry_id)
+                results.append(self.entries[entry_id])
+                if len(results) >= limit:
+                    break
+        return results
+
+
+class SuggestIndex:
+    """联想索引：按文章维护标题和短语计数，变更后重新生成有序数组"""
+
+    def __init__(self):
+        self.ready = False
+        self._titles: Dict[int, Tuple[str, datetime, List[str]]] = {}  # 文章ID -> (标题, 发布时间, 键)
+        self._phrases: Dict[int, set] = {}
+        self._phrase_counts: Counter = Counter()
+        self._array: Optional[_PrefixArray] = None
+        self._mark: Optional[datetime] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """后台全量加载"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._initialize())
+
+    async def _initialize(self):
+        from app.database import get_db_context
+
+        try:
+            async with get_db_context() as db:
+                await self.refresh(db)
+        except Exception as e:
+            logger.error(f"[Suggest] 联想索引加载失败: {e!r}")
+
+    async def close(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Suggestion]:
+        """按前缀联想（按权重从高到低）；索引未就绪时为空列表"""
+        key = normalize(prefix)
+        if not key or self._array is None:
+            return []
+        return self._array.lookup(key, limit)
+
+    def _update_article(self, article_id: int, row: Optional[tuple]) -> bool:
+        """替换一篇文章的标题和短语（row 为空表示文章已删除），返回是否有变化"""
+        old_title = self._titles.get(article_id)
+        if row is None and old_title is None:
+            return False
+        if row is not None and old_title is not None:
+            title, published_at, phrases = row
+            if old_title[:2] == (title, published_at) and self._phrases.get(article_id, set()) == phrases:
+                return False
+
+        self._titles.pop(article_id, None)
+        for phrase in self._phrases.pop(article_id, ()):
+            self._phrase_counts[phrase] -= 1
+            if self._phrase_counts[phrase] <= 0:
+                del self._phrase_counts[phrase]
+        if row is None:
+            return True
+
+        title, published_at, phrases = row
+        self._titles[article_id] = (title, published_at, _title_keys(title))
+        if phrases:
+            self._phrases[article_id] = phrases
+            self._phrase_counts.update(phrases)
+        return True
+
+    async def refresh(self, db) -> int:
+        """
+        重新读取水位之后变更的文章（首次调用读取全部文章）并重新生成有序数组
+
+        Returns:
+            有变化的文章数
+        """
+        async with self._lock:
+            query = select(Article.id, Article.updated_at)
+            if self._mark is not None:
+                query = query.where(Article.updated_at > self._mark - REFRESH_OVERLAP)
+            changed = (await db.execute(query)).all()
+            if not changed and self.ready:
+                return 0
+
+            mark = self._mark
+            for row in changed:
+                if row.updated_at and (mark is None or row.updated_at > mark):
+                    mark = row.updated_at
+
+            ids = sorted(row.id for row in changed)
+            updated = 0
+            for start in range(0, len(ids), BATCH_SIZE):
+                batch = ids[start:start + BATCH_SIZE]
+                rows = await self._load(db, batch)
+                for article_id in batch:
+                    updated += self._update_article(article_id, rows.get(article_id))
+
+            # 回看窗口内重复读取的文章没有变化时不重新生成
+            if updated or not self.ready:
+                # 刷新期间持有锁，线程中读取的计数不会被修改
+                self._array = await asyncio.to_thread(self._build)
+            self._mark = mark
+            if not self.ready:
+                self.ready = True
+                logger.info(f"[Suggest] 联想索引已加载: {len(self._titles)} 个标题, {len(self._phrase_counts)} 个标签/实体")
+            return updated
+
+    @staticmethod
+    async def _load(db, article_ids: List[int]) -> Dict[int, tuple]:
+        """{文章ID: (标题, 发布时间, 短语)}，已删除的文章不返回"""
+        result = await db.execute(
+            select(Article.id, Article.title, Article.published_at, Article.tags)
+            .where(Article.id.in_(article_ids), Article.is_deleted == False)
+        )
+        articles = result.all()
+        if not articles:
+            return {}
+
+        ai_result = await db.execute(
+            select(ArticleAIOutput.article_id, ArticleAIOutput.entities)
+            .where(ArticleAIOutput.article_id.in_([a.id for a in articles]))
+            .order_by(ArticleAIOutput.article_id, ArticleAIOutput.is_stale, ArticleAIOutput.created_at.desc())
+            .distinct(ArticleAIOutput.article_id)
+        )
+        entities = {row.article_id: row.entities for row in ai_result.all()}
+        return {
+            a.id: (a.title, a.published_at, _article_phrases(a.tags, entities.get(a.id)))
+            for a in articles
+        }
+
+    def _build(self) -> _PrefixArray:
+        return _PrefixArray(self._items())
+
+    def _items(self) -> List[Tuple[List[str], Suggestion]]:
+        """当前的全部联想条目（同名短语的展示文本取第一次出现的写法）"""
+        items = []
+        displays = {}
+        for (kind, name), count in self._phrase_counts.items():
+            key = normalize(name)
+            if (kind, key) in displays:
+                displays[(kind, key)].weight += count
+                continue
+            suggestion = Suggestion(text=name, type=kind, weight=float(count))
+            displays[(kind, key)] = suggestion
+            items.append(([key], suggestion))
+
+        now = tz.now()
+        for article_id, (title, published_at, keys) in self._titles.items():
+            age_days = max((now - published_at).total_seconds() / 86400, 0) if published_at else 365
+            weight = 0.5 ** (age_days / TITLE_HALF_LIFE_DAYS)  # (0, 1]，低于任何标签/实体
+            items.append((keys, Suggestion(text=title, type="title", weight=weight, article_id=article_id)))
+        return items
+
+    def report(self) -> dict:
+        return {
+            "ready": self.ready,
+            "titles": len(self._titles),
+            "phrases": len(self._phrase_counts),
+            "keys": len(self._array.keys) if self._array else 0,
+        }
+
+
+suggest_index = SuggestIndex()
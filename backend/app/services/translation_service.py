@@ -9,6 +9,10 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# 内容不是正文的元素（如 sanitize_html 生成的 <style> 样式块），检测和翻译时跳过
+NON_TEXT_TAGS = ("style", "script")
+_NON_TEXT_BLOCK_RE = re.compile(r'<(style|script)\b[^>]*>.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+
 # 初始化DeepSeek客户端（使用OpenAI兼容API）
 client = AsyncOpenAI(
     api_key=settings.AI_API_KEY,
@@ -24,8 +28,8 @@ def detect_chinese_content(text: str) -> bool:
     if not text or not text.strip():
         return True  # 空文本默认不需要翻译
 
-    # 移除HTML标签进行检测
-    clean_text = re.sub(r'<[^>]+>', '', text)
+    # 移除样式/脚本块和HTML标签进行检测
+    clean_text = re.sub(r'<[^>]+>', '', _NON_TEXT_BLOCK_RE.sub('', text))
     clean_text = clean_text.strip()
 
     if not clean_text:
@@ -84,7 +88,7 @@ async def translate_text_to_chinese(text: str) -> str:
 async def translate_html_content(html_content: str) -> str:
     """
     翻译HTML内容，保留HTML结构和格式
-    只翻译文本节点，保留所有HTML标签和属性
+    只翻译文本节点，保留所有HTML标签和属性（<style>/<script> 内的文本不翻译）
     """
     if not html_content or not html_content.strip():
         return html_content
@@ -103,7 +107,7 @@ async def translate_html_content(html_content: str) -> str:
         # 收集所有需要翻译的文本节点
         text_nodes = []
         for element in soup.find_all(text=True):
-            if isinstance(element, NavigableString):
+            if isinstance(element, NavigableString) and element.parent.name not in NON_TEXT_TAGS:
                 text = element.strip()
                 if text and not re.match(r'^[\s\n\r\t]*$', str(element)):
                     text_nodes.append(element)
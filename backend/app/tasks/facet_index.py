@@ -0,0 +1,47 @@
+"""文章分面索引增量更新 - 重新读取变更的文章（分类/数据源/作者/标签/AI实体）"""
+import logging
+from app.config import settings
+from app.database import get_db_context
+
+logger = logging.getLogger(__name__)
+
+
+async def refresh_facet_job():
+    """读取水位之后变更的文章并更新分面索引"""
+    from app.services.facet_service import facet_index
+
+    if not facet_index.ready:
+        return  # 启动时的全量加载还没完成
+
+    try:
+        async with get_db_context() as db:
+            count = await facet_index.refresh(db)
+        if count:
+            logger.info(f"✅ 分面索引增量更新：{count} 篇文章")
+    except Exception as e:
+        logger.error(f"❌ 分面索引增量更新出错: {e}")
+
+
+def schedule_facet_task(scheduler):
+    """
+    配置分面索引增量更新任务到调度器
+
+    Args:
+        scheduler: APScheduler调度器实例
+    """
+    if not settings.FACETS_ENABLED:
+        logger.info("⏸️  文章分面计数未启用（FACETS_ENABLED=false）")
+        return
+
+    scheduler.add_job(
+        refresh_facet_job,
+        trigger='interval',
+        seconds=settings.FACETS_REFRESH_SECONDS,
+        id='refresh_facet_index',
+        name='分面索引增量更新',
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True
+    )
+
+    logger.info(f"✅ 已配置分面索引增量更新：每 {settings.FACETS_REFRESH_SECONDS} 秒")
@@ -0,0 +1,38 @@
+"""定时重试任务 - 按指数退避重新入库失败的文章"""
+import logging
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+async def retry_failed_ingests_job():
+    """重试到期的入库失败记录（爬虫任务运行中时跳过本轮）"""
+    from app.services.crawler_service import crawler_service
+
+    if crawler_service.is_running():
+        logger.info("⏭️  爬虫任务运行中，跳过本轮入库重试")
+        return
+
+    stats = await crawler_service.run_retry()
+    if stats and stats["retried"]:
+        logger.info(f"🔁 入库重试: {stats}")
+
+
+def schedule_retry_task(scheduler):
+    """
+    配置入库重试任务到调度器
+
+    Args:
+        scheduler: APScheduler调度器实例
+    """
+    scheduler.add_job(
+        retry_failed_ingests_job,
+        trigger='interval',
+        minutes=settings.INGEST_RETRY_INTERVAL_MINUTES,
+        id='retry_failed_ingests',
+        name='重试失败的文章入库',
+        replace_existing=True,
+        max_instances=1
+    )
+
+    logger.info(f"✅ 已配置入库重试任务：每 {settings.INGEST_RETRY_INTERVAL_MINUTES} 分钟执行")
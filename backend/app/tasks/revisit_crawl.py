@@ -0,0 +1,41 @@
+"""定时增量爬取 - 按数据源发布频率自适应调整重访间隔"""
+import logging
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+async def revisit_crawl_job():
+    """检查并执行到期的数据源增量爬取"""
+    from app.services.revisit_service import revisit_scheduler
+
+    try:
+        await revisit_scheduler.tick()
+    except Exception as e:
+        logger.error(f"❌ 增量爬取调度出错: {e}")
+
+
+def schedule_revisit_task(scheduler):
+    """
+    配置增量爬取任务到调度器
+
+    Args:
+        scheduler: APScheduler调度器实例
+    """
+    if not settings.REVISIT_ENABLED:
+        logger.info("⏸️  增量爬取未启用（REVISIT_ENABLED=false）")
+        return
+
+    # 只负责定期检查到期的数据源，实际间隔由 crawl_schedules 表决定
+    scheduler.add_job(
+        revisit_crawl_job,
+        trigger='interval',
+        minutes=settings.REVISIT_TICK_MINUTES,
+        id='revisit_crawl',
+        name='自适应增量爬取',
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True
+    )
+
+    logger.info(f"✅ 已配置增量爬取任务：每 {settings.REVISIT_TICK_MINUTES} 分钟检查到期数据源")
@@ -0,0 +1,48 @@
+"""内存倒排索引增量更新 - 索引新增/变更/删除的文章，发现新快照时重新加载"""
+import logging
+from app.config import settings
+from app.database import get_db_context
+
+logger = logging.getLogger(__name__)
+
+
+async def refresh_search_index_job():
+    """重新加载更新的快照，索引水位之后变更的文章，标记删除的文档过多时重建"""
+    from app.services.search_index import search_index
+
+    try:
+        if await search_index.reload_if_changed():
+            logger.info(f"🔄 已重新加载检索索引快照（{search_index.snapshot_built_at}）")
+        async with get_db_context() as db:
+            count = await search_index.refresh(db)
+            if count:
+                logger.info(f"✅ 检索索引增量更新：{count} 篇文章")
+            if search_index.needs_compaction():
+                await search_index.compact(db)
+    except Exception as e:
+        logger.error(f"❌ 检索索引增量更新出错: {e}")
+
+
+def schedule_search_index_task(scheduler):
+    """
+    配置检索索引增量更新任务到调度器
+
+    Args:
+        scheduler: APScheduler调度器实例
+    """
+    if not settings.SEARCH_INDEX_ENABLED:
+        logger.info("⏸️  内存检索索引未启用（SEARCH_INDEX_ENABLED=false）")
+        return
+
+    scheduler.add_job(
+        refresh_search_index_job,
+        trigger='interval',
+        seconds=settings.SEARCH_INDEX_REFRESH_SECONDS,
+        id='refresh_search_index',
+        name='检索索引增量更新',
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True
+    )
+
+    logger.info(f"✅ 已配置检索索引增量更新：每 {settings.SEARCH_INDEX_REFRESH_SECONDS} 秒")
@@ -0,0 +1,47 @@
+"""搜索框联想索引增量更新 - 重新读取变更的文章（标题/标签/AI实体）"""
+import logging
+from app.config import settings
+from app.database import get_db_context
+
+logger = logging.getLogger(__name__)
+
+
+async def refresh_suggest_job():
+    """读取水位之后变更的文章并更新联想索引"""
+    from app.services.suggest_service import suggest_index
+
+    if not suggest_index.ready:
+        return  # 启动时的全量加载还没完成
+
+    try:
+        async with get_db_context() as db:
+            count = await suggest_index.refresh(db)
+        if count:
+            logger.info(f"✅ 联想索引增量更新：{count} 篇文章")
+    except Exception as e:
+        logger.error(f"❌ 联想索引增量更新出错: {e}")
+
+
+def schedule_suggest_task(scheduler):
+    """
+    配置联想索引增量更新任务到调度器
+
+    Args:
+        scheduler: APScheduler调度器实例
+    """
+    if not settings.SUGGEST_ENABLED:
+        logger.info("⏸️  搜索框联想未启用（SUGGEST_ENABLED=false）")
+        return
+
+    scheduler.add_job(
+        refresh_suggest_job,
+        trigger='interval',
+        seconds=settings.SUGGEST_REFRESH_SECONDS,
+        id='refresh_suggest_index',
+        name='联想索引增量更新',
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True
+    )
+
+    logger.info(f"✅ 已配置联想索引增量更新：每 {settings.SUGGEST_REFRESH_SECONDS} 秒")
@@ -0,0 +1,31 @@
+"""Helpers for batch endpoints that take a comma-separated id list"""
+
+from typing import List
+
+# Upper bound on ids per batch request (one IN query, bounded response size)
+BATCH_MAX_IDS = 100
+
+
+def parse_id_list(value: str, max_ids: int = BATCH_MAX_IDS) -> List[int]:
+    """
+    Parse "3,1,2" into [3, 1, 2], dropping duplicates but keeping request order
+
+    Raises:
+        ValueError: Non-integer id, empty list or more than max_ids ids
+    """
+    ids = []
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            ids.append(int(part))
+        except ValueError:
+            raise ValueError(f"Invalid article id: {part}") from None
+
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        raise ValueError("ids must contain at least one article id")
+    if len(ids) > max_ids:
+        raise ValueError(f"At most {max_ids} ids per request (got {len(ids)})")
+    return ids
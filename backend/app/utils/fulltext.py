@@ -0,0 +1,200 @@
+"""PostgreSQL full-text search over articles (Chinese via character bigrams)
+
+The default text search parser does not segment Chinese: a run of CJK
+characters becomes one token, so "临床试验" would only match itself. The
+cjk_bigrams() SQL function rewrites every CJK run into overlapping
+bigrams ("临床 床试 试验") and leaves other text alone; the result is fed
+to the `simple` configuration, which needs no extension. A query term is
+rewritten the same way and matched as a phrase, so the bigrams must be
+adjacent in the document.
+
+A single-character query is a prefix query over the bigrams, which misses
+a character that only ends CJK runs (the 验 of "临床试验"). Documents are
+therefore indexed with cjk_index_terms(): the bigrams followed by the last
+character of every run. The unigrams go after all other tokens of the
+field so they do not break the adjacency that phrase queries rely on.
+
+articles.search_vector is a stored generated column (title A, summary B,
+author C, body D) with a GIN index, see scripts/migrate_add_article_search.py.
+A segmenting parser extension (zhparser, pg_jieba) could replace the
+bigram functions by changing SEARCH_VECTOR_SQL and build_tsquery together.
+
+tokenize() and index_terms() are the Python counterparts of cjk_bigrams()
+and cjk_index_terms(), used for queries and documents of the in-memory
+index (app/services/search_index.py); match_spans() locates query terms
+in a text for snippet highlighting.
+"""
+
+import re
+from typing import List, Set, Tuple
+
+from sqlalchemy import func, literal_column
+
+FTS_CONFIG = "simple"
+
+# Body characters that are indexed. tsvector values are limited to 1MB and
+# positions stop at 16383, so very long bodies are cut rather than failing the insert
+FTS_BODY_CHARS = 50000
+
+# Terms per query (each becomes a phrase query)
+MAX_QUERY_TERMS = 10
+
+CJK_RANGE = "\\u3400-\\u9fff"
+
+CJK_BIGRAMS_FUNCTION_SQL = f"""
+CREATE OR REPLACE FUNCTION cjk_bigrams(input text) RETURNS text
+LANGUAGE plpgsql IMMUTABLE STRICT PARALLEL SAFE AS $$
+DECLARE
+    run text;
+    chars text[];
+    tokens text[] := '{{}}';
+BEGIN
+    FOR run IN SELECT (regexp_matches(input, '([{CJK_RANGE}]+|[^{CJK_RANGE}]+)', 'g'))[1] LOOP
+        IF run ~ '^[{CJK_RANGE}]' AND length(run) > 1 THEN
+            chars := regexp_split_to_array(run, '');
+            FOR i IN 1 .. array_length(chars, 1) - 1 LOOP
+                tokens := tokens || (chars[i] || chars[i + 1]);
+            END LOOP;
+        ELSE
+            tokens := tokens || run;
+        END IF;
+    END LOOP;
+    RETURN array_to_string(tokens, ' ');
+END
+$$
+"""
+
+# Document side: the bigrams, then the last character of every CJK run
+CJK_INDEX_TERMS_FUNCTION_SQL = f"""
+CREATE OR REPLACE FUNCTION cjk_index_terms(input text) RETURNS text
+LANGUAGE plpgsql IMMUTABLE STRICT PARALLEL SAFE AS $$
+DECLARE
+    run text;
+    tails text[] := '{{}}';
+BEGIN
+    FOR run IN SELECT (regexp_matches(input, '[{CJK_RANGE}]+', 'g'))[1] LOOP
+        IF length(run) > 1 THEN
+            tails := tails || right(run, 1);
+        END IF;
+    END LOOP;
+    RETURN cjk_bigrams(input) || ' ' || array_to_string(tails, ' ');
+END
+$$
+"""
+
+# In creation order (cjk_index_terms calls cjk_bigrams)
+CJK_FUNCTIONS_SQL = (CJK_BIGRAMS_FUNCTION_SQL, CJK_INDEX_TERMS_FUNCTION_SQL)
+
+DROP_CJK_FUNCTIONS_SQL = (
+    "DROP FUNCTION IF EXISTS cjk_index_terms(text)",
+    "DROP FUNCTION IF EXISTS cjk_bigrams(text)",
+)
+
+
+def _weighted(column_sql: str, weight: str) -> str:
+    return f"setweight(to_tsvector('{FTS_CONFIG}'::regconfig, cjk_index_terms({column_sql})), '{weight}')"
+
+
+# Expression of the generated column articles.search_vector
+SEARCH_VECTOR_SQL = " || ".join([
+    _weighted("coalesce(title, '')", "A"),
+    _weighted("coalesce(summary, '')", "B"),
+    _weighted("coalesce(author, '')", "C"),
+    _weighted(f"left(coalesce(content_text, ''), {FTS_BODY_CHARS})", "D"),
+])
+
+_SINGLE_CJK = re.compile(f"[{CJK_RANGE}]")
+
+_CJK_RUN = re.compile(f"[{CJK_RANGE}]+")
+
+# CJK runs, or runs of letters/digits (what the `simple` parser keeps as words)
+_TOKEN_RUN = re.compile(f"([{CJK_RANGE}]+)|([^\\W{CJK_RANGE}_]+)")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Terms of a text as indexed by search_vector, in order and with repeats
+
+    CJK runs become overlapping bigrams (a lone CJK character stays a
+    unigram), other words are lowercased.
+    """
+    terms = []
+    for cjk, word in _TOKEN_RUN.findall(text):
+        if word:
+            terms.append(word.lower())
+        elif len(cjk) == 1:
+            terms.append(cjk)
+        else:
+            terms.extend(cjk[i:i + 2] for i in range(len(cjk) - 1))
+    return terms
+
+
+def index_terms(text: str) -> List[str]:
+    """
+    Terms of a document as indexed by search_vector: tokenize() followed by
+    the last character of every CJK run longer than one character
+    """
+    tails = [run[-1] for run in _CJK_RUN.findall(text) if len(run) > 1]
+    return tokenize(text) + tails
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() and not _SINGLE_CJK.match(char)
+
+
+def match_spans(text: str, terms: Set[str]) -> List[Tuple[int, int]]:
+    """
+    Sorted (start, end) offsets in text of the tokens that are in terms
+
+    Each query term is located with str.find, so a text costs a few C-level
+    scans rather than a Python loop over its characters. CJK terms match
+    anywhere (a bigram of two CJK characters is always a token); other
+    terms must sit on word boundaries, as tokenize() would split them.
+    A single CJK character (which the index expands to bigrams starting
+    with it) matches that character. Overlapping bigrams are returned
+    separately; see app/utils/snippets.py.
+    """
+    lowered = text.lower()
+    if len(lowered) != len(text):  # lowercasing changed offsets (rare non-ASCII letters)
+        lowered = text
+
+    spans = []
+    for term in terms:
+        is_cjk = _SINGLE_CJK.match(term) is not None
+        start = lowered.find(term)
+        while start != -1:
+            end = start + len(term)
+            if is_cjk or (
+                (start == 0 or not _is_word_char(lowered[start - 1]))
+                and (end == len(lowered) or not _is_word_char(lowered[end]))
+            ):
+                spans.append((start, end))
+            start = lowered.find(term, start + 1)
+    spans.sort()
+    return spans
+
+
+def build_tsquery(query: str):
+    """
+    tsquery matching documents that contain every whitespace-separated term
+
+    Multi-character terms are phrase queries over their bigrams; a single CJK
+    character matches bigrams starting with it, or the unigram that
+    cjk_index_terms() adds for the last character of a run.
+
+    Raises:
+        ValueError: The query has no terms
+    """
+    terms = query.split()[:MAX_QUERY_TERMS]
+    if not terms:
+        raise ValueError("Empty search query")
+
+    config = literal_column(f"'{FTS_CONFIG}'::regconfig")
+    tsquery = None
+    for term in terms:
+        if _SINGLE_CJK.fullmatch(term):
+            part = func.to_tsquery(config, f"{term}:*")
+        else:
+            part = func.phraseto_tsquery(config, func.cjk_bigrams(term))
+        tsquery = part if tsquery is None else tsquery.op("&&")(part)
+    return tsquery
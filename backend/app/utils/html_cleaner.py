@@ -1,13 +1,121 @@
 """HTML cleaning utilities to extract clean text from HTML content"""
 
 from bs4 import BeautifulSoup
+from lxml import etree
+from typing import Optional
 import re
 
+# Elements whose whole subtree is dropped before extracting text
+REMOVED_TAGS = frozenset(["script", "style", "nav", "footer", "header"])
+
+# BeautifulSoup keeps text inside these tags as special string types
+# (RubyTextString, TemplateString, ...) that get_text() skips
+_STRING_CONTAINER_TAGS = frozenset(["rt", "rp", "template"])
+
+_SKIPPED_TAGS = REMOVED_TAGS | _STRING_CONTAINER_TAGS
+
+# Simple selectors that can be evaluated without soupsieve: tag, #id, .class
+# and compounds of them (e.g. "div.article-content")
+_SIMPLE_SELECTOR_RE = re.compile(r'^([a-zA-Z][\w-]*)?((?:[.#][\w-]+)*)$')
+_SELECTOR_PART_RE = re.compile(r'([.#])([\w-]+)')
+
+
+def _parse_tree(html_content: str) -> Optional[etree._Element]:
+    """
+    Parse HTML with the same lxml configuration BeautifulSoup uses
+
+    Returns:
+        Root element, or None if the document is empty
+    """
+    # BeautifulSoup drops a leading BOM before handing markup to lxml
+    if html_content[0] == "\ufeff":
+        html_content = html_content[1:]
+
+    parser = etree.HTMLParser(recover=True, strip_cdata=False)
+    try:
+        parser.feed(html_content)
+        return parser.close()
+    except etree.XMLSyntaxError:
+        return None
+
+
+def _collect_strings(element: etree._Element, strings: list):
+    """Append the text nodes of element's subtree in document order"""
+    if element.text:
+        strings.append(element.text)
+
+    for child in element:
+        tag = child.tag
+        # Comments and processing instructions have a callable tag
+        if isinstance(tag, str) and tag not in _SKIPPED_TAGS:
+            _collect_strings(child, strings)
+        if child.tail:
+            strings.append(child.tail)
+
+
+def _join_strings(strings: list) -> str:
+    """Normalize whitespace the same way as the original get_text() pipeline"""
+    text = "\n".join(strings)
+
+    chunks = []
+    for line in text.splitlines():
+        for phrase in line.strip().split("  "):
+            phrase = phrase.strip()
+            if phrase:
+                chunks.append(phrase)
+
+    # Chunks are stripped, non-empty and newline-free, so the result never
+    # contains runs of blank lines or surrounding whitespace
+    return "\n".join(chunks)
+
+
+def _element_text(element: etree._Element) -> str:
+    """Extract clean text from a parsed element subtree"""
+    strings = []
+    _collect_strings(element, strings)
+    return _join_strings(strings)
+
 
 def clean_html(html_content: str) -> str:
     """
     Clean HTML content and extract plain text
 
+    Walks lxml's C tree directly instead of building a BeautifulSoup tree.
+    Output is identical to clean_html_bs4().
+
+    Args:
+        html_content: Raw HTML string
+
+    Returns:
+        Cleaned plain text string
+    """
+    if not html_content:
+        return ""
+
+    root = _parse_tree(html_content)
+    if root is None:
+        return ""
+
+    strings = []
+    # Top-level comments/PIs may sit next to <html>; they carry no text
+    for sibling in reversed(list(root.itersiblings(preceding=True))):
+        if isinstance(sibling.tag, str) and sibling.tag not in _SKIPPED_TAGS:
+            _collect_strings(sibling, strings)
+    if root.tag not in _SKIPPED_TAGS:
+        _collect_strings(root, strings)
+    for sibling in root.itersiblings():
+        if isinstance(sibling.tag, str) and sibling.tag not in _SKIPPED_TAGS:
+            _collect_strings(sibling, strings)
+
+    return _join_strings(strings)
+
+
+def clean_html_bs4(html_content: str) -> str:
+    """
+    Reference BeautifulSoup implementation of clean_html()
+
+    Kept for equivalence checks and benchmarks (scripts/benchmark_html_cleaner.py).
+
     Args:
         html_content: Raw HTML string
 
@@ -38,6 +146,34 @@ def clean_html(html_content: str) -> str:
     return text.strip()
 
 
+def _selector_to_xpath(selector: str) -> Optional[str]:
+    """
+    Translate a simple CSS selector into XPath
+
+    Returns:
+        XPath expression, or None if the selector is not a simple one
+    """
+    selector = selector.strip()
+    match = _SIMPLE_SELECTOR_RE.match(selector)
+    if not match or not selector:
+        return None
+
+    tag, parts = match.groups()
+    conditions = []
+    for kind, value in _SELECTOR_PART_RE.findall(parts):
+        if kind == "#":
+            conditions.append(f"@id='{value}'")
+        else:
+            conditions.append(
+                f"contains(concat(' ', normalize-space(@class), ' '), ' {value} ')"
+            )
+
+    xpath = f"descendant-or-self::{tag.lower() if tag else '*'}"
+    for condition in conditions:
+        xpath += f"[{condition}]"
+    return xpath + "[1]"
+
+
 def extract_main_content(html_content: str, selectors: list[str] = None) -> str:
     """
     Extract main content from HTML using CSS selectors
@@ -62,13 +198,29 @@ def extract_main_content(html_content: str, selectors: list[str] = None) -> str:
     ]
 
     selectors = selectors or default_selectors
-    soup = BeautifulSoup(html_content, 'lxml')
+    xpaths = [_selector_to_xpath(selector) for selector in selectors]
+
+    # Complex selectors need soupsieve
+    if None in xpaths:
+        soup = BeautifulSoup(html_content, 'lxml')
+        for selector in selectors:
+            element = soup.select_one(selector)
+            if element:
+                return clean_html(str(element))
+        return clean_html(html_content)
+
+    root = _parse_tree(html_content)
+    if root is None:
+        return ""
 
     # Try each selector
-    for selector in selectors:
-        element = soup.select_one(selector)
-        if element:
-            return clean_html(str(element))
+    for xpath in xpaths:
+        found = root.xpath(xpath)
+        if found:
+            element = found[0]
+            if element.tag in _SKIPPED_TAGS:
+                return ""
+            return _element_text(element)
 
     # Fallback to full clean
     return clean_html(html_content)
@@ -0,0 +1,256 @@
+"""HTML sanitizing and minification for stored article content
+
+WeChat `#js_content` HTML repeats long inline `style` attributes on almost
+every element and carries tracking/editor attributes (data-*, mp-*, leaf,
+powered-by ...). sanitize_html() keeps only whitelisted attributes, keeps a
+whitelisted subset of style properties and moves each distinct style into a
+shared class, so the stored HTML renders the same but is much smaller.
+
+Class names are derived from the style itself (style_class_name()), so the
+same class means the same declarations in every document: fragments rendered
+on one page (content_html, translated_content_html, list items) can share the
+page without their <style> rules overriding each other.
+"""
+
+import hashlib
+import re
+from typing import Dict, Tuple
+
+from lxml import etree, html as lxml_html
+
+# Elements removed together with their content
+DROP_TAGS = frozenset(["script", "noscript", "style", "link", "meta"])
+
+# Elements unwrapped (children kept) once they have no attributes left
+UNWRAP_TAGS = frozenset(["span", "font"])
+
+# Per-tag attribute whitelist; any other attribute is dropped
+ALLOWED_ATTRIBUTES: Dict[str, frozenset] = {
+    "a": frozenset(["href", "title"]),
+    "img": frozenset(["src", "srcset", "alt", "width", "height"]),
+    "td": frozenset(["colspan", "rowspan"]),
+    "th": frozenset(["colspan", "rowspan"]),
+    "ol": frozenset(["start"]),
+    "iframe": frozenset(["src"]),
+}
+
+# Style properties that affect how an article reads; layout noise
+# (margins, box-sizing, max-width, visibility ...) is dropped
+ALLOWED_STYLE_PROPERTIES = frozenset([
+    "color",
+    "background-color",
+    "font-size",
+    "font-weight",
+    "font-style",
+    "text-align",
+    "text-decoration",
+    "text-indent",
+])
+
+# URL schemes kept in href/src (relative and protocol-relative URLs are always kept)
+SAFE_URL_SCHEMES = frozenset(["http", "https"])
+
+STYLE_CLASS_PREFIX = "mn"
+# Hex digits of the style hash in a class name
+STYLE_CLASS_HASH_CHARS = 8
+
+_URL_SCHEME_RE = re.compile(r"^([a-z][a-z0-9+.-]*):")
+_URL_IGNORED_CHARS_RE = re.compile(r"[\x00-\x20]")
+_IGNORED_STYLE_VALUES = frozenset(["inherit", "initial", "unset", ""])
+# Values are copied into a <style> element, so only plain CSS tokens are kept:
+# no markup, braces, escapes, comments or at-rules can reach the stylesheet
+_SAFE_STYLE_VALUE_RE = re.compile(r"^[\w\s#%.,()+!-]+$")
+_UNSAFE_STYLE_VALUE_RE = re.compile(r"url\(|expression", re.IGNORECASE)
+# Also matches the numbered classes (mn0, mn1 ...) of documents stored before hashed names
+_STYLE_RULE_RE = re.compile(rf"\.({STYLE_CLASS_PREFIX}[0-9a-f]+)\{{([^}}]*)\}}")
+_STYLE_BLOCK_RE = re.compile(rf"^<style>((?:\.{STYLE_CLASS_PREFIX}[0-9a-f]+\{{[^}}]*\}})*)</style>")
+_PRESERVE_WHITESPACE_TAGS = frozenset(["pre", "textarea"])
+# HTML only collapses ASCII whitespace; U+3000 etc. are real content
+_ASCII_WHITESPACE = " \t\n\r\f"
+
+
+def normalize_style(style: str) -> str:
+    """
+    Keep whitelisted declarations of an inline style, in canonical form
+
+    Values that are not plain CSS tokens (markup, braces, backslashes,
+    comments, url(), expression(), at-rules) are dropped, since the result
+    is written into a <style> element.
+
+    Args:
+        style: Inline style attribute value
+
+    Returns:
+        Declarations sorted by property ("color:#333;font-size:15px"),
+        or "" if nothing is kept
+    """
+    declarations = {}
+    for declaration in style.split(";"):
+        prop, sep, value = declaration.partition(":")
+        if not sep:
+            continue
+        prop = prop.strip().lower()
+        value = " ".join(value.split())
+        if prop not in ALLOWED_STYLE_PROPERTIES or value.lower() in _IGNORED_STYLE_VALUES:
+            continue
+        if _SAFE_STYLE_VALUE_RE.match(value) and not _UNSAFE_STYLE_VALUE_RE.search(value):
+            # Later declarations win, as in the browser
+            declarations[prop] = value
+
+    return ";".join(f"{prop}:{declarations[prop]}" for prop in sorted(declarations))
+
+
+def style_class_name(style: str) -> str:
+    """
+    Class name for a normalized style
+
+    A short hash of the declarations, so the name is the same in every document.
+    """
+    digest = hashlib.sha1(style.encode("utf-8")).hexdigest()[:STYLE_CLASS_HASH_CHARS]
+    return f"{STYLE_CLASS_PREFIX}{digest}"
+
+
+def _is_safe_url(url: str, tag: str) -> bool:
+    """
+    Allow http(s), protocol-relative and relative URLs, and data:image/* for <img>
+
+    Control characters and spaces are ignored, as browsers do when reading the scheme.
+    """
+    url = _URL_IGNORED_CHARS_RE.sub("", url).lower()
+    match = _URL_SCHEME_RE.match(url)
+    if match is None:
+        return True
+    scheme = match.group(1)
+    return scheme in SAFE_URL_SCHEMES or (tag == "img" and url.startswith("data:image/"))
+
+
+def _split_style_block(html_content: str) -> Tuple[Dict[str, str], str]:
+    """Split off the leading style block written by a previous sanitize_html() run"""
+    match = _STYLE_BLOCK_RE.match(html_content)
+    if not match:
+        return {}, html_content
+    return dict(_STYLE_RULE_RE.findall(match.group(1))), html_content[match.end():]
+
+
+def _sanitize_element(
+    element: etree._Element,
+    style_map: Dict[str, str],
+    known_classes: Dict[str, str],
+    preserve_whitespace: bool = False
+):
+    """Sanitize element's children in place (the element itself is handled by the caller)"""
+    for child in list(element):
+        # Comments and processing instructions
+        if not isinstance(child.tag, str):
+            child.drop_tree()
+            continue
+
+        tag = child.tag.lower()
+        if tag in DROP_TAGS:
+            child.drop_tree()
+            continue
+
+        # Styles already moved into classes by a previous run
+        style = child.get("style") or ""
+        for class_name in (child.get("class") or "").split():
+            if class_name in known_classes:
+                style = f"{known_classes[class_name]};{style}"
+
+        allowed = ALLOWED_ATTRIBUTES.get(tag, frozenset())
+        for attr in list(child.attrib):
+            if attr not in allowed:
+                del child.attrib[attr]
+
+        for attr in ("href", "src"):
+            value = child.get(attr)
+            if value is not None and not _is_safe_url(value, tag):
+                del child.attrib[attr]
+
+        style = normalize_style(style)
+        if style:
+            class_name = style_map.get(style)
+            if class_name is None:
+                class_name = style_class_name(style)
+                style_map[style] = class_name
+            child.set("class", class_name)
+
+        _sanitize_element(
+            child,
+            style_map,
+            known_classes,
+            preserve_whitespace or tag in _PRESERVE_WHITESPACE_TAGS
+        )
+
+        if tag in UNWRAP_TAGS and not child.attrib:
+            child.drop_tag()
+
+    # Collapse whitespace-only text once dropped nodes have merged their tails
+    if not preserve_whitespace:
+        if element.text and not element.text.strip(_ASCII_WHITESPACE):
+            element.text = " "
+        for child in element:
+            if child.tail and not child.tail.strip(_ASCII_WHITESPACE):
+                child.tail = " "
+
+
+def parse_fragment(html_content: str) -> lxml_html.HtmlElement:
+    """
+    Parse an HTML fragment into a wrapping <div>
+
+    The wrapper lets drop_tree()/drop_tag() work on top-level nodes too;
+    serialize_fragment() writes the children back without it.
+
+    Raises:
+        etree.ParserError: If the fragment cannot be parsed
+    """
+    fragments = lxml_html.fragments_fromstring(html_content)
+    container = lxml_html.Element("div")
+    if fragments and isinstance(fragments[0], str):
+        container.text = fragments.pop(0)
+    container.extend(fragments)
+    return container
+
+
+def serialize_fragment(container: lxml_html.HtmlElement) -> str:
+    """Serialize the children of a parse_fragment() wrapper"""
+    # Strip the wrapping "<div>" and "</div>"
+    return lxml_html.tostring(container, encoding="unicode")[5:-6].strip(_ASCII_WHITESPACE)
+
+
+def sanitize_html(html_content: str) -> str:
+    """
+    Sanitize and minify article HTML for storage
+
+    - drops scripts, styles, comments and non-whitelisted attributes, and
+      href/src URLs other than http(s), relative or (for <img>) data:image/*
+    - keeps whitelisted style properties as shared classes defined in a
+      single leading <style> block (class names derived from the style, see
+      style_class_name())
+    - unwraps attribute-less <span>/<font> and collapses whitespace-only text
+
+    Running it on its own output returns the same HTML (for well-formed input).
+
+    Args:
+        html_content: Raw article HTML (fragment)
+
+    Returns:
+        Sanitized HTML fragment
+    """
+    if not html_content or not html_content.strip():
+        return html_content or ""
+
+    known_classes, body = _split_style_block(html_content)
+    try:
+        container = parse_fragment(body)
+    except etree.ParserError:
+        return html_content
+
+    style_map: Dict[str, str] = {}
+    _sanitize_element(container, style_map, known_classes)
+    body = serialize_fragment(container)
+
+    if not style_map:
+        return body
+
+    rules = "".join(f".{class_name}{{{style}}}" for style, class_name in style_map.items())
+    return f"<style>{rules}</style>{body}"
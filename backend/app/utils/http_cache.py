@@ -0,0 +1,83 @@
+"""HTTP conditional requests (ETag / Last-Modified / 304) for article APIs
+
+Endpoints compute a validator from a cheap indexed query (for a detail:
+id, updated_at and version_no; for a list: the ids and max updated_at of
+the page window) before loading any content. When the client's
+If-None-Match / If-Modified-Since still matches, a 304 with no body is
+returned and the heavy columns are never read.
+
+Cache-Control (settings.ARTICLE_CACHE_CONTROL) lets the nginx front
+micro-cache responses and revalidate them with the same validators.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from app.config import settings
+from app.utils import timezone as tz
+
+
+def make_etag(*parts) -> str:
+    """Weak ETag from the values that identify one representation"""
+    raw = "|".join("" if part is None else str(part) for part in parts)
+    return f'W/"{hashlib.sha1(raw.encode()).hexdigest()[:20]}"'
+
+
+def http_date(value: datetime) -> str:
+    """Naive China-time timestamp (as stored in the database) -> IMF-fixdate"""
+    return format_datetime(tz.to_china_tz(value).astimezone(timezone.utc), usegmt=True)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison against an If-None-Match list (RFC 9110 13.1.2)"""
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def _not_modified_since(header: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP dates have second precision
+    modified = tz.to_china_tz(last_modified).replace(microsecond=0)
+    return modified <= since
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """
+    Whether the client's cached copy is still current
+
+    If-None-Match takes precedence; If-Modified-Since is only used when the
+    request has no If-None-Match.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None and last_modified is not None:
+        return _not_modified_since(if_modified_since, last_modified)
+    return False
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime] = None) -> Dict[str, str]:
+    """ETag, Last-Modified and Cache-Control headers for a response"""
+    headers = {"ETag": etag, "Cache-Control": settings.ARTICLE_CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def not_modified_response(headers: Dict[str, str]) -> Response:
+    """304 carrying the same validators as the full response would"""
+    return Response(status_code=304, headers=headers)
@@ -0,0 +1,133 @@
+"""Keyset (cursor) pagination for article lists
+
+Lists are ordered by (published_at DESC, id DESC). A cursor encodes the sort
+key of the last row of a page, and the next page is the rows strictly after
+it, which the partial index on (published_at, id) WHERE NOT is_deleted serves
+directly, so page 500 costs the same as page 1. OFFSET pagination has to
+walk and discard every skipped row instead.
+
+Totals need a full count over the filtered rows, so they are optional and
+cached for a short time per filter combination.
+"""
+
+import base64
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from sqlalchemy import tuple_
+
+from app.config import settings
+
+
+def encode_cursor(published_at: datetime, row_id: int) -> str:
+    """Opaque cursor for the row after which the next page starts"""
+    raw = f"{published_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Inverse of encode_cursor()
+
+    Raises:
+        ValueError: Malformed cursor
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        published_at, _, row_id = base64.urlsafe_b64decode(padded.encode()).decode().partition("|")
+        return datetime.fromisoformat(published_at), int(row_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def encode_score_cursor(score: float, row_id: int) -> str:
+    """Cursor for lists ordered by a computed score (e.g. search rank), then id"""
+    raw = f"{score!r}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_score_cursor(cursor: str) -> Tuple[float, int]:
+    """
+    Inverse of encode_score_cursor()
+
+    Raises:
+        ValueError: Malformed cursor
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        score, _, row_id = base64.urlsafe_b64decode(padded.encode()).decode().partition("|")
+        return float(score), int(row_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def apply_keyset(query, sort_column, id_column, cursor: Optional[str], limit: int):
+    """
+    Order query by (sort_column DESC, id_column DESC) and start after cursor
+
+    Fetches limit + 1 rows so the caller can tell whether there is a next page
+    (see keyset_page).
+    """
+    if cursor:
+        published_at, row_id = decode_cursor(cursor)
+        # Row-value comparison so Postgres can use the composite index range
+        query = query.where(tuple_(sort_column, id_column) < tuple_(published_at, row_id))
+    return query.order_by(sort_column.desc(), id_column.desc()).limit(limit + 1)
+
+
+def keyset_page(
+    rows: list,
+    limit: int,
+    sort_attr: str = "published_at",
+    id_attr: str = "id",
+    encode: Callable[[object, int], str] = encode_cursor
+) -> Tuple[list, Optional[str]]:
+    """
+    Trim the extra row fetched by apply_keyset (or a query with limit + 1)
+
+    Returns:
+        (rows of this page, next cursor or None on the last page)
+    """
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode(getattr(last, sort_attr), getattr(last, id_attr))
+
+
+class CountCache:
+    """
+    Caches list totals per filter combination for ttl seconds
+
+    Args:
+        ttl: Seconds a total stays valid
+        max_entries: Entries kept before the oldest are dropped
+    """
+
+    def __init__(self, ttl: float = 60.0, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[float, int]] = {}
+
+    async def get(self, key: Hashable, count: Callable[[], Awaitable[int]]) -> int:
+        """Return the cached total for key, calling count() when missing or expired"""
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and now - entry[0] < self.ttl:
+            return entry[1]
+
+        total = await count()
+        if len(self._entries) >= self.max_entries:
+            oldest = sorted(self._entries, key=lambda k: self._entries[k][0])
+            for stale_key in oldest[: len(oldest) // 2]:
+                del self._entries[stale_key]
+        self._entries[key] = (now, total)
+        return total
+
+    def clear(self):
+        self._entries.clear()
+
+
+# Article list totals (public and admin); cleared when articles are deleted
+article_count_cache = CountCache(ttl=settings.ARTICLE_COUNT_CACHE_SECONDS)
@@ -0,0 +1,272 @@
+"""Staged async pipeline with bounded queues, per-stage metrics and dead-lettering
+
+Each Stage is a group of async workers reading from its own bounded queue.
+A full queue blocks the upstream stage (backpressure), so a slow stage shows
+up as a deep input queue and a high busy ratio in the metrics instead of
+unbounded memory growth.
+
+Handlers take an item and return the item for the next stage, or None to
+drop it (e.g. duplicates). An exception sends the item to the dead-letter
+store and the pipeline carries on with the next item.
+"""
+
+import asyncio
+import logging
+import time
+import traceback
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.utils import timezone as tz
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[Any], Awaitable[Any]]
+
+# Marks the end of input on a queue (one per worker)
+_DONE = object()
+
+
+@dataclass
+class DeadLetter:
+    """An item that failed in a stage"""
+    stage: str
+    item: Any
+    error_type: str
+    error: str
+    traceback: str
+    failed_at: Any = field(default_factory=tz.now)
+
+
+class MemoryDeadLetterStore:
+    """Keeps dead letters in memory (default store)"""
+
+    def __init__(self):
+        self.letters: List[DeadLetter] = []
+
+    async def add(self, letter: DeadLetter):
+        self.letters.append(letter)
+
+
+@dataclass
+class StageMetrics:
+    """Counters for one stage"""
+    received: int = 0
+    passed: int = 0
+    dropped: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0
+    max_queue_depth: int = 0
+    queue_depth_total: int = 0
+    queue_samples: int = 0
+
+    def sample_queue(self, depth: int):
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+        self.queue_depth_total += depth
+        self.queue_samples += 1
+
+
+class Stage:
+    """
+    One pipeline stage
+
+    Args:
+        name: Stage name used in metrics and dead letters
+        handler: async handler(item) -> item for the next stage, or None to drop it
+        concurrency: Number of workers
+        queue_size: Capacity of the stage's input queue
+    """
+
+    def __init__(self, name: str, handler: Handler, concurrency: int = 1, queue_size: int = 16):
+        if concurrency < 1:
+            raise ValueError(f"Stage {name}: concurrency must be >= 1")
+        self.name = name
+        self.handler = handler
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.metrics = StageMetrics()
+        self.queue: Optional[asyncio.Queue] = None
+
+
+class Pipeline:
+    """
+    Runs items through a list of stages
+
+    Args:
+        stages: Stages in order
+        dead_letter_store: Object with `async add(DeadLetter)`; defaults to memory
+        on_report: Optional callback receiving report() every report_interval seconds
+        report_interval: Seconds between on_report calls
+    """
+
+    def __init__(
+        self,
+        stages: List[Stage],
+        dead_letter_store=None,
+        on_report: Optional[Callable[[Dict], None]] = None,
+        report_interval: float = 5.0
+    ):
+        if not stages:
+            raise ValueError("Pipeline needs at least one stage")
+        names = [stage.name for stage in stages]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate stage names: {names}")
+
+        self.stages = stages
+        self.dead_letter_store = dead_letter_store or MemoryDeadLetterStore()
+        self.on_report = on_report
+        self.report_interval = report_interval
+        self.results: List[Any] = []
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+
+    async def _put(self, index: int, item: Any):
+        """Hand an item to stage `index` (or collect it after the last stage)"""
+        if index == len(self.stages):
+            self.results.append(item)
+            return
+        stage = self.stages[index]
+        await stage.queue.put(item)
+        stage.metrics.sample_queue(stage.queue.qsize())
+
+    async def _worker(self, index: int):
+        stage = self.stages[index]
+        metrics = stage.metrics
+
+        while True:
+            item = await stage.queue.get()
+            if item is _DONE:
+                return
+
+            metrics.received += 1
+            started = time.perf_counter()
+            try:
+                output = await stage.handler(item)
+            except Exception as e:
+                metrics.failed += 1
+                logger.warning(f"[Pipeline] {stage.name} 失败: {e}")
+                await self._dead_letter(stage, item, e)
+                continue
+            finally:
+                metrics.busy_seconds += time.perf_counter() - started
+
+            if output is None:
+                metrics.dropped += 1
+            else:
+                metrics.passed += 1
+                await self._put(index + 1, output)
+
+    async def _dead_letter(self, stage: Stage, item: Any, error: Exception):
+        letter = DeadLetter(
+            stage=stage.name,
+            item=item,
+            error_type=type(error).__name__,
+            error=f"{type(error).__name__}: {error}",
+            traceback=traceback.format_exc(),
+        )
+        try:
+            await self.dead_letter_store.add(letter)
+        except Exception as e:
+            logger.error(f"[Pipeline] 写入死信失败 ({stage.name}): {e}")
+
+    async def _run_stage(self, index: int):
+        """Run a stage's workers, then signal end of input downstream"""
+        stage = self.stages[index]
+        await asyncio.gather(*(self._worker(index) for _ in range(stage.concurrency)))
+        if index + 1 < len(self.stages):
+            downstream = self.stages[index + 1]
+            for _ in range(downstream.concurrency):
+                await downstream.queue.put(_DONE)
+
+    async def _report_loop(self):
+        while True:
+            await asyncio.sleep(self.report_interval)
+            try:
+                self.on_report(self.report())
+            except Exception as e:
+                logger.warning(f"[Pipeline] 上报指标失败: {e}")
+
+    async def run(self, items) -> List[Any]:
+        """
+        Feed items through all stages and wait until every stage is drained
+
+        Args:
+            items: Iterable of input items
+
+        Returns:
+            Items that made it through the last stage
+        """
+        for stage in self.stages:
+            stage.queue = asyncio.Queue(maxsize=stage.queue_size)
+            stage.metrics = StageMetrics()
+        self.results = []
+        self._started_at = time.perf_counter()
+        self._finished_at = None
+
+        async def feed():
+            for item in items:
+                await self._put(0, item)
+            for _ in range(self.stages[0].concurrency):
+                await self.stages[0].queue.put(_DONE)
+
+        # The feeder is a task too, so a crashed stage cannot leave it blocked on a full queue
+        runners = [asyncio.create_task(feed())]
+        runners += [asyncio.create_task(self._run_stage(i)) for i in range(len(self.stages))]
+        reporter = asyncio.create_task(self._report_loop()) if self.on_report else None
+
+        try:
+            await asyncio.gather(*runners)
+        finally:
+            for runner in runners:
+                runner.cancel()
+            if reporter:
+                reporter.cancel()
+            self._finished_at = time.perf_counter()
+
+        if self.on_report:
+            self.on_report(self.report())
+        return self.results
+
+    def report(self) -> Dict[str, Dict]:
+        """
+        Per-stage metrics
+
+        throughput is items handled per second of pipeline wall time;
+        busy_ratio is the share of worker time spent in the handler, so the
+        stage closest to 1.0 (with a deep input queue) is the bottleneck.
+        """
+        end = self._finished_at or time.perf_counter()
+        elapsed = max(end - (self._started_at or end), 1e-9)
+
+        report = {}
+        for stage in self.stages:
+            m = stage.metrics
+            handled = m.passed + m.dropped + m.failed
+            report[stage.name] = {
+                "concurrency": stage.concurrency,
+                "received": m.received,
+                "passed": m.passed,
+                "dropped": m.dropped,
+                "failed": m.failed,
+                "throughput": round(handled / elapsed, 3),
+                "avg_seconds": round(m.busy_seconds / handled, 3) if handled else 0.0,
+                "busy_ratio": round(m.busy_seconds / (elapsed * stage.concurrency), 3),
+                "queue_depth": stage.queue.qsize() if stage.queue else 0,
+                "max_queue_depth": m.max_queue_depth,
+                "avg_queue_depth": round(m.queue_depth_total / m.queue_samples, 2) if m.queue_samples else 0.0,
+            }
+        return report
+
+    def format_report(self) -> str:
+        """report() as a text table"""
+        lines = [
+            f"{'stage':<10}{'conc':>5}{'in':>6}{'pass':>6}{'drop':>6}{'fail':>6}"
+            f"{'items/s':>9}{'avg s':>8}{'busy':>7}{'maxq':>6}{'avgq':>7}"
+        ]
+        for name, m in self.report().items():
+            lines.append(
+                f"{name:<10}{m['concurrency']:>5}{m['received']:>6}{m['passed']:>6}{m['dropped']:>6}"
+                f"{m['failed']:>6}{m['throughput']:>9.2f}{m['avg_seconds']:>8.2f}{m['busy_ratio']:>7.0%}"
+                f"{m['max_queue_depth']:>6}{m['avg_queue_depth']:>7.1f}"
+            )
+        return "\n".join(lines)
@@ -4,6 +4,7 @@ from minio import Minio
 from minio.error import S3Error
 from app.config import settings
 import io
+import json
 from typing import Optional
 
 
@@ -25,7 +26,7 @@ class S3Client:
         self._ensure_buckets()
 
     def _ensure_buckets(self):
-        """Create buckets if they don't exist"""
+        """Create buckets if they don't exist and (re)apply the attachments read policy"""
         buckets = [
             settings.S3_BUCKET_RAW,
             settings.S3_BUCKET_CLEAN,
@@ -37,9 +38,25 @@ class S3Client:
                 if not self.client.bucket_exists(bucket):
                     self.client.make_bucket(bucket)
                     print(f"✅ Created bucket: {bucket}")
+                # Applied on every start, so buckets created before the policy existed get it too
+                if bucket == settings.S3_BUCKET_ATTACHMENTS:
+                    self._set_public_read(bucket)
             except S3Error as e:
                 print(f"❌ Error ensuring bucket {bucket}: {e}")
 
+    def _set_public_read(self, bucket: str):
+        """Allow anonymous GET on objects (attachments are served to clients directly)"""
+        policy = {
+            "Version": "2012-10-17",
+            "Statement": [{
+                "Effect": "Allow",
+                "Principal": {"AWS": ["*"]},
+                "Action": ["s3:GetObject"],
+                "Resource": [f"arn:aws:s3:::{bucket}/*"],
+            }],
+        }
+        self.client.set_bucket_policy(bucket, json.dumps(policy))
+
     def upload_text(self, content: str, bucket: str, object_name: str) -> bool:
         """
         Upload text content to S3
@@ -68,6 +85,71 @@ class S3Client:
             print(f"❌ Error uploading to S3: {e}")
             return False
 
+    def upload_bytes(self, data: bytes, bucket: str, object_name: str, content_type: str) -> bool:
+        """
+        Upload binary content to S3
+
+        Args:
+            data: Bytes to upload
+            bucket: Bucket name
+            object_name: Object key/path
+            content_type: MIME type stored with the object
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            self.client.put_object(
+                bucket,
+                object_name,
+                io.BytesIO(data),
+                length=len(data),
+                content_type=content_type
+            )
+            return True
+        except S3Error as e:
+            print(f"❌ Error uploading to S3: {e}")
+            return False
+
+    def object_exists(self, bucket: str, object_name: str) -> bool:
+        """
+        Check whether an object exists
+
+        Args:
+            bucket: Bucket name
+            object_name: Object key/path
+
+        Returns:
+            True if the object exists
+        """
+        try:
+            self.client.stat_object(bucket, object_name)
+            return True
+        except S3Error:
+            return False
+
+    def get_public_url(self, bucket: str, object_name: str) -> str:
+        """
+        Build the public (unsigned) URL of an object
+
+        Based on S3_PUBLIC_URL (e.g. the nginx/CDN edge in front of MinIO);
+        S3_ENDPOINT is usually an internal address clients cannot reach.
+
+        Args:
+            bucket: Bucket name
+            object_name: Object key/path
+
+        Returns:
+            Public URL
+
+        Raises:
+            ValueError: If S3_PUBLIC_URL is not configured
+        """
+        if not settings.S3_PUBLIC_URL:
+            raise ValueError("S3_PUBLIC_URL is not configured")
+        base_url = settings.S3_PUBLIC_URL.rstrip("/")
+        return f"{base_url}/{bucket}/{object_name}"
+
     def upload_file(self, file_path: str, bucket: str, object_name: str) -> bool:
         """
         Upload file to S3
@@ -87,6 +169,29 @@ class S3Client:
             print(f"❌ Error uploading file to S3: {e}")
             return False
 
+    def download_bytes(self, bucket: str, object_name: str) -> Optional[bytes]:
+        """
+        Download binary content from S3
+
+        Args:
+            bucket: Bucket name
+            object_name: Object key/path
+
+        Returns:
+            Object bytes or None if error
+        """
+        response = None
+        try:
+            response = self.client.get_object(bucket, object_name)
+            return response.read()
+        except S3Error as e:
+            print(f"❌ Error downloading from S3: {e}")
+            return None
+        finally:
+            if response is not None:
+                response.close()
+                response.release_conn()
+
     def get_presigned_url(self, bucket: str, object_name: str, expires: int = 3600) -> Optional[str]:
         """
         Generate presigned URL for object
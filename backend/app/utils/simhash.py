@@ -0,0 +1,105 @@
+"""SimHash fingerprints for near-duplicate article detection
+
+A 64-bit SimHash is built from character shingles of the normalized text,
+so the same story with a different footer, header or punctuation ends up a
+few bits away from the original. Fingerprints are split into bands for
+indexed lookup: with BANDS bands, two fingerprints within BANDS - 1 bits of
+each other are guaranteed to share at least one band exactly (pigeonhole),
+so MAX_INDEXED_DISTANCE is the largest distance a banded lookup can serve.
+"""
+
+import hashlib
+import re
+from collections import Counter
+from typing import List
+
+FINGERPRINT_BITS = 64
+BANDS = 7
+MAX_INDEXED_DISTANCE = BANDS - 1
+SHINGLE_SIZE = 3
+
+# Band widths (10 + 6 * 9 = 64 bits); wider bands mean fewer false candidates
+_BAND_WIDTHS = [FINGERPRINT_BITS - (FINGERPRINT_BITS // BANDS) * (BANDS - 1)] + \
+    [FINGERPRINT_BITS // BANDS] * (BANDS - 1)
+
+# Everything except letters/digits/CJK; punctuation and spacing differ between sources
+_NOISE_RE = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and drop whitespace/punctuation"""
+    return _NOISE_RE.sub("", text or "").lower()
+
+
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+def simhash(text: str) -> int:
+    """
+    Compute the 64-bit SimHash of a text
+
+    Args:
+        text: Plain article text
+
+    Returns:
+        Unsigned 64-bit fingerprint (0 for empty text)
+    """
+    normalized = normalize_text(text)
+    if len(normalized) < SHINGLE_SIZE:
+        return _feature_hash(normalized) if normalized else 0
+
+    features = Counter(
+        normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)
+    )
+
+    weights = [0] * FINGERPRINT_BITS
+    for feature, weight in features.items():
+        value = _feature_hash(feature)
+        for bit in range(FINGERPRINT_BITS):
+            if value >> bit & 1:
+                weights[bit] += weight
+            else:
+                weights[bit] -= weight
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints"""
+    return bin(a ^ b).count("1")
+
+
+def split_bands(fingerprint: int) -> List[int]:
+    """Split a fingerprint into BANDS small integers (one per bit range)"""
+    bands = []
+    for width in _BAND_WIDTHS:
+        bands.append(fingerprint & ((1 << width) - 1))
+        fingerprint >>= width
+    return bands
+
+
+def band_keys(fingerprint: int) -> List[int]:
+    """
+    Position-tagged bands for an array-overlap index
+
+    Band i with value v becomes (i << 16) | v, so equal values in different
+    bands never match each other.
+    """
+    return [(i << 16) | band for i, band in enumerate(split_bands(fingerprint))]
+
+
+def to_signed(fingerprint: int) -> int:
+    """Map an unsigned 64-bit fingerprint onto a signed BIGINT column"""
+    return fingerprint - (1 << 64) if fingerprint >= 1 << 63 else fingerprint
+
+
+def to_unsigned(value: int) -> int:
+    """Inverse of to_signed()"""
+    return value + (1 << 64) if value < 0 else value
@@ -0,0 +1,93 @@
+"""Search result snippets with highlighted matches
+
+A snippet is cut from the short text a result matched on (a ~300 character
+chunk, or the summary), never from the full content_text. Match offsets
+come from fulltext.match_spans, which finds the index terms of the query
+(tokenized once per result page) with str.find.
+
+The window with the most matches wins. Text is HTML-escaped and matches
+are wrapped in <em> tags.
+"""
+
+import html
+from typing import List, Optional, Sequence, Set, Tuple
+
+from app.utils.fulltext import match_spans, tokenize
+
+SNIPPET_CHARS = 200
+HIGHLIGHT_PRE = "<em>"
+HIGHLIGHT_POST = "</em>"
+ELLIPSIS = "…"
+
+
+def query_terms(query: str) -> Set[str]:
+    """Index terms of a query (tokenize once per result page)"""
+    return set(tokenize(query))
+
+
+def _merge(spans: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Merge overlapping or touching spans (adjacent bigrams of one phrase)"""
+    merged = []
+    for start, end in spans:
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _best_window(spans: List[Tuple[int, int]], length: int, max_chars: int) -> int:
+    """Start offset of the max_chars window covering the most spans"""
+    if not spans:
+        return 0
+    best_start, best_count = spans[0][0], 0
+    right = 0
+    for left in range(len(spans)):
+        while right < len(spans) and spans[right][1] <= spans[left][0] + max_chars:
+            right += 1
+        if right - left > best_count:
+            best_start, best_count = spans[left][0], right - left
+
+    # Centre the matched stretch in the window instead of starting at the first match
+    covered_end = max(end for start, end in spans if best_start <= start and end <= best_start + max_chars)
+    slack = max_chars - (covered_end - best_start)
+    return max(0, min(best_start - slack // 2, length - max_chars))
+
+
+def build_snippet(text: str, terms: Set[str], max_chars: int = SNIPPET_CHARS) -> str:
+    """
+    Highlighted snippet of text for the query terms
+
+    Args:
+        text: Matched text (chunk, or title + summary)
+        terms: query_terms(query)
+        max_chars: Snippet length before escaping and highlight tags
+
+    Returns:
+        HTML-escaped snippet with <em> around matches, the start of the text when nothing matches
+    """
+    text = " ".join(text.split())
+    spans = _merge(match_spans(text, terms)) if terms else []
+    start = _best_window(spans, len(text), max_chars)
+    end = min(len(text), start + max_chars)
+
+    parts = [ELLIPSIS] if start > 0 else []
+    position = start
+    for span_start, span_end in spans:
+        if span_end <= start or span_start >= end:
+            continue
+        span_start, span_end = max(span_start, start), min(span_end, end)
+        parts.append(html.escape(text[position:span_start], quote=False))
+        parts.append(HIGHLIGHT_PRE + html.escape(text[span_start:span_end], quote=False) + HIGHLIGHT_POST)
+        position = span_end
+    parts.append(html.escape(text[position:end], quote=False))
+    if end < len(text):
+        parts.append(ELLIPSIS)
+    return "".join(parts)
+
+
+def build_snippets(texts: Sequence[Optional[str]], query: str, max_chars: int = SNIPPET_CHARS) -> List[str]:
+    """Snippets for a result page (the query is tokenized once)"""
+    terms = query_terms(query)
+    return [build_snippet(text or "", terms, max_chars) for text in texts]
@@ -0,0 +1,54 @@
+"""Compact line-level deltas between article versions
+
+A delta is the list of edits that turns the new text back into the old one,
+so only the current version is stored in full and each previous version
+costs roughly the size of what changed. Each edit is [start, end, old_lines]:
+replace new_lines[start:end] with old_lines. Edits are ordered by position
+and applied back to front.
+"""
+
+import difflib
+from typing import List, Tuple
+
+Delta = List[list]
+
+
+def make_delta(old: str, new: str) -> Delta:
+    """
+    Compute the reverse delta from new to old
+
+    Args:
+        old: Previous text
+        new: Current text
+
+    Returns:
+        JSON-serializable list of [start, end, old_lines] edits
+    """
+    old_lines = (old or "").split("\n")
+    new_lines = (new or "").split("\n")
+    matcher = difflib.SequenceMatcher(None, new_lines, old_lines, autojunk=False)
+    return [
+        [i1, i2, old_lines[j1:j2]]
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != "equal"
+    ]
+
+
+def apply_delta(new: str, delta: Delta) -> str:
+    """Rebuild the previous text from the current text and its reverse delta"""
+    lines = (new or "").split("\n")
+    for start, end, old_lines in reversed(delta):
+        lines[start:end] = old_lines
+    return "\n".join(lines)
+
+
+def delta_stats(delta: Delta) -> Tuple[int, int]:
+    """
+    Size of the change from the old text to the new text
+
+    Returns:
+        (lines_added, lines_removed)
+    """
+    added = sum(end - start for start, end, _ in delta)
+    removed = sum(len(old_lines) for _, _, old_lines in delta)
+    return added, removed
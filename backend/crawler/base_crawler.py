@@ -4,7 +4,7 @@
 
 import logging
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from typing import Awaitable, Callable, List, Dict, Optional
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -13,8 +13,16 @@ logger = logging.getLogger(__name__)
 class BaseCrawler(ABC):
     """爬虫基类 - 所有爬虫必须继承此类"""
 
-    def __init__(self, headless: bool = True):
+    def __init__(self, headless: bool = True, page_archive=None, replay=None):
+        """
+        参数:
+            headless: 是否无头模式
+            page_archive: 可选的页面归档器（PageArchive），抓取到的原始HTML会写入归档
+            replay: 可选的录制/回放路由（crawler.replay.ReplayRouter）
+        """
         self.headless = headless
+        self.page_archive = page_archive
+        self.replay = replay
         self.source_name = self.get_source_name()
 
     @abstractmethod
@@ -48,6 +56,8 @@ class BaseCrawler(ABC):
         爬取详情页
 
         返回: (content_html, content_text, original_source_url)
+
+        页面加载失败时抛出异常
         """
         pass
 
@@ -67,13 +77,33 @@ class BaseCrawler(ABC):
             from_date: 起始日期
             to_date: 结束日期
         """
+        return await self._crawl_pages(
+            self.crawl_list_page, num_pages, max_articles, from_date, to_date
+        )
+
+    async def _crawl_pages(
+        self,
+        fetch_page: Callable[[int], Awaitable[List[Dict]]],
+        num_pages: int,
+        max_articles: Optional[int],
+        from_date: Optional[datetime],
+        to_date: Optional[datetime],
+        label: str = ""
+    ) -> List[Dict]:
+        """
+        逐页爬取列表并按时间筛选（连续3页无数据时早停）
+
+        参数:
+            fetch_page: 爬取单个列表页的函数（参数为页码）
+            label: 日志前缀（如栏目名称）
+        """
         all_articles = []
         empty_pages = 0
 
         for page_num in range(1, num_pages + 1):
-            logger.info(f"[Crawler] 正在爬取第 {page_num} 页...")
+            logger.info(f"[Crawler] {label}正在爬取第 {page_num} 页...")
 
-            articles = await self.crawl_list_page(page_num)
+            articles = await fetch_page(page_num)
 
             # 时间筛选
             filtered = []
@@ -92,24 +122,38 @@ class BaseCrawler(ABC):
             # 早停判断
             if not filtered:
                 empty_pages += 1
-                logger.warning(f"[Crawler] 第 {page_num} 页无符合条件的文章")
+                logger.warning(f"[Crawler] {label}第 {page_num} 页无符合条件的文章")
                 if empty_pages >= 3:
-                    logger.info(f"[Crawler] 连续 {empty_pages} 页无数据，停止爬取")
+                    logger.info(f"[Crawler] {label}连续 {empty_pages} 页无数据，停止爬取")
                     break
             else:
                 empty_pages = 0
                 all_articles.extend(filtered)
-                logger.info(f"[Crawler] 第 {page_num} 页找到 {len(filtered)} 篇文章")
+                logger.info(f"[Crawler] {label}第 {page_num} 页找到 {len(filtered)} 篇文章")
 
             # 数量限制
             if max_articles and len(all_articles) >= max_articles:
                 all_articles = all_articles[:max_articles]
-                logger.info(f"[Crawler] 已达到最大文章数 {max_articles}，停止爬取")
+                logger.info(f"[Crawler] {label}已达到最大文章数 {max_articles}，停止爬取")
                 break
 
-        logger.info(f"\n[Crawler] 爬取完成，共 {len(all_articles)} 篇文章")
+        logger.info(f"\n[Crawler] {label}爬取完成，共 {len(all_articles)} 篇文章")
         return all_articles
 
+    async def archive_page(self, url: str, page_kind: str, html: str):
+        """归档原始页面（未配置归档器时不做任何事）"""
+        if self.page_archive is None:
+            return
+        try:
+            await self.page_archive.add(url, page_kind, html)
+        except Exception as e:
+            logger.warning(f"[Crawler] 页面归档失败 {url}: {e}")
+
+    async def prepare_page(self, target):
+        """新标签页（或浏览器上下文）访问前调用：配置了录制/回放时启用路由拦截"""
+        if self.replay is not None:
+            await self.replay.attach(target)
+
     def supports_wechat_extraction(self) -> bool:
         """是否支持提取微信原文链接"""
         return False
@@ -19,13 +19,14 @@ class CrawlerFactory:
     }
 
     @classmethod
-    def create_crawler(cls, source: str, headless: bool = True) -> BaseCrawler:
+    def create_crawler(cls, source: str, headless: bool = True, page_archive=None) -> BaseCrawler:
         """
         创建爬虫实例
 
         参数:
             source: 数据源名称（pharnexcloud, yaozhi, 等）
             headless: 是否无头模式
+            page_archive: 可选的页面归档器
 
         返回:
             爬虫实例
@@ -42,7 +43,7 @@ class CrawlerFactory:
                 f"可用的数据源: {', '.join(available_sources)}"
             )
 
-        return crawler_class(headless=headless)
+        return crawler_class(headless=headless, page_archive=page_archive)
 
     @classmethod
     def get_available_sources(cls) -> List[Dict[str, str]]:
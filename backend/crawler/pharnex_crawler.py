@@ -4,6 +4,8 @@ import asyncio
 import logging
 import sys
 import os
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from datetime import datetime
 from patchright.async_api import async_playwright, TimeoutError
 from bs4 import BeautifulSoup
@@ -13,16 +15,55 @@ import re
 # 添加backend目录到Python路径
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from app.utils import timezone as tz
+from app.config import settings
 
 from .base_crawler import BaseCrawler
 
 logger = logging.getLogger(__name__)
 
 
-class PharnexCrawler(BaseCrawler):
-    """药渡云爬虫 - 支持微信原文提取"""
+@dataclass(frozen=True)
+class PharnexSection:
+    """药渡云栏目"""
+    path: str  # 栏目路径，如 /zixun/shiye/qy
+    category: str  # 入库分类
+
 
-    BASE_URL = "https://www.pharnexcloud.com/zixun/shiye/qy"
+class PharnexCrawler(BaseCrawler):
+    """药渡云爬虫 - 支持微信原文提取、多栏目并发爬取"""
+
+    SITE_URL = "https://www.pharnexcloud.com"
+    DEFAULT_CATEGORY = "前沿研究"
+    DEFAULT_SECTION = PharnexSection("/zixun/shiye/qy", DEFAULT_CATEGORY)
+    PAGE_SETTLE_SECONDS = 2  # 页面加载后等待动态内容的时间
+
+    def __init__(
+        self,
+        headless: bool = True,
+        page_archive=None,
+        sections: Optional[List[PharnexSection]] = None,
+        replay=None,
+        max_pages: Optional[int] = None
+    ):
+        """
+        参数:
+            headless: 是否无头模式
+            page_archive: 可选的页面归档器
+            sections: 要爬取的栏目（默认取 settings.PHARNEX_SECTIONS）
+            replay: 可选的录制/回放路由
+            max_pages: 同时打开的标签页数（默认取 settings.PHARNEX_MAX_PAGES）
+        """
+        super().__init__(headless=headless, page_archive=page_archive, replay=replay)
+        self.sections = sections or [
+            PharnexSection(path, category) for path, category in settings.pharnex_sections.items()
+        ] or [self.DEFAULT_SECTION]
+
+        # 共享浏览器：start() 后所有列表页/详情页都在同一个浏览器中开标签页
+        self._playwright = None
+        self._browser = None
+        self._page_slots = asyncio.Semaphore(max_pages or settings.PHARNEX_MAX_PAGES)
+        self.browser_launches = 0
+        self.settle_seconds = self.PAGE_SETTLE_SECONDS
 
     def get_source_name(self) -> str:
         """数据源名称"""
@@ -32,42 +73,137 @@ class PharnexCrawler(BaseCrawler):
         """支持微信原文提取"""
         return True
 
-    async def crawl_list_page(self, page_num: int = 1) -> List[Dict]:
-        """爬取文章列表页"""
-        url = f"{self.BASE_URL}?page={page_num}"
+    async def start(self):
+        """启动共享浏览器（未启动时每次请求单独启动浏览器）"""
+        if self._browser is None:
+            self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=self.headless)
+            self.browser_launches += 1
+
+    async def close(self):
+        """关闭共享浏览器"""
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    @asynccontextmanager
+    async def _new_page(self):
+        """打开一个标签页（同时打开的标签页数受 PHARNEX_MAX_PAGES 限制）"""
+        async with self._page_slots:
+            if self._browser is not None:
+                page = await self._browser.new_page()
+                try:
+                    await self.prepare_page(page)
+                    yield page
+                finally:
+                    await page.close()
+                return
+
+            async with async_playwright() as p:
+                browser = await p.chromium.launch(headless=self.headless)
+                self.browser_launches += 1
+                try:
+                    page = await browser.new_page()
+                    await self.prepare_page(page)
+                    yield page
+                finally:
+                    await browser.close()
+
+    async def _fetch_html(self, url: str) -> str:
+        """加载页面并返回HTML"""
+        async with self._new_page() as page:
+            await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+            await asyncio.sleep(self.settle_seconds)
+            return await page.content()
+
+    async def crawl_list_page(self, page_num: int = 1, section: Optional[PharnexSection] = None) -> List[Dict]:
+        """爬取文章列表页（默认第一个栏目）"""
+        section = section or self.sections[0]
+        url = f"{self.SITE_URL}{section.path}?page={page_num}"
         articles = []
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=self.headless)
-            page = await browser.new_page()
+        try:
+            html = await self._fetch_html(url)
+            await self.archive_page(url, "pharnex_list", html)
+            articles = self.parse_list_html(html, section.category)
 
-            try:
-                await page.goto(url, wait_until="domcontentloaded", timeout=30000)
-                await asyncio.sleep(2)
+        except TimeoutError:
+            logger.warning(f"[Crawler] 页面加载超时 {section.path} {page_num}")
+        except Exception as e:
+            logger.error(f"[Crawler] 爬取页面出错 {section.path} {page_num}: {e}")
 
-                html = await page.content()
-                soup = BeautifulSoup(html, 'lxml')
+        return articles
 
-                article_items = soup.select("li.report-item")
+    async def crawl_multiple_pages(
+        self,
+        num_pages: int = 10,
+        max_articles: Optional[int] = None,
+        from_date: Optional[datetime] = None,
+        to_date: Optional[datetime] = None
+    ) -> List[Dict]:
+        """
+        并发爬取所有栏目（共享一个浏览器），按URL跨栏目去重
 
-                for item in article_items:
-                    try:
-                        article = self._parse_article_item(item)
-                        if article:
-                            articles.append(article)
-                    except Exception as e:
-                        logger.error(f"[Crawler] 解析文章失败: {e}")
+        同一篇文章出现在多个栏目时保留第一个栏目的分类，其余栏目的分类加入标签。
+        num_pages 和 max_articles 为每个栏目的限制，max_articles 同时限制合并后的总数。
+        """
+        owns_browser = self._browser is None
+        await self.start()
+        try:
+            results = await asyncio.gather(*(
+                self._crawl_pages(
+                    lambda page_num, section=section: self.crawl_list_page(page_num, section),
+                    num_pages,
+                    max_articles,
+                    from_date,
+                    to_date,
+                    label=f"[{section.category}] "
+                )
+                for section in self.sections
+            ))
+        finally:
+            if owns_browser:
+                await self.close()
+
+        merged: Dict[str, Dict] = {}
+        for articles in results:
+            for article in articles:
+                existing = merged.get(article["url"])
+                if existing is None:
+                    merged[article["url"]] = article
+                elif article["category"] != existing["category"] and article["category"] not in existing["tags"]:
+                    existing["tags"].append(article["category"])
+
+        all_articles = sorted(merged.values(), key=lambda a: a["published_at"], reverse=True)
+        if max_articles:
+            all_articles = all_articles[:max_articles]
+
+        if len(self.sections) > 1:
+            total = sum(len(articles) for articles in results)
+            logger.info(
+                f"[Crawler] {len(self.sections)} 个栏目共 {total} 篇，去重后 {len(all_articles)} 篇"
+            )
+        return all_articles
+
+    def parse_list_html(self, html: str, category: str = DEFAULT_CATEGORY) -> List[Dict]:
+        """解析列表页HTML（不依赖浏览器，可用于离线重新解析）"""
+        articles = []
+        soup = BeautifulSoup(html, 'lxml')
 
-            except TimeoutError:
-                logger.warning(f"[Crawler] 页面加载超时 {page_num}")
+        for item in soup.select("li.report-item"):
+            try:
+                article = self._parse_article_item(item, category)
+                if article:
+                    articles.append(article)
             except Exception as e:
-                logger.error(f"[Crawler] 爬取页面出错 {page_num}: {e}")
-            finally:
-                await browser.close()
+                logger.error(f"[Crawler] 解析文章失败: {e}")
 
         return articles
 
-    def _parse_article_item(self, item) -> Optional[Dict]:
+    def _parse_article_item(self, item, category: str = DEFAULT_CATEGORY) -> Optional[Dict]:
         """解析单个文章项"""
         try:
             # 标题和链接 - 新结构：div.title > a.no-redirect
@@ -78,7 +214,7 @@ class PharnexCrawler(BaseCrawler):
             title = title_elem.get_text(strip=True)
             url = title_elem.get("href")
             if url and not url.startswith("http"):
-                url = f"https://www.pharnexcloud.com{url}"
+                url = f"{self.SITE_URL}{url}"
 
             # 摘要 - 新结构：div.desc
             summary_elem = item.select_one("div.desc")
@@ -103,7 +239,7 @@ class PharnexCrawler(BaseCrawler):
                 "url": url,
                 "published_at": published_at,
                 "author": author,
-                "category": "前沿研究",
+                "category": category,
                 "summary": summary,
                 "tags": []
             }
@@ -129,34 +265,36 @@ class PharnexCrawler(BaseCrawler):
         爬取详情页
 
         返回: (content_html, content_text, wechat_url)
+
+        页面加载失败时抛出异常（由调用方记录失败并重试，不当作没有内容）
         """
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=self.headless)
-            page = await browser.new_page()
+        try:
+            html = await self._fetch_html(url)
+        except Exception as e:
+            logger.error(f"[Crawler] 爬取详情页出错: {e}")
+            raise
 
-            try:
-                await page.goto(url, wait_until="domcontentloaded", timeout=30000)
-                await asyncio.sleep(2)
+        await self.archive_page(url, "pharnex_detail", html)
+        return self.parse_detail_html(html)
 
-                html = await page.content()
-                soup = BeautifulSoup(html, 'lxml')
+    def parse_detail_html(self, html: str) -> tuple[str, str, Optional[str]]:
+        """
+        解析详情页HTML（不依赖浏览器，可用于离线重新解析）
 
-                # 提取正文内容
-                content_div = soup.select_one("div.article-content, div.content, article")
-                content_html = str(content_div) if content_div else ""
-                content_text = content_div.get_text(separator="\n", strip=True) if content_div else ""
+        返回: (content_html, content_text, wechat_url)
+        """
+        soup = BeautifulSoup(html, 'lxml')
 
-                # 提取微信原文链接
-                wechat_url = None
-                wechat_link = soup.select_one('a[href*="mp.weixin.qq.com"]')
-                if wechat_link:
-                    wechat_url = wechat_link.get('href')
-                    logger.info(f"[Crawler] 发现微信原文: {wechat_url}")
+        # 提取正文内容
+        content_div = soup.select_one("div.article-content, div.content, article")
+        content_html = str(content_div) if content_div else ""
+        content_text = content_div.get_text(separator="\n", strip=True) if content_div else ""
 
-                await browser.close()
-                return content_html, content_text, wechat_url
+        # 提取微信原文链接
+        wechat_url = None
+        wechat_link = soup.select_one('a[href*="mp.weixin.qq.com"]')
+        if wechat_link:
+            wechat_url = wechat_link.get('href')
+            logger.info(f"[Crawler] 发现微信原文: {wechat_url}")
 
-            except Exception as e:
-                logger.error(f"[Crawler] 爬取详情页出错: {e}")
-                await browser.close()
-                return "", "", None
+        return content_html, content_text, wechat_url
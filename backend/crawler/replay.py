@@ -0,0 +1,183 @@
+"""
+录制/回放 - 通过浏览器路由拦截录制真实响应，离线回放给爬虫
+
+录制模式下请求照常发往站点，响应（状态码、响应头、解码后的正文）写入
+fixture 目录；回放模式下所有请求由 fixture 直接应答，未录制的请求被中止，
+不会访问真实站点。用于离线测试和基准测试爬虫（scripts/benchmark_crawlers.py）。
+
+fixture 目录格式:
+    index.jsonl            每行一条响应元数据（同一请求多次录制时以最后一条为准）
+    bodies/<sha1>.gz       gzip压缩的响应正文（按内容寻址，相同正文只存一份）
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import urldefrag
+
+logger = logging.getLogger(__name__)
+
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+
+# 爬虫只需要HTML和脚本，图片/字体/媒体在两种模式下都直接中止
+DEFAULT_BLOCKED_RESOURCES = frozenset({"image", "media", "font"})
+
+# 正文已解码，回放时不能带这些响应头
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+def _request_key(method: str, url: str) -> Tuple[str, str]:
+    return method.upper(), urldefrag(url)[0]
+
+
+@dataclass
+class ReplayStats:
+    """路由统计"""
+    requests: int = 0
+    documents: int = 0  # 文档请求数（即页面数）
+    hits: int = 0
+    misses: int = 0
+    blocked: int = 0
+    bytes: int = 0  # 录制或回放的正文字节数
+    missed_urls: list = field(default_factory=list)
+
+    def as_dict(self) -> Dict:
+        return {
+            "requests": self.requests,
+            "documents": self.documents,
+            "hits": self.hits,
+            "misses": self.misses,
+            "blocked": self.blocked,
+            "bytes": self.bytes,
+        }
+
+
+class FixtureStore:
+    """fixture 目录读写"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.index_path = self.path / "index.jsonl"
+        self.bodies_dir = self.path / "bodies"
+        self.entries: Dict[Tuple[str, str], Dict] = {}
+
+    def load(self) -> "FixtureStore":
+        """读取索引（不存在时为空）"""
+        self.entries = {}
+        if self.index_path.exists():
+            with open(self.index_path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.entries[_request_key(entry["method"], entry["url"])] = entry
+        return self
+
+    def get(self, method: str, url: str) -> Optional[Dict]:
+        return self.entries.get(_request_key(method, url))
+
+    def read_body(self, entry: Dict) -> bytes:
+        with gzip.open(self.bodies_dir / f"{entry['body']}.gz", "rb") as f:
+            return f.read()
+
+    def save(self, method: str, url: str, resource_type: str, status: int, headers: Dict, body: bytes) -> Dict:
+        """写入一条响应（追加索引，正文按内容去重）"""
+        self.bodies_dir.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha1(body).hexdigest()
+        body_path = self.bodies_dir / f"{digest}.gz"
+        if not body_path.exists():
+            with gzip.open(body_path, "wb") as f:
+                f.write(body)
+
+        entry = {
+            "method": method.upper(),
+            "url": urldefrag(url)[0],
+            "resource_type": resource_type,
+            "status": status,
+            "headers": {k: v for k, v in headers.items() if k.lower() not in _DROPPED_HEADERS},
+            "body": digest,
+            "size": len(body),
+        }
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self.entries[_request_key(method, url)] = entry
+        return entry
+
+
+class ReplayRouter:
+    """
+    浏览器路由拦截器
+
+    参数:
+        fixture_dir: fixture 目录
+        mode: record（访问站点并录制）或 replay（只从 fixture 应答）
+        blocked_resources: 直接中止的资源类型
+    """
+
+    def __init__(self, fixture_dir, mode: str = MODE_REPLAY, blocked_resources=DEFAULT_BLOCKED_RESOURCES):
+        if mode not in (MODE_RECORD, MODE_REPLAY):
+            raise ValueError(f"无效的模式: {mode}")
+        self.mode = mode
+        self.store = FixtureStore(fixture_dir).load()
+        self.blocked_resources = frozenset(blocked_resources)
+        self.stats = ReplayStats()
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == MODE_REPLAY
+
+    async def attach(self, target):
+        """在页面或浏览器上下文上启用拦截（新标签页打开后、访问前调用）"""
+        await target.route("**/*", self._handle)
+
+    async def _handle(self, route):
+        request = route.request
+        self.stats.requests += 1
+
+        if request.resource_type in self.blocked_resources:
+            self.stats.blocked += 1
+            await route.abort()
+            return
+
+        if self.mode == MODE_RECORD:
+            await self._record(route)
+        else:
+            await self._replay(route)
+
+    async def _record(self, route):
+        request = route.request
+        try:
+            response = await route.fetch()
+            body = await response.body()
+        except Exception as e:
+            logger.warning(f"[Replay] 录制失败 {request.url}: {e}")
+            await route.abort()
+            return
+
+        self.store.save(request.method, request.url, request.resource_type, response.status, response.headers, body)
+        self._count(request.resource_type, body)
+        await route.fulfill(response=response, body=body)
+
+    async def _replay(self, route):
+        request = route.request
+        entry = self.store.get(request.method, request.url)
+        if entry is None:
+            self.stats.misses += 1
+            self.stats.missed_urls.append(request.url)
+            logger.debug(f"[Replay] 未录制的请求 {request.method} {request.url}")
+            await route.abort()
+            return
+
+        body = self.store.read_body(entry)
+        self.stats.hits += 1
+        self._count(request.resource_type, body)
+        await route.fulfill(status=entry["status"], headers=entry["headers"], body=body)
+
+    def _count(self, resource_type: str, body: bytes):
+        self.stats.bytes += len(body)
+        if resource_type == "document":
+            self.stats.documents += 1
@@ -44,10 +44,18 @@ class WechatArticleCrawler:
     - 支持缓存机制
     """
 
-    def __init__(self, headless: bool = True, rate_limit_delay: int = 10):
-        """初始化微信爬虫"""
+    def __init__(self, headless: bool = True, rate_limit_delay: int = 10, page_archive=None, replay=None):
+        """
+        初始化微信爬虫
+
+        page_archive: 可选的页面归档器，抓取到的原始HTML会写入归档
+        replay: 可选的录制/回放路由；回放时跳过模拟阅读、随机延迟和浏览器状态读写
+        """
         self.headless = headless
         self.rate_limit_delay = rate_limit_delay
+        self.page_archive = page_archive
+        self.replay = replay
+        self.browser_launches = 0
 
         # 浏览器状态持久化文件（保存验证后的Cookie）
         from pathlib import Path
@@ -100,14 +108,18 @@ class WechatArticleCrawler:
         import random
         async with async_playwright() as p:
             browser = await p.chromium.launch(headless=self.headless)
+            self.browser_launches += 1
+            replaying = self.replay is not None and self.replay.replaying
 
             # 尝试加载已保存的浏览器状态（复用验证后的Cookie）
-            if self.state_file.exists():
+            if self.state_file.exists() and not replaying:
                 print("📦 加载已保存的浏览器状态...")
                 context = await browser.new_context(storage_state=str(self.state_file))
             else:
                 context = await browser.new_context()
 
+            if self.replay is not None:
+                await self.replay.attach(context)
             page = await context.new_page()
 
             try:
@@ -122,21 +134,29 @@ class WechatArticleCrawler:
                 await page.goto(url, wait_until="domcontentloaded", timeout=60000)
 
                 # 模拟人类阅读行为（降低检测风险）
-                await self._simulate_human_behavior(page)
+                if not replaying:
+                    await self._simulate_human_behavior(page)
 
                 # 等待文章内容区域加载
                 await page.wait_for_selector('#js_content', timeout=20000)
 
                 # 获取并解析HTML
                 html = await page.content()
-                soup = BeautifulSoup(html, 'lxml')
+                if self.page_archive is not None:
+                    try:
+                        await self.page_archive.add(url, "wechat_article", html)
+                    except Exception as e:
+                        print(f"⚠️  页面归档失败: {e}")
 
                 # 解析文章信息
-                article = self._parse_article_page(soup, url)
+                article = self.parse_article_html(html, url)
 
                 if article:
                     print(f"✅ 成功爬取: {article['title']}")
 
+                    if replaying:
+                        return article
+
                     # 保存浏览器状态（下次复用）
                     await context.storage_state(path=str(self.state_file))
 
@@ -180,6 +200,10 @@ class WechatArticleCrawler:
         # 停留3-5秒
         await asyncio.sleep(random.uniform(3, 5))
 
+    def parse_article_html(self, html: str, url: str) -> Optional[Dict]:
+        """解析文章页面HTML（不依赖浏览器，可用于离线重新解析）"""
+        return self._parse_article_page(BeautifulSoup(html, 'lxml'), url)
+
     def _parse_article_page(self, soup: BeautifulSoup, url: str) -> Optional[Dict]:
         """
         解析微信文章页面HTML
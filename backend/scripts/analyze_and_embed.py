@@ -1,4 +1,8 @@
-"""AI analysis and embedding generation for articles"""
+"""AI analysis and embedding generation for articles
+
+Processes new articles and articles whose content changed since they were
+processed (stale AI outputs / stale chunks, see article_version_service).
+"""
 
 import asyncio
 import sys
@@ -7,11 +11,14 @@ from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent))
 
-from sqlalchemy import select
+from sqlalchemy import select, or_
+from sqlalchemy.orm import undefer_group
 from openai import AsyncOpenAI
 from app.database import get_db_context
-from app.models import Article, ArticleAIOutput, ArticleChunk
+from app.models import Article, ArticleAIOutput, ArticleChunk, CONTENT_GROUP
+from app.services.cache_service import article_cache
 from app.utils.text_splitter import split_text
+from app.utils import timezone as tz
 from app.config import settings
 
 client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
@@ -72,49 +79,83 @@ async def generate_embedding(text: str) -> list:
     return response.data[0].embedding
 
 
-async def process_article(article: Article, db):
-    """Process single article: AI analysis + embedding"""
-    try:
-        print(f"\n🤖 Processing: {article.title}")
+async def analyze_and_store(article: Article, db):
+    """Run AI analysis for article and add the output to the session (caller commits)"""
+    ai_result = await analyze_article(article)
 
-        # AI analysis
-        ai_result = await analyze_article(article)
+    ai_output = ArticleAIOutput(
+        article_id=article.id,
+        version_no=article.version_no,
+        summary=ai_result.get("summary", ""),
+        key_points=ai_result.get("key_points", []),
+        entities=ai_result.get("entities", {}),
+        model_name="gpt-4"
+    )
+    db.add(ai_output)
+    # AI analysis is part of the article detail; bump updated_at so its ETag changes
+    article.updated_at = tz.now()
+    await db.flush()
+
+
+async def embed_and_store(article: Article, db):
+    """
+    Split article into chunks and add their embeddings to the session (caller commits)
+
+    Existing chunks (stale after an article update) are replaced; chunks whose
+    text is unchanged reuse the stored embedding instead of being embedded again.
+    """
+    result = await db.execute(select(ArticleChunk).where(ArticleChunk.article_id == article.id))
+    existing = result.scalars().all()
+    reusable = {c.chunk_text: c.embedding for c in existing if c.embedding is not None}
+
+    chunks = split_text(article.content_text, chunk_size=300, overlap=50)
+    print(f"  ✂️  Split into {len(chunks)} chunks")
+
+    reused = 0
+    for idx, chunk_text in enumerate(chunks):
+        embedding = reusable.get(chunk_text)
+        if embedding is None:
+            print(f"  📊 Embedding chunk {idx+1}/{len(chunks)}")
+            embedding = await generate_embedding(chunk_text)
+        else:
+            reused += 1
 
-        ai_output = ArticleAIOutput(
+        chunk = ArticleChunk(
             article_id=article.id,
-            version_no=article.version_no,
-            summary=ai_result.get("summary", ""),
-            key_points=ai_result.get("key_points", []),
-            entities=ai_result.get("entities", {}),
-            model_name="gpt-4"
+            chunk_index=idx,
+            chunk_text=chunk_text,
+            embedding=embedding,
+            chunk_metadata={
+                "title": article.title,
+                "published_at": str(article.published_at),
+                "category": article.category,
+                "tags": article.tags or []
+            }
         )
-        db.add(ai_output)
-        await db.flush()
+        db.add(chunk)
 
-        # Text splitting
-        chunks = split_text(article.content_text, chunk_size=300, overlap=50)
-        print(f"  ✂️  Split into {len(chunks)} chunks")
+    for chunk in existing:
+        await db.delete(chunk)
+    if reused:
+        print(f"  ♻️  Reused {reused}/{len(chunks)} unchanged chunk embeddings")
 
-        # Generate embeddings
-        for idx, chunk_text in enumerate(chunks):
-            print(f"  📊 Embedding chunk {idx+1}/{len(chunks)}")
-            embedding = await generate_embedding(chunk_text)
 
-            chunk = ArticleChunk(
-                article_id=article.id,
-                chunk_index=idx,
-                chunk_text=chunk_text,
-                embedding=embedding,
-                chunk_metadata={
-                    "title": article.title,
-                    "published_at": str(article.published_at),
-                    "category": article.category,
-                    "tags": article.tags or []
-                }
-            )
-            db.add(chunk)
+async def process_article(article: Article, db, analyze: bool = True, embed: bool = True):
+    """Process single article: AI analysis + embedding (only the parts that are missing or stale)"""
+    try:
+        print(f"\n🤖 Processing: {article.title} (v{article.version_no})")
+
+        # AI analysis
+        if analyze:
+            await analyze_and_store(article, db)
+
+        # Text splitting + embeddings
+        if embed:
+            await embed_and_store(article, db)
 
         await db.commit()
+        if analyze:
+            await article_cache.invalidate_article(article.id, lists=False)
         print(f"  ✅ Completed")
 
     except Exception as e:
@@ -127,21 +168,38 @@ async def main():
     print("🚀 Starting AI analysis and embedding...")
 
     async with get_db_context() as db:
-        # Find articles without AI analysis
-        subq = select(ArticleAIOutput.article_id)
+        # Find articles without up-to-date AI analysis, or with chunks from an older version
+        analyzed = select(ArticleAIOutput.article_id).where(ArticleAIOutput.is_stale == False)
+        stale_chunks = select(ArticleChunk.article_id).where(ArticleChunk.is_stale == True)
         result = await db.execute(
             select(Article)
-            .where(~Article.id.in_(subq))
+            .where(or_(~Article.id.in_(analyzed), Article.id.in_(stale_chunks)))
+            .options(undefer_group(CONTENT_GROUP))
             .limit(100)
         )
         articles = result.scalars().all()
+        article_ids = [a.id for a in articles]
+
+        analyzed_result = await db.execute(analyzed.where(ArticleAIOutput.article_id.in_(article_ids)))
+        analyzed_ids = set(analyzed_result.scalars().all())
+        embedded_result = await db.execute(
+            select(ArticleChunk.article_id)
+            .where(ArticleChunk.article_id.in_(article_ids), ArticleChunk.is_stale == False)
+        )
+        embedded_ids = set(embedded_result.scalars().all())
 
         print(f"📚 Found {len(articles)} articles to process")
 
         for article in articles:
-            await process_article(article, db)
+            await process_article(
+                article,
+                db,
+                analyze=article.id not in analyzed_ids,
+                embed=article.id not in embedded_ids
+            )
             await asyncio.sleep(1)  # Rate limiting
 
+    await article_cache.close()
     print("\n🎉 AI analysis and embedding completed!")
 
 
@@ -0,0 +1,79 @@
+"""回填任务：为已入库文章计算SimHash指纹，并报告库中已有的近似重复文章
+
+只建立索引，不删除或合并文章；报告中的重复对需要人工确认后在后台处理。
+
+用法:
+    python scripts/backfill_fingerprints.py
+    python scripts/backfill_fingerprints.py --batch-size 500
+"""
+
+import asyncio
+import sys
+import argparse
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import select
+from app.database import get_db_context
+from app.models import Article, ArticleFingerprint
+from app.services.dedup_service import near_duplicate_index
+
+
+async def backfill(batch_size: int):
+    """按ID分批为缺少指纹的未删除文章建立索引"""
+    indexed = skipped = 0
+    pairs = []
+    last_id = 0
+
+    async with get_db_context() as db:
+        while True:
+            result = await db.execute(
+                select(Article.id, Article.title, Article.content_text)
+                .outerjoin(ArticleFingerprint, ArticleFingerprint.article_id == Article.id)
+                .where(
+                    Article.id > last_id,
+                    Article.is_deleted == False,
+                    ArticleFingerprint.article_id.is_(None)
+                )
+                .order_by(Article.id)
+                .limit(batch_size)
+            )
+            rows = result.all()
+            if not rows:
+                break
+
+            for article_id, title, content_text in rows:
+                fingerprint = near_duplicate_index.fingerprint(content_text or "")
+                if fingerprint is None:
+                    skipped += 1
+                    continue
+
+                # 与已建立索引的文章比较（按ID顺序，较早的文章作为簇代表）
+                match = await near_duplicate_index.find(db, fingerprint)
+                if match:
+                    pairs.append((article_id, title, *match))
+
+                await near_duplicate_index.add(db, article_id, fingerprint)
+                # 同一批内的后续文章也要能查到
+                await db.flush()
+                indexed += 1
+
+            last_id = rows[-1][0]
+            await db.commit()
+            print(f"  ✅ 已处理至 ID {last_id}，累计建立 {indexed} 条指纹")
+
+    print(f"\n🎉 完成！建立 {indexed} 条指纹，{skipped} 篇正文过短未建立")
+    if pairs:
+        print(f"\n🔁 发现 {len(pairs)} 篇近似重复文章:")
+        for article_id, title, cluster_article_id, distance in pairs:
+            print(f"  - 文章 {article_id}「{title}」≈ 文章 {cluster_article_id}（距离 {distance}）")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="回填文章SimHash指纹")
+    parser.add_argument("--batch-size", type=int, default=200, help="每批处理文章数 (默认: 200)")
+
+    args = parser.parse_args()
+
+    asyncio.run(backfill(args.batch_size))
@@ -0,0 +1,100 @@
+"""回填任务：对已入库文章的HTML执行精简（sanitize_html），并输出体积缩减报告
+
+用法:
+    python scripts/backfill_sanitize_html.py --dry-run      # 只统计，不写库
+    python scripts/backfill_sanitize_html.py --batch-size 200
+"""
+
+import asyncio
+import sys
+import argparse
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import select
+from sqlalchemy.orm import undefer_group
+from app.database import get_db_context
+from app.models import Article, CONTENT_GROUP
+from app.services.cache_service import article_cache
+from app.utils.html_sanitizer import sanitize_html
+
+# 需要精简的HTML字段
+HTML_FIELDS = ["content_html", "translated_content_html"]
+
+
+def _size(value: str) -> int:
+    """UTF-8 字节数"""
+    return len(value.encode("utf-8")) if value else 0
+
+
+async def backfill(batch_size: int, dry_run: bool):
+    """按ID分批处理所有文章（包括已软删除的）"""
+    report = {field: {"rows": 0, "before": 0, "after": 0} for field in HTML_FIELDS}
+    updated_articles = 0
+    last_id = 0
+
+    async with get_db_context() as db:
+        while True:
+            result = await db.execute(
+                select(Article)
+                .where(Article.id > last_id)
+                .options(undefer_group(CONTENT_GROUP))
+                .order_by(Article.id)
+                .limit(batch_size)
+            )
+            articles = result.scalars().all()
+            if not articles:
+                break
+            updated_ids = []
+
+            for article in articles:
+                changed = False
+                for field in HTML_FIELDS:
+                    original = getattr(article, field)
+                    if not original:
+                        continue
+
+                    sanitized = sanitize_html(original)
+                    stats = report[field]
+                    stats["rows"] += 1
+                    stats["before"] += _size(original)
+                    stats["after"] += _size(sanitized)
+
+                    if sanitized != original:
+                        changed = True
+                        if not dry_run:
+                            setattr(article, field, sanitized)
+
+                if changed:
+                    updated_articles += 1
+                    updated_ids.append(article.id)
+
+            last_id = articles[-1].id
+
+            if not dry_run:
+                await db.commit()
+                await article_cache.invalidate_articles(updated_ids, lists=False)
+            # 释放已处理的对象，避免大字段常驻内存
+            db.expunge_all()
+
+            print(f"  ✅ 已处理至 ID {last_id}，累计变更 {updated_articles} 篇")
+
+    print("\n📊 体积缩减报告" + ("（dry-run，未写库）" if dry_run else ""))
+    print(f"{'字段':<26}{'行数':>8}{'原始 (KB)':>14}{'精简后 (KB)':>14}{'缩减':>10}")
+    for field, stats in report.items():
+        before, after = stats["before"], stats["after"]
+        ratio = (1 - after / before) * 100 if before else 0
+        print(f"{field:<26}{stats['rows']:>8}{before / 1024:>14.1f}{after / 1024:>14.1f}{ratio:>9.1f}%")
+    print(f"\n🎉 完成！共 {updated_articles} 篇文章{'可' if dry_run else '已'}精简")
+    await article_cache.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="回填精简文章HTML")
+    parser.add_argument("--batch-size", type=int, default=100, help="每批处理文章数 (默认: 100)")
+    parser.add_argument("--dry-run", action="store_true", help="只输出报告，不写数据库")
+
+    args = parser.parse_args()
+
+    asyncio.run(backfill(args.batch_size, args.dry_run))
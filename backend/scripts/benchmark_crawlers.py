@@ -0,0 +1,213 @@
+"""爬虫基准测试：录制真实站点响应，离线回放并对比不同爬虫配置
+
+用法:
+    # 访问药渡云和微信，录制列表页/详情页/微信原文到 fixture 目录
+    python scripts/benchmark_crawlers.py record --fixtures cache/crawler_fixtures --pages 2 --details 20 --wechat 5
+
+    # 离线回放（不访问任何站点），对比共享浏览器与每次请求单独启动浏览器、不同标签页并发数
+    python scripts/benchmark_crawlers.py run --fixtures cache/crawler_fixtures --pages 2 --details 20
+    python scripts/benchmark_crawlers.py run --configs shared:1,shared:4,shared:8 --repeat 3
+
+每种配置输出页面数、耗时、页面/秒、浏览器启动次数、回放字节数、解析耗时和未录制请求数。
+未录制的请求在回放时会被中止，录制与回放使用相同的 --pages/--details 才能完整命中。
+"""
+
+import argparse
+import asyncio
+import functools
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from crawler.pharnex_crawler import PharnexCrawler
+from crawler.wechat_crawler import WechatArticleCrawler
+from crawler.replay import ReplayRouter, MODE_RECORD, MODE_REPLAY
+
+DEFAULT_FIXTURES = Path(__file__).parent.parent / "cache" / "crawler_fixtures"
+DEFAULT_CONFIGS = "per-request:4,shared:1,shared:4,shared:8"
+
+
+def _timed(func, timings: Dict, key: str):
+    """包装解析函数，累计耗时"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timings[key] = timings.get(key, 0.0) + time.perf_counter() - started
+    return wrapper
+
+
+async def crawl_pharnex(crawler: PharnexCrawler, pages: int, details: int, shared: bool) -> List[str]:
+    """
+    固定工作量：每个栏目的前 pages 个列表页 + 前 details 篇文章的详情页
+
+    Returns:
+        详情页中发现的微信原文链接
+    """
+    if shared:
+        await crawler.start()
+    try:
+        results = await asyncio.gather(*(
+            crawler.crawl_list_page(page_num, section)
+            for section in crawler.sections
+            for page_num in range(1, pages + 1)
+        ))
+        urls = list(dict.fromkeys(article["url"] for articles in results for article in articles))
+        detail_results = await asyncio.gather(*(
+            crawler.crawl_detail_page(url) for url in urls[:details]
+        ), return_exceptions=True)
+    finally:
+        await crawler.close()
+
+    # 加载失败的详情页（异常）不影响其他页面
+    return [
+        result[2] for result in detail_results
+        if not isinstance(result, BaseException) and result[2]
+    ]
+
+
+async def record(fixtures: Path, pages: int, details: int, wechat: int, headless: bool):
+    """访问真实站点并录制响应"""
+    router = ReplayRouter(fixtures, mode=MODE_RECORD)
+    crawler = PharnexCrawler(headless=headless, replay=router)
+
+    print(f"🎬 录制药渡云: {len(crawler.sections)} 个栏目 × {pages} 页，详情页 {details} 篇")
+    wechat_urls = await crawl_pharnex(crawler, pages, details, shared=True)
+
+    if wechat and wechat_urls:
+        print(f"🎬 录制微信原文: {min(wechat, len(wechat_urls))} 篇")
+        wechat_crawler = WechatArticleCrawler(headless=headless, replay=router)
+        for url in wechat_urls[:wechat]:
+            await wechat_crawler.crawl_article(url, use_cache=False)
+
+    stats = router.stats
+    print(f"\n✅ 录制完成: {fixtures}")
+    print(f"  页面: {stats.documents}  请求: {stats.requests}  拦截: {stats.blocked}")
+    print(f"  正文: {stats.bytes / 1024 / 1024:.2f} MB，索引 {len(router.store.entries)} 条")
+
+
+def _parse_configs(value: str) -> List[Dict]:
+    """解析 "shared:4,per-request:4" 为配置列表"""
+    configs = []
+    for item in value.split(","):
+        mode, _, max_pages = item.strip().partition(":")
+        if mode not in ("shared", "per-request"):
+            raise ValueError(f"无效的配置: {item}（应为 shared:N 或 per-request:N）")
+        configs.append({"name": item.strip(), "shared": mode == "shared", "max_pages": int(max_pages or 4)})
+    return configs
+
+
+async def _run_pharnex(fixtures: Path, config: Dict, pages: int, details: int, settle: float) -> Dict:
+    router = ReplayRouter(fixtures, mode=MODE_REPLAY)
+    crawler = PharnexCrawler(replay=router, max_pages=config["max_pages"])
+    crawler.settle_seconds = settle
+
+    timings = {}
+    crawler.parse_list_html = _timed(crawler.parse_list_html, timings, "parse")
+    crawler.parse_detail_html = _timed(crawler.parse_detail_html, timings, "parse")
+
+    started = time.perf_counter()
+    await crawl_pharnex(crawler, pages, details, config["shared"])
+    elapsed = time.perf_counter() - started
+
+    return {
+        "name": f"pharnex {config['name']}",
+        "seconds": elapsed,
+        "launches": crawler.browser_launches,
+        "parse_seconds": timings.get("parse", 0.0),
+        **router.stats.as_dict(),
+    }
+
+
+async def _run_wechat(fixtures: Path) -> Dict:
+    router = ReplayRouter(fixtures, mode=MODE_REPLAY)
+    urls = [
+        entry["url"] for entry in router.store.entries.values()
+        if entry["resource_type"] == "document" and entry["url"].startswith("https://mp.weixin.qq.com/s")
+    ]
+    crawler = WechatArticleCrawler(replay=router)
+
+    timings = {}
+    crawler.parse_article_html = _timed(crawler.parse_article_html, timings, "parse")
+
+    started = time.perf_counter()
+    for url in urls:
+        await crawler.crawl_article(url, use_cache=False)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "name": "wechat",
+        "seconds": elapsed,
+        "launches": crawler.browser_launches,
+        "parse_seconds": timings.get("parse", 0.0),
+        **router.stats.as_dict(),
+    }
+
+
+def _print_row(result: Dict):
+    rate = result["documents"] / result["seconds"] if result["seconds"] else 0.0
+    print(
+        f"{result['name']:<24}{result['documents']:>7}{result['seconds']:>9.2f}{rate:>9.2f}"
+        f"{result['launches']:>10}{result['bytes'] / 1024 / 1024:>9.2f}"
+        f"{result['parse_seconds']:>9.3f}{result['misses']:>8}"
+    )
+
+
+async def run(fixtures: Path, configs: List[Dict], pages: int, details: int, settle: float, repeat: int, wechat: bool):
+    """回放 fixture 并输出每种配置的指标"""
+    if not (fixtures / "index.jsonl").exists():
+        print(f"❌ fixture 不存在: {fixtures}（先运行 record）")
+        return
+
+    print(f"📂 fixture: {fixtures}  列表页 {pages} 页/栏目，详情页 {details} 篇，等待 {settle}s/页\n")
+    print(
+        f"{'config':<24}{'pages':>7}{'secs':>9}{'pages/s':>9}"
+        f"{'launches':>10}{'MB':>9}{'parse s':>9}{'misses':>8}"
+    )
+
+    for config in configs:
+        for _ in range(repeat):
+            _print_row(await _run_pharnex(fixtures, config, pages, details, settle))
+
+    if wechat:
+        for _ in range(repeat):
+            _print_row(await _run_wechat(fixtures))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="爬虫录制/回放基准测试")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subparsers.add_parser("record", help="访问真实站点并录制响应")
+    record_parser.add_argument("--fixtures", type=Path, default=DEFAULT_FIXTURES, help="fixture 目录")
+    record_parser.add_argument("--pages", type=int, default=2, help="每个栏目的列表页数 (默认: 2)")
+    record_parser.add_argument("--details", type=int, default=20, help="详情页数 (默认: 20)")
+    record_parser.add_argument("--wechat", type=int, default=5, help="微信原文数 (默认: 5)")
+    record_parser.add_argument("--show-browser", action="store_true", help="显示浏览器窗口")
+
+    run_parser = subparsers.add_parser("run", help="离线回放并对比爬虫配置")
+    run_parser.add_argument("--fixtures", type=Path, default=DEFAULT_FIXTURES, help="fixture 目录")
+    run_parser.add_argument("--pages", type=int, default=2, help="每个栏目的列表页数 (默认: 2)")
+    run_parser.add_argument("--details", type=int, default=20, help="详情页数 (默认: 20)")
+    run_parser.add_argument(
+        "--configs", default=DEFAULT_CONFIGS,
+        help=f"逗号分隔的配置，shared:N 为共享浏览器、per-request:N 为每次请求启动浏览器，N 为标签页并发数 (默认: {DEFAULT_CONFIGS})"
+    )
+    run_parser.add_argument("--settle-seconds", type=float, default=0.0, help="页面加载后的等待时间 (默认: 0)")
+    run_parser.add_argument("--repeat", type=int, default=1, help="每种配置重复次数 (默认: 1)")
+    run_parser.add_argument("--no-wechat", action="store_true", help="不回放微信原文")
+
+    args = parser.parse_args()
+
+    if args.command == "record":
+        asyncio.run(record(args.fixtures, args.pages, args.details, args.wechat, not args.show_browser))
+    else:
+        asyncio.run(run(
+            args.fixtures, _parse_configs(args.configs), args.pages, args.details,
+            args.settle_seconds, args.repeat, not args.no_wechat
+        ))
@@ -0,0 +1,156 @@
+"""HTML清理器基准测试：对比 lxml 快速实现与 BeautifulSoup 参考实现
+
+用法:
+    python scripts/benchmark_html_cleaner.py
+    python scripts/benchmark_html_cleaner.py --corpus-dir cache/wechat_articles --repeat 20
+    python scripts/benchmark_html_cleaner.py --fuzz 2000
+
+会先校验两种实现在黄金语料上输出逐字节一致，再输出耗时对比。
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.utils.html_cleaner import clean_html, clean_html_bs4
+
+# 内置黄金语料：覆盖常见结构与边界情况
+GOLDEN_CORPUS = [
+    "",
+    "   ",
+    "plain text without tags",
+    "\ufeff<p>BOM开头</p>",
+    "<p>Hello <b>world</b>!</p>",
+    "<div>  多个   空格  分隔  </div>\n\n\n\n<p>段落</p>",
+    "<p>foo<script>var x = 1;</script>bar</p>",
+    "<html><head><style>p {color: red}</style><title>标题</title></head>"
+    "<body><header>页眉</header><nav>导航</nav><p>正文</p><footer>页脚</footer></body></html>",
+    "<p>a<!-- 注释 -->b</p>",
+    "<!-- 顶层注释 --><p>text</p><!-- 结尾注释 -->",
+    "<ruby>漢<rp>(</rp><rt>kan</rt><rp>)</rp>字</ruby>",
+    "<template><p>模板内容</p></template><p>可见</p>",
+    "<pre>  保留\n  空白  </pre>",
+    "<p>实体 &amp; &lt;tag&gt; &nbsp; &#x4e2d;</p>",
+    "<table><tr><td>单元格1</td><td>单元格2</td></tr></table>",
+    "<p>未闭合<div>嵌套块<p>段落",
+    "<section style=\"margin:0\"><span style=\"color:#333\">微信</span>"
+    "<span><br></span><img data-src=\"x.jpg\"></section>",
+    "<p>line1\r\nline2\rline3 line4</p>",
+    "<?xml version=\"1.0\"?><p>处理指令</p>",
+    "<div class=\"content\"><p>主体</p><script>x</script>尾部</div>",
+]
+
+_TAGS = ["p", "div", "span", "b", "section", "script", "style", "nav", "footer",
+         "header", "rt", "rp", "ruby", "template", "pre", "table", "td", "tr", "li"]
+_TEXTS = ["医药", "新闻", " ", "  ", "\n", "\t", "a  b", "&amp;", "&lt;", "x", "　", "<!-- c -->"]
+
+
+def _random_html(rng: random.Random, depth: int = 0) -> str:
+    """生成随机HTML片段（用于模糊校验）"""
+    parts = []
+    for _ in range(rng.randint(1, 6)):
+        if depth < 5 and rng.random() < 0.5:
+            tag = rng.choice(_TAGS)
+            inner = _random_html(rng, depth + 1)
+            closing = f"</{tag}>" if rng.random() < 0.9 else ""
+            parts.append(f"<{tag}>{inner}{closing}")
+        else:
+            parts.append(rng.choice(_TEXTS))
+    return "".join(parts)
+
+
+def _synthetic_article(paragraphs: int) -> str:
+    """生成与微信 #js_content 结构相近的长文章"""
+    body = "".join(
+        f'<section style="margin:0;padding:0;line-height:1.75"><p style="text-align:justify">'
+        f'<span style="font-size:15px;color:#333;letter-spacing:1px">第{i}段 医药新闻 临床试验 数据</span>'
+        f'<span><br></span></p></section>'
+        for i in range(paragraphs)
+    )
+    return f'<div class="rich_media_content" id="js_content">{body}<script>var x = 1;</script></div>'
+
+
+def load_corpus(corpus_dir: str = None) -> list:
+    """加载语料：内置样本 + 合成长文章 + 目录中的 .html 文件 / 微信缓存 .json 文件"""
+    corpus = list(GOLDEN_CORPUS)
+    corpus.extend(_synthetic_article(n) for n in (50, 200, 1000))
+    if not corpus_dir:
+        return corpus
+
+    for path in sorted(Path(corpus_dir).iterdir()):
+        if path.suffix == ".html":
+            corpus.append(path.read_text(encoding="utf-8"))
+        elif path.suffix == ".json":
+            with open(path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get("content_html"):
+                corpus.append(cached["content_html"])
+    return corpus
+
+
+def verify(corpus: list) -> int:
+    """校验两种实现输出一致，返回不一致的数量"""
+    mismatches = 0
+    for idx, html in enumerate(corpus):
+        expected = clean_html_bs4(html)
+        actual = clean_html(html)
+        if expected != actual:
+            mismatches += 1
+            print(f"❌ 输出不一致 (样本 #{idx}): {html[:80]!r}")
+            print(f"   bs4 : {expected[:120]!r}")
+            print(f"   lxml: {actual[:120]!r}")
+    return mismatches
+
+
+def bench(func, corpus: list, repeat: int) -> float:
+    """返回处理整个语料一遍的平均耗时（秒）"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for html in corpus:
+            func(html)
+    return (time.perf_counter() - start) / repeat
+
+
+def main(args):
+    corpus = load_corpus(args.corpus_dir)
+
+    if args.fuzz:
+        rng = random.Random(args.seed)
+        fuzz_corpus = [_random_html(rng) for _ in range(args.fuzz)]
+        print(f"🎲 模糊校验 {len(fuzz_corpus)} 个随机样本...")
+        if verify(fuzz_corpus):
+            sys.exit(1)
+
+    total_bytes = sum(len(html.encode("utf-8")) for html in corpus)
+    print(f"📚 语料: {len(corpus)} 篇, {total_bytes / 1024:.1f} KB")
+
+    mismatches = verify(corpus)
+    if mismatches:
+        print(f"❌ {mismatches} 个样本输出不一致")
+        sys.exit(1)
+    print("✅ 输出逐字节一致")
+
+    bs4_time = bench(clean_html_bs4, corpus, args.repeat)
+    lxml_time = bench(clean_html, corpus, args.repeat)
+
+    print(f"\n{'实现':<12}{'耗时/轮 (ms)':>16}{'吞吐 (MB/s)':>16}")
+    for name, elapsed in [("bs4", bs4_time), ("lxml", lxml_time)]:
+        throughput = total_bytes / 1024 / 1024 / elapsed if elapsed else 0
+        print(f"{name:<12}{elapsed * 1000:>16.2f}{throughput:>16.2f}")
+    print(f"\n🚀 加速比: {bs4_time / lxml_time:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HTML清理器基准测试")
+    parser.add_argument("--corpus-dir", type=str, default=None, help="额外语料目录（.html 或微信缓存 .json）")
+    parser.add_argument("--repeat", type=int, default=10, help="重复轮数 (默认: 10)")
+    parser.add_argument("--fuzz", type=int, default=0, help="随机样本校验数量 (默认: 0)")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子 (默认: 42)")
+
+    args = parser.parse_args()
+    main(args)
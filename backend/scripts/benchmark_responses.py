@@ -0,0 +1,130 @@
+"""文章接口响应基准测试：序列化耗时（jsonable_encoder + json vs orjson）和传输字节数（原始 / gzip / br）
+
+用法:
+    python scripts/benchmark_responses.py
+    python scripts/benchmark_responses.py --corpus-dir cache/wechat_articles --repeat 50
+
+语料为合成的微信长文章（与 benchmark_html_cleaner.py 相同的结构）加上目录中的 .html / 微信缓存 .json 文件。
+会先校验两种序列化的输出逐字节一致；未安装 brotli 包时跳过 br。
+"""
+
+import argparse
+import gzip
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+
+from app.config import settings
+from app.schemas import ArticleDetail, ArticleListItem, ArticleListResponse
+from app.services.cache_service import encode_json
+from app.utils.compression import brotli
+from scripts.benchmark_html_cleaner import load_corpus
+
+
+def _detail(idx: int, html: str) -> ArticleDetail:
+    return ArticleDetail(
+        id=idx,
+        title=f"第{idx}篇 医药新闻标题",
+        summary="临床试验数据显示，新药在主要终点上达到统计学显著改善。",
+        author="医药观察",
+        source_name="药渡云",
+        category="临床",
+        tags=["临床试验", "新药", "肿瘤"],
+        published_at=datetime(2025, 11, 3, 9, 30),
+        content_url=f"https://www.pharnexcloud.com/zixun/{idx}",
+        content_text=html,
+        content_html=html,
+        content_source="wechat",
+        translated_content_html=None,
+        ai_analysis={"analysis": "该研究为晚期患者提供了新的治疗选择。" * 10},
+    )
+
+
+def _list_page(size: int) -> ArticleListResponse:
+    return ArticleListResponse(
+        data=[
+            ArticleListItem(
+                id=i,
+                title=f"第{i}篇 医药新闻标题",
+                summary="临床试验数据显示，新药在主要终点上达到统计学显著改善。" * 3,
+                author="医药观察",
+                source_name="药渡云",
+                category="临床",
+                tags=["临床试验", "新药"],
+                published_at=datetime(2025, 11, 3, 9, 30),
+            )
+            for i in range(size)
+        ],
+        pagination={"total": 5000, "page": 1, "page_size": size, "next_cursor": None, "has_more": True},
+    )
+
+
+def encode_stdlib(response) -> bytes:
+    """旧路径：jsonable_encoder + json.dumps（与 JSONResponse 相同）"""
+    return json.dumps(
+        jsonable_encoder(response), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def bench(func, payloads: list, repeat: int) -> float:
+    """返回处理全部负载一遍的平均耗时（秒）"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for payload in payloads:
+            func(payload)
+    return (time.perf_counter() - start) / repeat
+
+
+def main(args):
+    corpus = [html for html in load_corpus(args.corpus_dir) if len(html) >= 1000]
+    payloads = {
+        "detail": [_detail(idx, html) for idx, html in enumerate(corpus)],
+        "list": [_list_page(args.page_size)],
+    }
+
+    compressors = {"gzip": lambda body: gzip.compress(body, settings.COMPRESSION_GZIP_LEVEL)}
+    if brotli is not None:
+        compressors["br"] = lambda body: brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    else:
+        print("⚠️  未安装 brotli 包，跳过 br")
+
+    for name, responses in payloads.items():
+        bodies = [encode_stdlib(response) for response in responses]
+        mismatches = sum(encode_json(response) != body for response, body in zip(responses, bodies))
+        if mismatches:
+            print(f"❌ {name}: {mismatches} 个响应的 orjson 输出与 JSONResponse 不一致")
+            sys.exit(1)
+
+        raw_bytes = sum(len(body) for body in bodies)
+        print(f"\n📦 {name}: {len(responses)} 个响应, {raw_bytes / 1024:.1f} KB（输出逐字节一致）")
+
+        stdlib_time = bench(encode_stdlib, responses, args.repeat)
+        orjson_time = bench(encode_json, responses, args.repeat)
+        print(f"{'序列化':<22}{'耗时/个 (ms)':>16}")
+        for label, elapsed in [("jsonable_encoder+json", stdlib_time), ("orjson", orjson_time)]:
+            print(f"{label:<22}{elapsed * 1000 / len(responses):>16.3f}")
+        print(f"🚀 加速比: {stdlib_time / orjson_time:.1f}x")
+
+        print(f"{'编码':<22}{'字节数 (KB)':>16}{'压缩率':>10}{'耗时/个 (ms)':>16}")
+        print(f"{'identity':<22}{raw_bytes / 1024:>16.1f}{'1.00x':>10}{0:>16.3f}")
+        for label, compress in compressors.items():
+            wire_bytes = sum(len(compress(body)) for body in bodies)
+            elapsed = bench(compress, bodies, args.repeat)
+            ratio = raw_bytes / wire_bytes if wire_bytes else 0
+            print(f"{label:<22}{wire_bytes / 1024:>16.1f}{ratio:>9.2f}x{elapsed * 1000 / len(bodies):>16.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="文章接口响应序列化和压缩基准测试")
+    parser.add_argument("--corpus-dir", type=str, default=None, help="额外语料目录（.html 或微信缓存 .json）")
+    parser.add_argument("--repeat", type=int, default=20, help="重复轮数 (默认: 20)")
+    parser.add_argument("--page-size", type=int, default=20, help="列表每页条数 (默认: 20)")
+
+    args = parser.parse_args()
+    main(args)
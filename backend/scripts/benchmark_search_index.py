@@ -0,0 +1,104 @@
+"""内存倒排索引基准测试：构建耗时、倒排表压缩率、top-10 查询延迟（单核）
+
+用法:
+    python scripts/benchmark_search_index.py
+    python scripts/benchmark_search_index.py --chunks 1000000 --queries 5000
+
+语料为合成的中文分块（字频按 Zipf 分布，每篇文章一个标题+摘要文档和若干 300 字分块），
+查询取自随机分块中的 2-6 个连续汉字（与用户输入的检索词长度相近）。
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from app.services.search_index import SearchIndex, _SegmentBuilder
+
+CHUNK_CHARS = 300
+CHUNKS_PER_ARTICLE = 8
+
+
+def make_corpus(chunks: int, seed: int):
+    """{文章ID: [(分块ID, 文本)]}，总文档数约为 chunks"""
+    rng = np.random.default_rng(seed)
+    alphabet = np.array([chr(code) for code in range(0x4E00, 0x4E00 + 4000)])
+    weights = 1.0 / np.arange(1, len(alphabet) + 1)
+    weights /= weights.sum()
+
+    def text(length):
+        return "".join(rng.choice(alphabet, size=length, p=weights))
+
+    corpus = {}
+    chunk_id = 0
+    for article_id in range(1, chunks // (CHUNKS_PER_ARTICLE + 1) + 2):
+        docs = [(None, f"{text(20)}\n{text(80)}")]
+        for _ in range(CHUNKS_PER_ARTICLE):
+            chunk_id += 1
+            docs.append((chunk_id, text(CHUNK_CHARS)))
+        corpus[article_id] = docs
+        if chunk_id >= chunks:
+            break
+    return corpus
+
+
+def main(args):
+    print(f"📚 生成约 {args.chunks} 个文档的合成语料...")
+    corpus = make_corpus(args.chunks, args.seed)
+
+    start = time.perf_counter()
+    builder = _SegmentBuilder()
+    builder.add_articles(corpus)
+    arrays = builder.finish()
+    build_time = time.perf_counter() - start
+
+    documents = len(arrays["doc_article"])
+    postings = int(arrays["term_postings"][-1])
+    index = SearchIndex("unused")
+    index._install(arrays, {"documents": documents, "terms": len(arrays["terms"])})
+
+    print(f"🏗️  构建: {documents} 个文档, {len(arrays['terms'])} 个词, {postings} 个倒排项, 耗时 {build_time:.1f}s")
+    print(
+        f"🗜️  倒排表: varint {len(arrays['postings']) / 1024 / 1024:.1f} MB"
+        f"（uint32 为 {postings * 4 / 1024 / 1024:.1f} MB, {postings * 4 / len(arrays['postings']):.2f}x）"
+        f" + 词频 {postings / 1024 / 1024:.1f} MB"
+    )
+
+    rng = random.Random(args.seed)
+    chunk_texts = [text for docs in corpus.values() for _, text in docs[1:]]
+    queries = []
+    for _ in range(args.queries):
+        text = rng.choice(chunk_texts)
+        length = rng.randint(2, 6)
+        offset = rng.randrange(len(text) - length)
+        queries.append(text[offset:offset + length])
+
+    for query in queries[:50]:
+        index.search(query, 10)  # 预热
+
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query, 10)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    latencies = np.array(latencies)
+    print(f"\n🔍 {len(queries)} 次 top-10 查询（ms）")
+    for label, value in [("p50", np.percentile(latencies, 50)), ("p90", np.percentile(latencies, 90)),
+                         ("p99", np.percentile(latencies, 99)), ("max", latencies.max())]:
+        print(f"{label:<6}{value:>10.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="内存倒排索引基准测试")
+    parser.add_argument("--chunks", type=int, default=100000, help="文档数 (默认: 100000)")
+    parser.add_argument("--queries", type=int, default=2000, help="查询次数 (默认: 2000)")
+    parser.add_argument("--seed", type=int, default=7, help="随机种子")
+
+    args = parser.parse_args()
+    main(args)
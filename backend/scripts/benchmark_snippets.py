@@ -0,0 +1,87 @@
+"""检索结果摘要片段基准测试：按整篇正文正则扫描 vs 命中分块 + 偏移量截取
+
+用法:
+    python scripts/benchmark_snippets.py
+    python scripts/benchmark_snippets.py --page-size 50 --body-chars 50000
+
+旧做法是每条结果用查询词正则扫描整篇 content_text 再截取窗口；
+app/utils/snippets.py 只处理命中的 ~300 字分块（match_spans 对每个查询词 str.find 得到偏移量），一页结果只分词一次查询。
+"""
+
+import argparse
+import html
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.utils.snippets import SNIPPET_CHARS, build_snippets
+from app.utils.text_splitter import split_text
+
+SENTENCES = [
+    "研究人员在晚期非小细胞肺癌患者中评估了该药物的安全性和有效性。",
+    "主要终点为无进展生存期，次要终点包括总生存期和客观缓解率。",
+    "司美格鲁肽在减重适应症上的临床试验数据显示体重平均下降15%。",
+    "该公司宣布其PD-1抑制剂获得国家药监局批准上市。",
+    "GLP-1受体激动剂的市场规模预计将在未来五年内持续增长。",
+    "不良事件主要为轻中度胃肠道反应，未发现新的安全性信号。",
+]
+
+QUERIES = ["临床试验", "司美格鲁肽 减重", "PD-1 抑制剂", "GLP-1 市场", "安全性"]
+
+
+def make_body(rng: random.Random, chars: int) -> str:
+    parts, length = [], 0
+    while length < chars:
+        sentence = rng.choice(SENTENCES)
+        parts.append(sentence)
+        length += len(sentence)
+    return "".join(parts)
+
+
+def snippet_regex_full_text(body: str, query: str) -> str:
+    """旧做法：每条结果编译查询词正则，扫描整篇正文，取第一个匹配附近的窗口"""
+    pattern = re.compile("|".join(re.escape(term) for term in query.split()), re.IGNORECASE)
+    text = " ".join(body.split())
+    matches = list(pattern.finditer(text))
+    start = max(0, matches[0].start() - SNIPPET_CHARS // 2) if matches else 0
+    window = text[start:start + SNIPPET_CHARS]
+    return pattern.sub(lambda m: f"<em>{m.group(0)}</em>", html.escape(window, quote=False))
+
+
+def main(args):
+    rng = random.Random(args.seed)
+    bodies = [make_body(rng, args.body_chars) for _ in range(args.page_size)]
+    # 命中的分块：与 analyze_and_embed.py 相同的切分，取每篇的一个分块
+    chunks = [rng.choice(split_text(body, chunk_size=300, overlap=50)) for body in bodies]
+
+    def bench(func) -> float:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for query in QUERIES:
+                func(query)
+        return (time.perf_counter() - start) / (args.repeat * len(QUERIES))
+
+    old = bench(lambda query: [snippet_regex_full_text(body, query) for body in bodies])
+    new = bench(lambda query: build_snippets(chunks, query))
+
+    print(f"📄 每页 {args.page_size} 条结果，正文 {args.body_chars} 字，{len(QUERIES)} 个查询 × {args.repeat} 轮")
+    print(f"{'做法':<28}{'耗时/页 (ms)':>16}")
+    print(f"{'正则扫描整篇正文':<28}{old * 1000:>16.3f}")
+    print(f"{'命中分块 + 偏移量':<28}{new * 1000:>16.3f}")
+    print(f"🚀 加速比: {old / new:.1f}x")
+    print(f"\n示例: {build_snippets(chunks[:1], QUERIES[0])[0]}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="检索结果摘要片段基准测试")
+    parser.add_argument("--page-size", type=int, default=10, help="每页结果数 (默认: 10)")
+    parser.add_argument("--body-chars", type=int, default=10000, help="正文字数 (默认: 10000)")
+    parser.add_argument("--repeat", type=int, default=50, help="重复轮数 (默认: 50)")
+    parser.add_argument("--seed", type=int, default=7, help="随机种子")
+
+    args = parser.parse_args()
+    main(args)
@@ -0,0 +1,43 @@
+"""从数据库全量构建内存倒排索引快照（标题/摘要/正文分块）
+
+用法:
+    python scripts/build_search_index.py                      # 写入 SEARCH_INDEX_PATH
+    python scripts/build_search_index.py --path /data/search_index
+
+API 进程的定时任务会发现新快照并重新加载（合并此前的内存增量段）；建议每天低峰期运行一次。
+"""
+
+import asyncio
+import sys
+import argparse
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.config import settings
+from app.database import get_db_context
+from app.services.search_index import build_snapshot_arrays, write_snapshot
+
+
+async def main(args):
+    """主函数：构建并写入快照"""
+    started = time.perf_counter()
+    async with get_db_context() as db:
+        arrays, meta = await build_snapshot_arrays(db)
+    write_snapshot(Path(args.path), arrays, meta)
+
+    print(
+        f"🎉 快照已写入 {args.path}：{meta['articles']} 篇文章，{meta['documents']} 个文档，"
+        f"{meta['terms']} 个词，倒排表 {meta['posting_bytes'] / 1024 / 1024:.1f} MB，"
+        f"耗时 {time.perf_counter() - started:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="构建内存倒排索引快照")
+    parser.add_argument("--path", default=settings.SEARCH_INDEX_PATH, help=f"快照目录 (默认: {settings.SEARCH_INDEX_PATH})")
+
+    args = parser.parse_args()
+
+    asyncio.run(main(args))
@@ -1,18 +1,44 @@
-"""从药渡云爬取文章并存入数据库（集成微信公众号爬取）"""
+"""从药渡云爬取文章并存入数据库（集成微信公众号爬取）
+
+入库按阶段组成流水线（app/utils/pipeline.py），每个阶段有独立的队列和并发数：
+
+    fetch   → 爬取药渡云详情页和微信原文
+    clean   → 提取纯文本、计算哈希和SimHash指纹
+    dedup   → 精确去重 + URL更新检测 + 近似重复检测（串行，避免同批次重复文章同时通过）
+    enrich  → 上传原始内容、转存图片、精简HTML
+    store   → 写入数据库（新建、恢复已删除文章或升级已有文章的版本）
+    analyze → AI分析（ENABLE_ANALYZE_EMBED）
+    embed   → 文本分块和向量嵌入（ENABLE_ANALYZE_EMBED）
+
+各阶段并发数见 settings.INGEST_STAGE_CONCURRENCY，结束时打印各阶段吞吐量和队列深度。
+"""
 
 import asyncio
 import sys
 import hashlib
+import uuid
 import argparse
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime, timedelta
+from typing import Callable, List, Optional, Set
 
 sys.path.append(str(Path(__file__).parent.parent))
 
 from sqlalchemy import select
+from sqlalchemy.orm import undefer_group
 from app.database import get_db_context
-from app.models import Article, Source
+from app.models import Article, Source, CONTENT_GROUP
 from app.utils.html_cleaner import clean_html
+from app.utils.html_sanitizer import sanitize_html
+from app.utils.pipeline import Pipeline, Stage
+from app.services.image_rehost_service import create_image_rehoster
+from app.services.page_archive_service import PageArchive
+from app.services.dedup_service import near_duplicate_index
+from app.services.dead_letter_service import DatabaseDeadLetterStore
+from app.services.cache_service import article_cache
+from app.services.article_version_service import find_article_by_url, apply_update
+from app.utils.simhash import hamming_distance
 from app.utils.s3_client import get_s3_client
 from app.utils import timezone as tz
 from app.config import settings
@@ -22,154 +48,404 @@ from crawler.wechat_crawler import WechatArticleCrawler
 # 配置选项
 ENABLE_WECHAT_CRAWL = True  # 是否启用微信公众号爬取
 WECHAT_CRAWL_DELAY = 10  # 微信爬取间隔（秒）
-
-
-async def ingest_articles(articles: list):
-    """将爬取的文章存入数据库（包含微信公众号内容）"""
-    s3_client = get_s3_client()
-    pharnex_crawler = PharnexCrawler()
-    wechat_crawler = WechatArticleCrawler(
-        headless=True,
-        rate_limit_delay=WECHAT_CRAWL_DELAY
-    ) if ENABLE_WECHAT_CRAWL else None
-
-    async with get_db_context() as db:
-        # 获取数据源
-        result = await db.execute(select(Source).where(Source.name == "药渡云"))
-        source = result.scalar_one_or_none()
+ENABLE_IMAGE_REHOST = True  # 入库前把文章图片转存到附件桶（需要配置 S3_PUBLIC_URL，未配置时跳过）
+ENABLE_HTML_SANITIZE = True  # 入库前精简HTML（属性白名单 + 样式类合并）
+ENABLE_ANALYZE_EMBED = False  # 入库后直接做AI分析和向量嵌入（否则由 analyze_and_embed.py 处理）
+
+
+@dataclass
+class IngestItem:
+    """流水线中的一篇文章"""
+    article_data: dict
+    content_html: str = ""
+    content_text: str = ""
+    content_source: str = "pharnexcloud"
+    original_source_url: Optional[str] = None
+    wechat_html: Optional[str] = None
+    wechat_text: Optional[str] = None
+    canonical_hash: str = ""
+    fingerprint: Optional[int] = None
+    deleted_article_id: Optional[int] = None
+    updated_article_id: Optional[int] = None  # 同一URL的已有文章（内容有变化，升级版本）
+    article_id: Optional[int] = None
+    stored: Optional[asyncio.Future] = None  # 入库完成后的文章ID（失败为None），供同批次去重等待
+
+    @property
+    def title(self) -> str:
+        return self.article_data["title"]
+
+    def article_values(self) -> dict:
+        """写入 Article 的字段（新建、恢复和升级版本共用）"""
+        return {
+            "title": self.article_data["title"],
+            "summary": self.article_data.get("summary", ""),
+            "author": self.article_data.get("author", "药渡云"),
+            "category": self.article_data.get("category", "前沿研究"),
+            "tags": self.article_data.get("tags", []),
+            "published_at": self.article_data["published_at"],
+            "content_url": self.article_data["url"],
+            "content_text": self.content_text,
+            "content_html": self.content_html,
+            "content_source": self.content_source,
+            "original_source_url": self.original_source_url or None,
+        }
+
+    def settle(self):
+        """结束入库（成功或失败），唤醒等待本文章结果的重复检测"""
+        if self.stored is not None and not self.stored.done():
+            self.stored.set_result(self.article_id)
+
+
+class IngestPipeline:
+    """文章入库流水线（由现有的爬取、清洗、去重、转存、入库和AI处理函数组成）"""
+
+    def __init__(
+        self,
+        page_archive: PageArchive = None,
+        on_report: Callable[[dict], None] = None,
+        dead_letter_store=None
+    ):
+        self.s3_client = get_s3_client()
+        self.pharnex_crawler = PharnexCrawler(page_archive=page_archive)
+        self.wechat_crawler = WechatArticleCrawler(
+            headless=True,
+            rate_limit_delay=WECHAT_CRAWL_DELAY,
+            page_archive=page_archive
+        ) if ENABLE_WECHAT_CRAWL else None
+        self.image_rehoster = create_image_rehoster(self.s3_client) if ENABLE_IMAGE_REHOST else None
+        self.source_id: Optional[int] = None
+        # 已通过去重、尚未入库的文章
+        self._inflight: List[IngestItem] = []
+        # 已入库或确认重复的文章URL（之前的失败记录可以标记为已解决）
+        self.settled_urls: Set[str] = set()
+
+        concurrency = settings.ingest_stage_concurrency
+        handlers = [
+            ("fetch", self.fetch),
+            ("clean", self.clean),
+            ("dedup", self.dedup),
+            ("enrich", self.enrich),
+            ("store", self.store),
+        ]
+        if ENABLE_ANALYZE_EMBED:
+            handlers += [("analyze", self.analyze), ("embed", self.embed)]
+
+        stages = [
+            Stage(
+                name,
+                handler,
+                # 去重阶段必须串行
+                concurrency=1 if name == "dedup" else concurrency.get(name, 1),
+                queue_size=settings.INGEST_QUEUE_SIZE
+            )
+            for name, handler in handlers
+        ]
+        self.pipeline = Pipeline(stages, dead_letter_store=dead_letter_store, on_report=on_report)
+
+    async def run(self, articles: list) -> list:
+        """运行流水线，返回成功入库的文章"""
+        async with get_db_context() as db:
+            result = await db.execute(select(Source).where(Source.name == "药渡云"))
+            source = result.scalar_one_or_none()
         if not source:
             print("❌ 未找到数据源 '药渡云'，请先运行 init_db.py")
-            return
-
-        for article_data in articles:
+            return []
+        self.source_id = source.id
+
+        self._inflight = []
+        self.settled_urls = set()
+        # 详情页共用一个浏览器，不再每篇文章启动一次
+        await self.pharnex_crawler.start()
+        try:
+            return await self.pipeline.run(IngestItem(article_data=data) for data in articles)
+        finally:
+            await self.pharnex_crawler.close()
+
+    async def fetch(self, item: IngestItem) -> IngestItem:
+        """
+        爬取药渡云详情页（包含微信原文链接提取）和微信原文
+
+        详情页加载失败或没有正文时抛出异常，文章进入死信等待重试
+        """
+        print(f"\n📝 处理文章: {item.title}")
+
+        content_html, content_text, original_source_url = await self.pharnex_crawler.crawl_detail_page(
+            item.article_data["url"]
+        )
+        await asyncio.sleep(1)  # 请求限流
+
+        if not content_text:
+            raise ValueError(f"详情页没有正文: {item.article_data['url']}")
+
+        item.content_html = content_html
+        item.content_text = content_text
+        item.original_source_url = original_source_url
+
+        # 如果找到微信原文链接且启用了微信爬取
+        if original_source_url and self.wechat_crawler:
+            print(f"  🔗 发现微信原文链接，尝试爬取...")
             try:
-                print(f"\n📝 处理文章: {article_data['title']}")
-
-                # 爬取药渡云详情页（包含微信原文链接提取）
-                content_html, content_text, original_source_url = await pharnex_crawler.crawl_detail_page(
-                    article_data["url"]
-                )
-
-                if not content_text:
-                    print(f"⚠️  未找到内容，跳过")
-                    continue
-
-                # 清理内容
-                content_text = clean_html(content_html) if content_html else content_text
-
-                # 初始化内容源标记
-                content_source = "pharnexcloud"
-
-                # 如果找到微信原文链接且启用了微信爬取
-                if original_source_url and wechat_crawler:
-                    print(f"  🔗 发现微信原文链接，尝试爬取...")
-                    try:
-                        wechat_article = await wechat_crawler.crawl_with_retry(
-                            original_source_url,
-                            max_retries=2  # 最多重试2次
-                        )
-
-                        if wechat_article:
-                            wechat_content_html = wechat_article.get('content_html')
-                            wechat_content_text = wechat_article.get('content_text')
-                            content_source = "wechat"
-                            print(f"  ✅ 成功爬取微信内容 ({len(wechat_content_text)} 字符)")
-
-                            # 使用微信内容作为主内容（如果更完整）
-                            if wechat_content_text and len(wechat_content_text) > len(content_text):
-                                content_text = wechat_content_text
-                                content_html = wechat_content_html
-                                print(f"  ℹ️  使用微信内容作为主内容")
-                        else:
-                            print(f"  ⚠️  微信爬取失败，降级使用药渡云内容")
-
-                    except Exception as e:
-                        print(f"  ⚠️  微信爬取出错: {e}，降级使用药渡云内容")
-
-                # 计算去重哈希
-                canonical_hash = hashlib.sha256(content_text.encode()).hexdigest()
-
-                # 检查未删除的文章是否已存在
-                active_result = await db.execute(
-                    select(Article).where(
-                        Article.canonical_hash == canonical_hash,
-                        Article.is_deleted == False
-                    )
+                wechat_article = await self.wechat_crawler.crawl_with_retry(
+                    original_source_url,
+                    max_retries=2  # 最多重试2次
                 )
-                active_article = active_result.scalar_one_or_none()
 
-                if active_article:
-                    print(f"  ⏭️  文章已存在: {active_article.title}")
-                    continue
+                if wechat_article:
+                    item.content_source = "wechat"
+                    item.wechat_html = wechat_article.get('content_html')
+                    item.wechat_text = wechat_article.get('content_text')
+                    print(f"  ✅ 成功爬取微信内容 ({len(item.wechat_text)} 字符)")
+                else:
+                    print(f"  ⚠️  微信爬取失败，降级使用药渡云内容")
 
-                # 检查已删除的文章
-                deleted_result = await db.execute(
-                    select(Article).where(
-                        Article.canonical_hash == canonical_hash,
-                        Article.is_deleted == True
-                    )
+            except Exception as e:
+                print(f"  ⚠️  微信爬取出错: {e}，降级使用药渡云内容")
+
+        return item
+
+    async def clean(self, item: IngestItem) -> IngestItem:
+        """清理内容，选择主内容，计算去重哈希和指纹"""
+        if item.content_html:
+            item.content_text = await asyncio.to_thread(clean_html, item.content_html)
+
+        # 使用微信内容作为主内容（如果更完整）
+        if item.wechat_text and len(item.wechat_text) > len(item.content_text):
+            item.content_text = item.wechat_text
+            item.content_html = item.wechat_html
+            print(f"  ℹ️  使用微信内容作为主内容: {item.title}")
+
+        item.canonical_hash = hashlib.sha256(item.content_text.encode()).hexdigest()
+        if settings.NEAR_DUP_ENABLED:
+            item.fingerprint = await asyncio.to_thread(near_duplicate_index.fingerprint, item.content_text)
+        return item
+
+    async def dedup(self, item: IngestItem) -> Optional[IngestItem]:
+        """精确去重、URL更新检测和近似重复检测（包括同批次中尚未入库的文章）"""
+        # 同批次中尚未入库的文章：等它入库后再按簇记录
+        for other in self._inflight:
+            if other.stored.done():
+                continue
+            same = other.canonical_hash == item.canonical_hash
+            near = (
+                item.fingerprint is not None and other.fingerprint is not None
+                and hamming_distance(item.fingerprint, other.fingerprint) <= near_duplicate_index.max_distance
+            )
+            if same or near:
+                await other.stored
+
+        async with get_db_context() as db:
+            # 检查未删除的文章是否已存在
+            active_result = await db.execute(
+                select(Article).where(
+                    Article.canonical_hash == item.canonical_hash,
+                    Article.is_deleted == False
                 )
-                deleted_article = deleted_result.scalar_one_or_none()
-
-                # 生成文章ID用于S3存储
-                article_id = f"article_{int(tz.now().timestamp() * 1000)}"
-
-                # 上传到S3
-                s3_key_raw = f"{article_id}/original.html"
-                s3_key_clean = f"{article_id}/cleaned.txt"
+            )
+            active_article = active_result.scalar_one_or_none()
+
+            if active_article:
+                print(f"  ⏭️  文章已存在: {active_article.title}")
+                self.settled_urls.add(item.article_data["url"])
+                return None
+
+            if settings.NEAR_DUP_ENABLED and await near_duplicate_index.is_recorded(db, item.canonical_hash):
+                print(f"  ⏭️  已记录为近似重复，跳过: {item.title}")
+                self.settled_urls.add(item.article_data["url"])
+                return None
+
+            # 检查已删除的文章
+            deleted_result = await db.execute(
+                select(Article.id).where(
+                    Article.canonical_hash == item.canonical_hash,
+                    Article.is_deleted == True
+                )
+            )
+            item.deleted_article_id = deleted_result.scalar_one_or_none()
+
+            # 同一URL的文章内容有变化：升级已有文章的版本，而不是新建一篇
+            if settings.ARTICLE_VERSIONING_ENABLED and item.deleted_article_id is None:
+                current = await find_article_by_url(db, item.article_data["url"])
+                if current is not None:
+                    item.updated_article_id = current.id
+                    print(f"  🆕 文章内容已更新，升级版本: {current.title} (v{current.version_no})")
+
+            # 近似重复检测：同一报道换了页脚/来源再次发布时归入已有文章的簇
+            if item.fingerprint is not None and item.deleted_article_id is None and item.updated_article_id is None:
+                match = await near_duplicate_index.find(db, item.fingerprint)
+                if match:
+                    cluster_article_id, distance = match
+                    near_duplicate_index.record_duplicate(
+                        db,
+                        cluster_article_id,
+                        distance,
+                        item.article_data,
+                        item.canonical_hash,
+                        item.content_source,
+                        item.original_source_url,
+                    )
+                    await db.commit()
+                    print(f"  🔁 近似重复（距离 {distance}），归入文章 {cluster_article_id} 的簇: {item.title}")
+                    self.settled_urls.add(item.article_data["url"])
+                    return None
+
+        item.stored = asyncio.get_running_loop().create_future()
+        self._inflight.append(item)
+        return item
+
+    async def enrich(self, item: IngestItem) -> IngestItem:
+        """上传原始内容到S3，转存图片并精简HTML"""
+        try:
+            # 生成文章ID用于S3存储（enrich 并发执行，时间戳会重复，用随机ID）
+            article_id = f"article_{uuid.uuid4().hex}"
+
+            s3_key_raw = f"{article_id}/original.html"
+            s3_key_clean = f"{article_id}/cleaned.txt"
+
+            await asyncio.to_thread(
+                self.s3_client.upload_text, item.content_html or "", settings.S3_BUCKET_RAW, s3_key_raw
+            )
+            await asyncio.to_thread(
+                self.s3_client.upload_text, item.content_text, settings.S3_BUCKET_CLEAN, s3_key_clean
+            )
+
+            # 图片转存到附件桶，改写为我们自己的地址
+            if self.image_rehoster and item.content_html:
+                async with get_db_context() as db:
+                    item.content_html = await self.image_rehoster.rehost_html(item.content_html, db)
+                    await db.commit()
 
-                s3_client.upload_text(content_html or "", settings.S3_BUCKET_RAW, s3_key_raw)
-                s3_client.upload_text(content_text, settings.S3_BUCKET_CLEAN, s3_key_clean)
+            # 原始HTML已归档到S3，数据库只保存精简后的HTML
+            if ENABLE_HTML_SANITIZE and item.content_html:
+                raw_size = len(item.content_html)
+                item.content_html = await asyncio.to_thread(sanitize_html, item.content_html)
+                print(f"  🧹 HTML精简: {raw_size} -> {len(item.content_html)} 字符")
+        except Exception:
+            item.settle()
+            raise
+
+        return item
+
+    async def store(self, item: IngestItem) -> IngestItem:
+        """写入数据库（新建文章、恢复已删除文章或升级已有文章的版本）"""
+        try:
+            async with get_db_context() as db:
+                if item.updated_article_id is not None:
+                    # 记录上一版本，标记AI分析和分块待重新处理
+                    article = await db.get(
+                        Article, item.updated_article_id, options=[undefer_group(CONTENT_GROUP)]
+                    )
+                    await apply_update(db, article, item.article_values(), item.canonical_hash)
+                    article.crawled_at = tz.now()
+                    if item.fingerprint is not None:
+                        await near_duplicate_index.add(db, article.id, item.fingerprint)
 
-                if deleted_article:
+                    await db.commit()
+                    print(f"  🆕 已更新到 v{article.version_no}: {article.title} (ID: {article.id})")
+                elif item.deleted_article_id is not None:
                     # 更新已删除文章的数据并恢复
-                    deleted_article.title = article_data["title"]
-                    deleted_article.summary = article_data.get("summary", "")
-                    deleted_article.author = article_data.get("author", "药渡云")
-                    deleted_article.category = article_data.get("category", "前沿研究")
-                    deleted_article.tags = article_data.get("tags", [])
-                    deleted_article.published_at = article_data["published_at"]
-                    deleted_article.content_url = article_data["url"]
-                    deleted_article.content_text = content_text
-                    deleted_article.content_html = content_html
-                    deleted_article.content_source = content_source
-                    deleted_article.original_source_url = original_source_url or None
-                    deleted_article.crawled_at = tz.now()
-                    deleted_article.is_deleted = False  # 恢复文章
+                    article = await db.get(Article, item.deleted_article_id)
+                    for name, value in item.article_values().items():
+                        setattr(article, name, value)
+                    article.crawled_at = tz.now()
+                    article.is_deleted = False  # 恢复文章
+                    if item.fingerprint is not None:
+                        await near_duplicate_index.add(db, article.id, item.fingerprint)
 
                     await db.commit()
-                    await db.refresh(deleted_article)
-
-                    print(f"  ♻️  恢复并更新已删除文章: {deleted_article.title} (ID: {deleted_article.id})")
+                    print(f"  ♻️  恢复并更新已删除文章: {article.title} (ID: {article.id})")
                 else:
                     # 创建新文章记录
                     article = Article(
-                        title=article_data["title"],
-                        summary=article_data.get("summary", ""),
-                        author=article_data.get("author", "药渡云"),
-                        source_id=source.id,
-                        category=article_data.get("category", "前沿研究"),
-                        tags=article_data.get("tags", []),
-                        published_at=article_data["published_at"],
-                        content_url=article_data["url"],
-                        content_text=content_text,
-                        content_html=content_html,
-                        content_source=content_source,
-                        original_source_url=original_source_url or None,
-                        canonical_hash=canonical_hash,
+                        **item.article_values(),
+                        source_id=self.source_id,
+                        canonical_hash=item.canonical_hash,
                     )
 
                     db.add(article)
+                    if item.fingerprint is not None:
+                        await db.flush()
+                        await near_duplicate_index.add(db, article.id, item.fingerprint)
                     await db.commit()
-                    await db.refresh(article)
+                    print(f"  ✅ 已入库: {article.title} (ID: {article.id}, 来源: {item.content_source})")
 
-                    print(f"  ✅ 已入库: {article.title} (ID: {article.id}, 来源: {content_source})")
-                await asyncio.sleep(1)  # 请求限流
+            item.article_id = article.id
+            self.settled_urls.add(item.article_data["url"])
+        finally:
+            item.settle()
 
-            except Exception as e:
-                print(f"  ❌ 处理文章出错: {e}")
-                await db.rollback()
-                continue
+        # 让文章接口的缓存失效（新文章只影响列表）
+        if item.updated_article_id is not None or item.deleted_article_id is not None:
+            await article_cache.invalidate_article(item.article_id)
+        else:
+            await article_cache.invalidate_lists()
+
+        return item
+
+    async def analyze(self, item: IngestItem) -> IngestItem:
+        """AI分析（复用 analyze_and_embed.py）"""
+        from scripts.analyze_and_embed import analyze_and_store
+
+        async with get_db_context() as db:
+            article = await db.get(Article, item.article_id, options=[undefer_group(CONTENT_GROUP)])
+            await analyze_and_store(article, db)
+            await db.commit()
+        await article_cache.invalidate_article(item.article_id, lists=False)
+        return item
+
+    async def embed(self, item: IngestItem) -> IngestItem:
+        """文本分块和向量嵌入（复用 analyze_and_embed.py）"""
+        from scripts.analyze_and_embed import embed_and_store
+
+        async with get_db_context() as db:
+            article = await db.get(Article, item.article_id, options=[undefer_group(CONTENT_GROUP)])
+            await embed_and_store(article, db)
+            await db.commit()
+        return item
+
+
+async def ingest_articles(
+    articles: list,
+    page_archive: PageArchive = None,
+    on_report: Callable[[dict], None] = None,
+    dead_letter_store: DatabaseDeadLetterStore = None
+) -> dict:
+    """
+    将爬取的文章存入数据库（包含微信公众号内容）
+
+    page_archive: 可选的页面归档器，详情页和微信原文的原始HTML会写入归档
+    on_report: 可选的回调，运行期间定期收到各阶段指标
+    dead_letter_store: 失败文章的去处，默认写入 ingest_failures 表等待重试
+
+    返回: 各阶段指标（见 Pipeline.report）
+    """
+    dead_letter_store = dead_letter_store or DatabaseDeadLetterStore()
+    ingest = IngestPipeline(
+        page_archive=page_archive,
+        on_report=on_report,
+        dead_letter_store=dead_letter_store
+    )
+    stored = await ingest.run(articles)
+    if ingest.source_id is None:
+        return {}
+
+    print(f"\n📈 流水线指标（入库 {len(stored)} 篇）:")
+    print(ingest.pipeline.format_report())
+
+    if dead_letter_store.letters:
+        print(f"\n❌ {len(dead_letter_store.letters)} 篇文章处理失败（已记录，等待重试）:")
+        for letter in dead_letter_store.letters:
+            print(f"  - [{letter.stage}] {letter.item.title}: {letter.error}")
+
+    # 之前失败、这次入库成功（或确认重复）的文章不再重试；其他文章的记录保持不变
+    try:
+        await dead_letter_store.resolve(ingest.settled_urls)
+    except Exception as e:
+        print(f"⚠️  更新失败记录出错: {e}")
+
+    if ingest.image_rehoster:
+        print(f"\n🖼️  图片转存统计: {ingest.image_rehoster.stats}")
+
+    return ingest.pipeline.report()
 
 
 async def main(args):
@@ -200,24 +476,33 @@ async def main(args):
     if args.max_articles:
         print(f"📊 文章数限制: {args.max_articles} 篇")
 
-    # 爬取文章
-    crawler = PharnexCrawler(headless=True)
-    articles = await crawler.crawl_multiple_pages(
-        num_pages=args.pages,
-        max_articles=args.max_articles,
-        from_date=from_date,
-        to_date=to_date
-    )
+    # 原始页面归档（用于离线重新解析，见 scripts/reextract_archive.py）
+    page_archive = PageArchive() if settings.PAGE_ARCHIVE_ENABLED else None
+
+    try:
+        # 爬取文章
+        crawler = PharnexCrawler(headless=True, page_archive=page_archive)
+        articles = await crawler.crawl_multiple_pages(
+            num_pages=args.pages,
+            max_articles=args.max_articles,
+            from_date=from_date,
+            to_date=to_date
+        )
 
-    print(f"\n📊 共爬取 {len(articles)} 篇文章")
-    print("💾 开始存入数据库...")
+        print(f"\n📊 共爬取 {len(articles)} 篇文章")
+        print("💾 开始存入数据库...")
 
-    await ingest_articles(articles)
+        await ingest_articles(articles, page_archive)
+    finally:
+        if page_archive:
+            await page_archive.close()
+        await article_cache.close()
 
     print("\n🎉 爬取和入库完成！")
     print("\n💡 提示:")
     print("  - 如需禁用微信爬取，修改 ENABLE_WECHAT_CRAWL = False")
     print("  - 如需调整微信爬取间隔，修改 WECHAT_CRAWL_DELAY")
+    print("  - 如需保留原始HTML入库，修改 ENABLE_HTML_SANITIZE = False")
 
 
 if __name__ == "__main__":
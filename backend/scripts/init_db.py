@@ -10,6 +10,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 from sqlalchemy import text
 from app.database import engine
 from app.config import settings
+from app.utils.fulltext import CJK_FUNCTIONS_SQL
 
 
 SQL_STATEMENTS = [
@@ -36,6 +37,10 @@ async def init_database():
         print("🔧 Installing pgvector extension...")
         await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector;"))
 
+        # Full-text search functions used by the articles.search_vector generated column
+        for function_sql in CJK_FUNCTIONS_SQL:
+            await conn.execute(text(function_sql))
+
         # Step 2: Import models and create tables
         from app.models import Base
 
@@ -0,0 +1,50 @@
+"""数据库迁移：添加文章列表游标分页的部分索引 (published_at, id) WHERE NOT is_deleted"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from app.database import engine
+
+
+async def migrate():
+    """在线创建索引（CONCURRENTLY 不锁表，需要在事务外执行）"""
+    print("🚀 开始数据库迁移...")
+
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        print("📋 创建 idx_articles_active_published_id 索引...")
+        await conn.execute(text(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_articles_active_published_id "
+            "ON articles (published_at, id) WHERE NOT is_deleted"
+        ))
+        await conn.execute(text("ANALYZE articles"))
+
+        print("✅ 迁移完成！")
+
+
+async def rollback():
+    """回滚：删除索引"""
+    print("⚠️  开始回滚...")
+
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("DROP INDEX CONCURRENTLY IF EXISTS idx_articles_active_published_id"))
+
+        print("✅ 回滚完成！")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rollback", action="store_true", help="回滚迁移")
+    args = parser.parse_args()
+
+    if args.rollback:
+        asyncio.run(rollback())
+    else:
+        asyncio.run(migrate())
@@ -0,0 +1,80 @@
+"""数据库迁移：添加文章全文检索（cjk_bigrams / cjk_index_terms 函数、search_vector 生成列和 GIN 索引）
+
+添加生成列会重写 articles 表（为每篇文章计算检索向量），期间锁表，建议在低峰期执行。
+索引用 CONCURRENTLY 在线创建。
+
+已有的 search_vector 若仍是旧表达式（只有二元词，单字查询匹配不到段末字），会删除后按新表达式重建。
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from app.database import engine
+from app.utils.fulltext import CJK_FUNCTIONS_SQL, DROP_CJK_FUNCTIONS_SQL, SEARCH_VECTOR_SQL
+
+
+async def migrate():
+    """创建分词函数和生成列，然后在线创建 GIN 索引"""
+    print("🚀 开始数据库迁移...")
+
+    async with engine.begin() as conn:
+        print("📋 创建 cjk_bigrams / cjk_index_terms 函数...")
+        for function_sql in CJK_FUNCTIONS_SQL:
+            await conn.execute(text(function_sql))
+
+        expression = (await conn.execute(text(
+            "SELECT pg_get_expr(d.adbin, d.adrelid) FROM pg_attrdef d "
+            "JOIN pg_attribute a ON a.attrelid = d.adrelid AND a.attnum = d.adnum "
+            "WHERE d.adrelid = 'articles'::regclass AND a.attname = 'search_vector'"
+        ))).scalar()
+        if expression is not None and "cjk_index_terms" not in expression:
+            print("📋 删除旧的 search_vector 生成列（连同索引）...")
+            await conn.execute(text("ALTER TABLE articles DROP COLUMN search_vector"))
+
+        print("📋 添加 search_vector 生成列（重写 articles 表）...")
+        await conn.execute(text(
+            "ALTER TABLE articles ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED"
+        ))
+
+    # CONCURRENTLY 不锁表，需要在事务外执行
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        print("📋 创建 idx_articles_search_vector 索引...")
+        await conn.execute(text(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_articles_search_vector "
+            "ON articles USING GIN (search_vector)"
+        ))
+        await conn.execute(text("ANALYZE articles"))
+
+        print("✅ 迁移完成！")
+
+
+async def rollback():
+    """回滚：删除索引、生成列和分词函数"""
+    print("⚠️  开始回滚...")
+
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP INDEX IF EXISTS idx_articles_search_vector"))
+        await conn.execute(text("ALTER TABLE articles DROP COLUMN IF EXISTS search_vector"))
+        for drop_sql in DROP_CJK_FUNCTIONS_SQL:
+            await conn.execute(text(drop_sql))
+
+        print("✅ 回滚完成！")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rollback", action="store_true", help="回滚迁移")
+    args = parser.parse_args()
+
+    if args.rollback:
+        asyncio.run(rollback())
+    else:
+        asyncio.run(migrate())
@@ -0,0 +1,60 @@
+"""数据库迁移：添加文章版本表和AI分析/向量分块的过期标记"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from app.database import engine
+from app.models import Base
+
+MIGRATION_SQLS = [
+    "ALTER TABLE article_ai_outputs ADD COLUMN IF NOT EXISTS is_stale BOOLEAN NOT NULL DEFAULT false",
+    "ALTER TABLE article_chunks ADD COLUMN IF NOT EXISTS is_stale BOOLEAN NOT NULL DEFAULT false",
+    "CREATE INDEX IF NOT EXISTS ix_article_chunks_is_stale ON article_chunks (is_stale)",
+    "CREATE INDEX IF NOT EXISTS ix_articles_content_url ON articles (content_url)",
+]
+
+
+async def migrate():
+    """添加 article_versions 表、is_stale 字段和 content_url 索引"""
+    print("🚀 开始数据库迁移...")
+
+    async with engine.begin() as conn:
+        # 创建表
+        print("📋 创建 article_versions 表...")
+        await conn.run_sync(Base.metadata.create_all)
+
+        print("📋 添加 is_stale 字段和 content_url 索引...")
+        for sql in MIGRATION_SQLS:
+            await conn.execute(text(sql))
+
+        print("✅ 迁移完成！")
+
+
+async def rollback():
+    """回滚：删除 article_versions 表、is_stale 字段和 content_url 索引"""
+    print("⚠️  开始回滚...")
+
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP TABLE IF EXISTS article_versions CASCADE"))
+        await conn.execute(text("DROP INDEX IF EXISTS ix_articles_content_url"))
+        await conn.execute(text("ALTER TABLE article_chunks DROP COLUMN IF EXISTS is_stale"))
+        await conn.execute(text("ALTER TABLE article_ai_outputs DROP COLUMN IF EXISTS is_stale"))
+
+        print("✅ 回滚完成！")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rollback", action="store_true", help="回滚迁移")
+    args = parser.parse_args()
+
+    if args.rollback:
+        asyncio.run(rollback())
+    else:
+        asyncio.run(migrate())
@@ -0,0 +1,63 @@
+"""数据库迁移：添加分面过滤索引
+
+- idx_articles_tags_gin：标签包含（tags @> ），init_db.py 新建的库已有
+- idx_articles_author：作者过滤（只索引未删除的文章）
+- idx_ai_outputs_entities_gin：AI实体包含（entities @> ，jsonb_path_ops）
+
+索引用 CONCURRENTLY 在线创建，不锁表。
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from app.database import engine
+
+INDEXES = [
+    ("idx_articles_tags_gin", "ON articles USING GIN (tags)"),
+    ("idx_articles_author", "ON articles (author) WHERE NOT is_deleted"),
+    ("idx_ai_outputs_entities_gin", "ON article_ai_outputs USING GIN (entities jsonb_path_ops)"),
+]
+
+
+async def migrate():
+    """在线创建分面过滤索引"""
+    print("🚀 开始数据库迁移...")
+
+    # CONCURRENTLY 不锁表，需要在事务外执行
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        for name, definition in INDEXES:
+            print(f"📋 创建 {name} 索引...")
+            await conn.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} {definition}"))
+        await conn.execute(text("ANALYZE articles"))
+        await conn.execute(text("ANALYZE article_ai_outputs"))
+
+        print("✅ 迁移完成！")
+
+
+async def rollback():
+    """回滚：删除本次新增的索引（保留 init_db.py 创建的标签索引）"""
+    print("⚠️  开始回滚...")
+
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP INDEX IF EXISTS idx_articles_author"))
+        await conn.execute(text("DROP INDEX IF EXISTS idx_ai_outputs_entities_gin"))
+
+        print("✅ 回滚完成！")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rollback", action="store_true", help="回滚迁移")
+    args = parser.parse_args()
+
+    if args.rollback:
+        asyncio.run(rollback())
+    else:
+        asyncio.run(migrate())
@@ -0,0 +1,214 @@
+"""离线重新解析：从页面归档中读取原始HTML，用当前解析/清洗逻辑重新生成文章内容
+
+不访问药渡云和微信，适用于修改了解析器、清洗或精简规则后批量刷新已入库文章。
+内容有变化的文章与重新爬取时一样升级版本（article_version_service.apply_update）：
+记录上一版本，纯文本变化时AI分析和分块标记为待重新处理。
+图片通过 image_assets 索引复用已转存的地址，不会重新下载；dry-run 时只按索引改写，
+不下载、不上传新图片。
+
+用法:
+    python scripts/reextract_archive.py --dry-run          # 只统计会变更的文章
+    python scripts/reextract_archive.py --workers 4 --limit 500
+"""
+
+import asyncio
+import sys
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import select
+from sqlalchemy.orm import undefer_group
+from app.database import get_db_context
+from app.models import Article, PageArchiveRecord, CONTENT_GROUP
+from app.utils.html_cleaner import clean_html
+from app.utils.html_sanitizer import sanitize_html
+from app.utils.s3_client import get_s3_client
+from app.services.image_rehost_service import create_image_rehoster
+from app.services.dedup_service import near_duplicate_index
+from app.services.cache_service import article_cache
+from app.services.article_version_service import apply_update
+from app.services.page_archive_service import (
+    read_records,
+    PAGE_KIND_PHARNEX_DETAIL,
+    PAGE_KIND_WECHAT_ARTICLE,
+)
+
+# 与 crawl_and_ingest.py 保持一致
+ENABLE_IMAGE_REHOST = True
+ENABLE_HTML_SANITIZE = True
+
+
+def _extract(page_kind: str, url: str, html: str) -> Optional[Tuple[str, str]]:
+    """
+    解析一个归档页面（在子进程中执行）
+
+    Returns:
+        (content_html, content_text)；解析失败时返回None
+    """
+    if page_kind == PAGE_KIND_PHARNEX_DETAIL:
+        from crawler.pharnex_crawler import PharnexCrawler
+
+        content_html, content_text, _ = PharnexCrawler().parse_detail_html(html)
+        if not content_text:
+            return None
+        return content_html, clean_html(content_html) if content_html else content_text
+
+    if page_kind == PAGE_KIND_WECHAT_ARTICLE:
+        from crawler.wechat_crawler import WechatArticleCrawler
+
+        article = WechatArticleCrawler().parse_article_html(html, url)
+        if not article or not article.get("content_text"):
+            return None
+        return article["content_html"], article["content_text"]
+
+    return None
+
+
+async def _latest_records(db, urls: set) -> Dict[Tuple[str, str], PageArchiveRecord]:
+    """按 (url, page_kind) 取最新一次归档"""
+    if not urls:
+        return {}
+
+    result = await db.execute(
+        select(PageArchiveRecord)
+        .where(
+            PageArchiveRecord.url.in_(urls),
+            PageArchiveRecord.page_kind.in_([PAGE_KIND_PHARNEX_DETAIL, PAGE_KIND_WECHAT_ARTICLE])
+        )
+        .distinct(PageArchiveRecord.url, PageArchiveRecord.page_kind)
+        .order_by(PageArchiveRecord.url, PageArchiveRecord.page_kind, PageArchiveRecord.fetched_at.desc())
+    )
+    return {(r.url, r.page_kind): r for r in result.scalars().all()}
+
+
+async def reextract(batch_size: int, workers: int, limit: Optional[int], dry_run: bool):
+    """按ID分批重新解析文章"""
+    s3_client = get_s3_client()
+    image_rehoster = create_image_rehoster(s3_client) if ENABLE_IMAGE_REHOST else None
+    loop = asyncio.get_running_loop()
+    stats = {"articles": 0, "no_archive": 0, "failed": 0, "unchanged": 0, "conflict": 0, "updated": 0}
+    last_id = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        async with get_db_context() as db:
+            while limit is None or stats["articles"] < limit:
+                size = batch_size if limit is None else min(batch_size, limit - stats["articles"])
+                result = await db.execute(
+                    select(Article)
+                    .where(Article.id > last_id, Article.content_url.isnot(None))
+                    .options(undefer_group(CONTENT_GROUP))
+                    .order_by(Article.id)
+                    .limit(size)
+                )
+                articles = result.scalars().all()
+                if not articles:
+                    break
+                last_id = articles[-1].id
+                stats["articles"] += len(articles)
+                updated_ids = []
+
+                urls = {a.content_url for a in articles} | {
+                    a.original_source_url for a in articles if a.original_source_url
+                }
+                records = await _latest_records(db, urls)
+
+                # 按分段批量下载（同步S3客户端，放在线程中执行）
+                pages = await asyncio.to_thread(
+                    lambda: list(read_records(records.values(), s3_client))
+                )
+                parsed = await asyncio.gather(*(
+                    loop.run_in_executor(pool, _extract, record.page_kind, record.url, html)
+                    for record, html in pages
+                ))
+                extracted = {
+                    (record.url, record.page_kind): content
+                    for (record, _), content in zip(pages, parsed)
+                }
+
+                for article in articles:
+                    if (article.content_url, PAGE_KIND_PHARNEX_DETAIL) not in records:
+                        stats["no_archive"] += 1
+                        continue
+
+                    pharnex = extracted.get((article.content_url, PAGE_KIND_PHARNEX_DETAIL))
+                    if not pharnex:
+                        stats["failed"] += 1
+                        continue
+                    content_html, content_text = pharnex
+
+                    # 与入库时相同的选择规则：微信内容更完整时使用微信内容
+                    if article.content_source == "wechat" and article.original_source_url:
+                        wechat = extracted.get((article.original_source_url, PAGE_KIND_WECHAT_ARTICLE))
+                        if wechat and len(wechat[1]) > len(content_text):
+                            content_html, content_text = wechat
+
+                    if image_rehoster and content_html:
+                        content_html = await image_rehoster.rehost_html(content_html, db, download=not dry_run)
+                    if ENABLE_HTML_SANITIZE and content_html:
+                        content_html = sanitize_html(content_html)
+
+                    if content_html == article.content_html and content_text == article.content_text:
+                        stats["unchanged"] += 1
+                        continue
+
+                    canonical_hash = hashlib.sha256(content_text.encode()).hexdigest()
+                    if canonical_hash != article.canonical_hash:
+                        duplicate = await db.execute(
+                            select(Article.id).where(
+                                Article.canonical_hash == canonical_hash,
+                                Article.id != article.id
+                            )
+                        )
+                        if duplicate.scalar_one_or_none() is not None:
+                            print(f"  ⚠️  文章 {article.id} 重新解析后与其他文章内容重复，跳过")
+                            stats["conflict"] += 1
+                            continue
+
+                    stats["updated"] += 1
+                    if not dry_run:
+                        await apply_update(
+                            db, article, {"content_html": content_html, "content_text": content_text}, canonical_hash
+                        )
+                        updated_ids.append(article.id)
+                        fingerprint = near_duplicate_index.fingerprint(content_text)
+                        if fingerprint is not None:
+                            await near_duplicate_index.add(db, article.id, fingerprint)
+
+                if dry_run:
+                    await db.rollback()
+                else:
+                    await db.commit()
+                    # 正文不出现在列表中，只让详情缓存失效
+                    await article_cache.invalidate_articles(updated_ids, lists=False)
+                # 释放已处理的对象，避免大字段常驻内存
+                db.expunge_all()
+
+                print(f"  ✅ 已处理至 ID {last_id}，累计变更 {stats['updated']} 篇")
+
+    print("\n📊 重新解析报告" + ("（dry-run，未写库）" if dry_run else ""))
+    print(f"  文章数: {stats['articles']}")
+    print(f"  无归档: {stats['no_archive']}")
+    print(f"  解析失败: {stats['failed']}")
+    print(f"  内容未变: {stats['unchanged']}")
+    print(f"  哈希冲突: {stats['conflict']}")
+    print(f"  {'可' if dry_run else '已'}更新: {stats['updated']}")
+    if image_rehoster:
+        print(f"\n🖼️  图片转存统计: {image_rehoster.stats}")
+    await article_cache.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="从页面归档离线重新解析文章")
+    parser.add_argument("--batch-size", type=int, default=100, help="每批处理文章数 (默认: 100)")
+    parser.add_argument("--workers", type=int, default=None, help="解析进程数 (默认: CPU核数)")
+    parser.add_argument("--limit", type=int, default=None, help="最多处理文章数 (可选)")
+    parser.add_argument("--dry-run", action="store_true", help="只输出报告，不写数据库")
+
+    args = parser.parse_args()
+
+    asyncio.run(reextract(args.batch_size, args.workers, args.limit, args.dry_run))
@@ -0,0 +1,49 @@
+"""重试入库失败的文章（ingest_failures 表中已到期的记录）
+
+用法:
+    python scripts/retry_failed_ingests.py                  # 重试所有到期记录
+    python scripts/retry_failed_ingests.py --requeue        # 先把 abandoned 记录重新排队
+    python scripts/retry_failed_ingests.py --batch-size 10 --max-batches 3
+"""
+
+import asyncio
+import sys
+import argparse
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.config import settings
+from app.services.dead_letter_service import retry_failed_ingests, requeue_failures
+from app.services.page_archive_service import PageArchive
+
+
+async def main(args):
+    """主函数：分批重试失败的文章入库"""
+    if args.requeue:
+        requeued = await requeue_failures()
+        print(f"📋 重新排队 {requeued} 条已放弃的记录")
+
+    page_archive = PageArchive() if settings.PAGE_ARCHIVE_ENABLED else None
+    try:
+        stats = await retry_failed_ingests(
+            batch_size=args.batch_size,
+            max_batches=args.max_batches,
+            page_archive=page_archive
+        )
+    finally:
+        if page_archive:
+            await page_archive.close()
+
+    print(f"\n🎉 重试完成！共重试 {stats['retried']} 篇，成功 {stats['resolved']} 篇，仍失败 {stats['failed']} 篇")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="重试入库失败的文章")
+    parser.add_argument("--batch-size", type=int, default=None, help=f"每批文章数 (默认: {settings.INGEST_RETRY_BATCH_SIZE})")
+    parser.add_argument("--max-batches", type=int, default=None, help="最多批数 (默认: 处理完所有到期记录)")
+    parser.add_argument("--requeue", action="store_true", help="先重新排队所有已放弃（abandoned）的记录")
+
+    args = parser.parse_args()
+
+    asyncio.run(main(args))
@@ -0,0 +1,128 @@
+"""测试公共配置
+
+需要数据库的测试使用 TEST_DATABASE_URL 指向的 PostgreSQL（需要 pgvector 扩展），
+每个测试重新建表；未设置时跳过这些测试。例如：
+
+    TEST_DATABASE_URL=postgresql+asyncpg://postgres@localhost:5432/medical_news_test python -m pytest -q
+"""
+
+import os
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import NullPool
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def db_engine():
+    """空的测试库（所有表重新创建）"""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    from app.database import Base
+    from app.utils.fulltext import CJK_FUNCTIONS_SQL
+    import app.models  # noqa: F401  注册所有表
+
+    engine = create_async_engine(TEST_DATABASE_URL, poolclass=NullPool)
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+        for function_sql in CJK_FUNCTIONS_SQL:
+            await conn.execute(text(function_sql))
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def db_sessionmaker(db_engine):
+    return async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest.fixture
+def statements(db_engine):
+    """测试期间执行的SQL语句（before_cursor_execute）"""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(db_engine.sync_engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(db_engine.sync_engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+async def client(db_sessionmaker, monkeypatch):
+    """
+    接口客户端：请求使用测试库，不经过 Redis 响应缓存
+
+    进程内的计数缓存和数据源名称缓存在每个测试开始时清空
+    """
+    from app.database import get_db
+    from app.main import app
+    from app.services.cache_service import article_cache
+    from app.services.source_service import source_name_cache
+    from app.utils.pagination import article_count_cache
+
+    async def get_test_db():
+        async with db_sessionmaker() as session:
+            yield session
+
+    monkeypatch.setattr(article_cache, "enabled", False)
+    article_count_cache.clear()
+    source_name_cache.invalidate()
+    app.dependency_overrides[get_db] = get_test_db
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+        yield http
+    app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.fixture
+def seed_articles(db_sessionmaker):
+    """写入 count 篇文章（轮流属于 sources 个数据源），返回文章ID（从新到旧）"""
+    from app.models import Article, ArticleAIOutput, Source
+
+    async def seed(count: int, sources: int = 3):
+        async with db_sessionmaker() as db:
+            source_rows = [Source(name=f"数据源{i}", name_en=f"source-{i}") for i in range(sources)]
+            db.add_all(source_rows)
+            await db.flush()
+
+            published = datetime(2025, 1, 1)
+            articles = [
+                Article(
+                    title=f"文章{i}",
+                    summary=f"摘要{i}",
+                    author="药渡云",
+                    source_id=source_rows[i % sources].id,
+                    category="前沿研究",
+                    tags=["GLP-1"],
+                    published_at=published + timedelta(hours=i),
+                    content_text="正文" * 2000,
+                    content_html="<p>" + "正文" * 2000 + "</p>",
+                    translated_content_html="<p>" + "text" * 2000 + "</p>",
+                    canonical_hash=f"hash-{i}",
+                )
+                for i in range(count)
+            ]
+            db.add_all(articles)
+            await db.flush()
+            db.add_all(
+                ArticleAIOutput(article_id=article.id, version_no=1, summary=f"分析{article.id}", entities={})
+                for article in articles
+            )
+            await db.commit()
+            return [article.id for article in reversed(articles)]
+
+    return seed
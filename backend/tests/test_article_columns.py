@@ -0,0 +1,65 @@
+"""列表接口不读取正文字段；未声明加载的正文字段访问时直接报错"""
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import undefer_group
+
+from app.api import articles as public_articles
+from app.api.admin import articles as admin_articles
+from app.models import Article, CONTENT_GROUP
+from app.services.facet_service import ArticleFilters
+
+CONTENT_COLUMNS = ("content_text", "content_html", "translated_content_html")
+
+
+def _selects_content(statement: str) -> bool:
+    select_list = statement.split(" FROM ", 1)[0]
+    return any(column in select_list for column in CONTENT_COLUMNS)
+
+
+def _compile(query) -> str:
+    return str(query.compile(dialect=postgresql.dialect()))
+
+
+def test_list_queries_do_not_select_content_columns():
+    public = public_articles._list_query(public_articles.LIST_COLUMNS, ArticleFilters())
+    admin = select(*admin_articles.LIST_COLUMNS)
+
+    assert not _selects_content(_compile(public))
+    assert not _selects_content(_compile(admin))
+    # 整行查询默认也不带正文
+    assert not _selects_content(_compile(select(Article)))
+    assert all(column in _compile(select(Article).options(undefer_group(CONTENT_GROUP))) for column in CONTENT_COLUMNS)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("url", ["/v1/articles?page_size=50", "/v1/admin/articles/?page_size=50"])
+async def test_list_endpoints_do_not_fetch_content(client, statements, seed_articles, url):
+    await seed_articles(50)
+    statements.clear()
+
+    response = await client.get(url)
+
+    assert response.status_code == 200, response.text
+    assert statements
+    assert not any(_selects_content(statement) for statement in statements)
+
+
+@pytest.mark.anyio
+async def test_unloaded_content_access_raises(db_sessionmaker, seed_articles):
+    article_id = (await seed_articles(1))[0]
+
+    async with db_sessionmaker() as db:
+        article = (await db.execute(select(Article).where(Article.id == article_id))).scalar_one()
+        assert article.title
+        for column in CONTENT_COLUMNS:
+            with pytest.raises(InvalidRequestError):
+                getattr(article, column)
+
+    async with db_sessionmaker() as db:
+        article = (await db.execute(
+            select(Article).where(Article.id == article_id).options(undefer_group(CONTENT_GROUP))
+        )).scalar_one()
+        assert article.content_html.startswith("<p>")
@@ -0,0 +1,54 @@
+"""文章接口的查询次数与文章数无关（数据源名称来自缓存，不逐篇查询）"""
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def _count_queries(client, statements, url):
+    statements.clear()
+    response = await client.get(url)
+    assert response.status_code == 200, response.text
+    return len(statements), response.json()
+
+
+async def test_list_query_count_does_not_grow_with_page_size(client, statements, seed_articles):
+    await seed_articles(60)
+
+    small, body = await _count_queries(client, statements, "/v1/articles?page_size=5")
+    assert len(body["data"]) == 5
+    # 再次加载数据源缓存，两次请求的条件相同
+    from app.services.source_service import source_name_cache
+    from app.utils.pagination import article_count_cache
+    source_name_cache.invalidate()
+    article_count_cache.clear()
+    large, body = await _count_queries(client, statements, "/v1/articles?page_size=50")
+    assert len(body["data"]) == 50
+
+    assert small == large
+    # 总数、校验器窗口、列表、数据源
+    assert large <= 4
+    assert {item["source_name"] for item in body["data"]} == {"数据源0", "数据源1", "数据源2"}
+
+
+async def test_list_reuses_cached_source_names(client, statements, seed_articles):
+    await seed_articles(30)
+    await client.get("/v1/articles?page_size=10")
+
+    count, _ = await _count_queries(client, statements, "/v1/articles?page_size=30&with_total=false")
+
+    # 校验器窗口和列表，不再查询 sources
+    assert count == 2
+    assert not any("FROM sources" in statement for statement in statements)
+
+
+async def test_batch_query_count_does_not_grow_with_ids(client, statements, seed_articles):
+    ids = await seed_articles(40)
+    from app.services.source_service import source_name_cache
+
+    small, _ = await _count_queries(client, statements, f"/v1/articles/batch?ids={','.join(map(str, ids[:2]))}")
+    source_name_cache.invalidate()
+    large, body = await _count_queries(client, statements, f"/v1/articles/batch?ids={','.join(map(str, ids[:40]))}")
+
+    assert [item["id"] for item in body["data"]] == ids[:40]
+    assert small == large
@@ -0,0 +1,35 @@
+"""全文检索分词：单字查询能匹配只出现在段末的字"""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+
+from app.models import Article
+from app.utils.fulltext import build_tsquery, index_terms, tokenize
+
+
+def test_index_terms_add_run_final_characters():
+    assert tokenize("临床试验 GLP-1 药") == ["临床", "床试", "试验", "glp", "1", "药"]
+    assert index_terms("临床试验 GLP-1 药") == ["临床", "床试", "试验", "glp", "1", "药", "验"]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("query, matched", [
+    ("验", True),
+    ("临", True),
+    ("试验", True),
+    ("临床试验", True),
+    ("试验 GLP", True),
+    ("床", True),
+    ("药", False),
+])
+async def test_tsquery_matches_run_final_character(db_sessionmaker, query, matched):
+    async with db_sessionmaker() as db:
+        db.add(Article(title="临床试验进展", summary="GLP-1 三期试验", content_text="", canonical_hash="h",
+                       published_at=datetime(2025, 1, 1)))
+        await db.commit()
+
+        found = (await db.execute(select(Article.id).where(Article.search_vector.op("@@")(build_tsquery(query))))).all()
+
+    assert bool(found) is matched
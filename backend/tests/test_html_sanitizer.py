@@ -0,0 +1,53 @@
+"""HTML 清洗：内联样式写入 <style> 块时不能注入标记或全局规则"""
+
+from app.utils.html_sanitizer import normalize_style, sanitize_html
+
+
+def test_style_cannot_close_the_style_block():
+    html = '<p style="color: red</style><img src=x onerror=alert(1)>">text</p>'
+
+    result = sanitize_html(html)
+
+    assert "onerror" not in result
+    assert "</style><img" not in result
+    assert result == "<p>text</p>"
+
+
+def test_style_cannot_inject_global_rules():
+    html = '<p style="color:red}body{display:none">text</p><p style="font-size:15px">more</p>'
+
+    result = sanitize_html(html)
+
+    assert "body{" not in result and "display" not in result
+    assert result.startswith("<style>.mn")
+    assert result.count("{") == 1
+
+
+def test_normalize_style_keeps_plain_values_only():
+    assert normalize_style("color: rgb(51, 51, 51); font-size: 15px !important") == (
+        "color:rgb(51, 51, 51);font-size:15px !important"
+    )
+    for value in ["red\\7d", "red/*x*/", "url(http://x)", "expression(alert(1))", "@import"]:
+        assert normalize_style(f"color:{value}") == ""
+
+
+def test_urls_are_allowlisted():
+    html = (
+        '<iframe src="data:text/html,&lt;script&gt;alert(1)&lt;/script&gt;"></iframe>'
+        '<a href="java\tscript:alert(1)">a</a>'
+        '<a href="mailto:x@example.com">b</a>'
+        '<a href="https://example.com/x">c</a>'
+        '<a href="//example.com/y">d</a>'
+        '<a href="/z?a=1:2">e</a>'
+        '<img src="data:image/png;base64,AAAA">'
+        '<a href="data:image/png;base64,AAAA">f</a>'
+    )
+
+    result = sanitize_html(html)
+
+    assert "data:text" not in result and "script" not in result and "mailto" not in result
+    assert 'href="https://example.com/x"' in result
+    assert 'href="//example.com/y"' in result
+    assert 'href="/z?a=1:2"' in result
+    assert '<img src="data:image/png;base64,AAAA">' in result
+    assert result.count("data:image") == 1
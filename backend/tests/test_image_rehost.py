@@ -0,0 +1,224 @@
+"""图片转存：本地HTTP服务模拟图片源站"""
+
+import io
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from PIL import Image
+
+from app.config import settings
+from app.services import image_rehost_service
+from app.services.image_rehost_service import ImageRehoster
+
+PUBLIC_URL = "https://cdn.example.com"
+
+
+def _png(width: int, height: int) -> bytes:
+    output = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 30, 30)).save(output, format="PNG")
+    return output.getvalue()
+
+
+LARGE_PNG = _png(1500, 300)
+SMALL_PNG = _png(100, 100)
+
+
+class FakeS3Client:
+    """内存中的对象存储"""
+
+    def __init__(self):
+        self.objects = {}
+
+    def object_exists(self, bucket, object_name):
+        return (bucket, object_name) in self.objects
+
+    def upload_bytes(self, data, bucket, object_name, content_type):
+        self.objects[(bucket, object_name)] = (data, content_type)
+        return True
+
+    def get_public_url(self, bucket, object_name):
+        return f"{PUBLIC_URL}/{bucket}/{object_name}"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    routes = {}
+
+    def do_GET(self):
+        self.server.hits.append(self.path)
+        status, headers, body = self.routes.get(self.path, (404, {}, b""))
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.hits = []
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    _StubHandler.routes = {
+        "/large.png": (200, {"Content-Type": "image/png"}, LARGE_PNG),
+        "/large-copy.png": (200, {"Content-Type": "image/png"}, LARGE_PNG),
+        "/small?wx_fmt=png": (200, {"Content-Type": "application/octet-stream"}, SMALL_PNG),
+        "/page.html": (200, {"Content-Type": "text/html"}, b"<html></html>"),
+        "/logo.svg": (200, {"Content-Type": "image/svg+xml"}, b"<svg onload='alert(1)'/>"),
+        "/moved.png": (302, {"Location": "/large.png"}, b""),
+        "/to-internal.png": (302, {"Location": "http://127.0.0.2/secret.png"}, b""),
+    }
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield base, server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def rehoster(monkeypatch):
+    monkeypatch.setattr(settings, "S3_PUBLIC_URL", PUBLIC_URL)
+    monkeypatch.setattr(settings, "IMAGE_VARIANT_WIDTH", 750)
+    return ImageRehoster(FakeS3Client(), concurrency=2)
+
+
+@pytest.fixture
+def allow_stub_host(monkeypatch):
+    """本地服务在回环地址上，只放行 127.0.0.1"""
+    monkeypatch.setattr(image_rehost_service, "_is_public_ip", lambda address: address == "127.0.0.1")
+
+
+@pytest.mark.anyio
+async def test_rehost_rewrites_src_and_dedups_by_content(rehoster, stub_server, allow_stub_host):
+    base, server = stub_server
+    html = (
+        f'<p><img src="{base}/large.png"></p>'
+        f'<p><img data-src="{base}/large-copy.png"></p>'
+        f'<p><img src="{base}/small?wx_fmt=png"></p>'
+        f'<p><img src="{base}/large.png"></p>'
+    )
+
+    result = await rehoster.rehost_html(html)
+
+    assert base not in result
+    assert result.count(f"{PUBLIC_URL}/{settings.S3_BUCKET_ATTACHMENTS}/images/") >= 4
+    # 相同URL只下载一次，不同URL的相同内容只存一份（原图 + 缩略图 + 小图）
+    assert sorted(server.hits) == ["/large-copy.png", "/large.png", "/small?wx_fmt=png"]
+    keys = sorted(key for _, key in rehoster.s3_client.objects)
+    assert len(keys) == 3
+    assert any(key.endswith("_w750.png") for key in keys)
+    assert 'srcset="' in result and " 750w, " in result
+    assert rehoster.stats["deduplicated"] >= 1
+
+
+@pytest.mark.anyio
+async def test_rehost_keeps_non_images_and_svg(rehoster, stub_server, allow_stub_host):
+    base, _ = stub_server
+    html = f'<img src="{base}/page.html"><img src="{base}/logo.svg"><img src="{base}/missing.png">'
+
+    result = await rehoster.rehost_html(html)
+
+    assert result == html
+    assert rehoster.s3_client.objects == {}
+    assert rehoster.stats["failed"] == 3
+
+
+@pytest.mark.anyio
+async def test_rehost_follows_public_redirect(rehoster, stub_server, allow_stub_host):
+    base, server = stub_server
+
+    result = await rehoster.rehost_html(f'<img src="{base}/moved.png">')
+
+    assert server.hits == ["/moved.png", "/large.png"]
+    assert f'src="{PUBLIC_URL}/' in result
+
+
+@pytest.mark.anyio
+async def test_rehost_rejects_redirect_to_internal_address(rehoster, stub_server, allow_stub_host):
+    base, server = stub_server
+    html = f'<img src="{base}/to-internal.png">'
+
+    result = await rehoster.rehost_html(html)
+
+    assert result == html
+    assert server.hits == ["/to-internal.png"]
+    assert rehoster.s3_client.objects == {}
+
+
+@pytest.mark.anyio
+async def test_rehost_rejects_loopback(rehoster, stub_server):
+    base, server = stub_server
+    html = f'<img src="{base}/large.png">'
+
+    result = await rehoster.rehost_html(html)
+
+    assert result == html
+    assert server.hits == []
+
+
+@pytest.mark.anyio
+async def test_rehost_rejects_rebinding_to_internal_peer(rehoster, stub_server, monkeypatch):
+    """解析校验时是公网地址，实际连接到的却是内网地址"""
+    base, server = stub_server
+
+    async def resolves_public(url):
+        pass
+
+    monkeypatch.setattr(image_rehost_service, "ensure_public_url", resolves_public)
+    html = f'<img src="{base}/large.png">'
+
+    result = await rehoster.rehost_html(html)
+
+    assert result == html
+    assert rehoster.s3_client.objects == {}
+    assert rehoster.stats["failed"] == 1
+
+
+@pytest.mark.parametrize("address, public", [
+    ("127.0.0.1", False),
+    ("10.1.2.3", False),
+    ("192.168.0.10", False),
+    ("169.254.169.254", False),
+    ("::1", False),
+    ("fe80::1%eth0", False),
+    ("::ffff:127.0.0.1", False),
+    ("203.0.113.5", False),
+    ("93.184.216.34", True),
+    ("2606:2800:220:1:248:1893:25c8:1946", True),
+])
+def test_is_public_ip(address, public):
+    assert image_rehost_service._is_public_ip(address) is public
+
+
+def test_rehoster_requires_public_url(monkeypatch):
+    monkeypatch.setattr(settings, "S3_PUBLIC_URL", "")
+    with pytest.raises(ValueError):
+        ImageRehoster(FakeS3Client())
+
+
+@pytest.mark.anyio
+async def test_rehost_without_download_only_uses_known_results(rehoster, stub_server, allow_stub_host):
+    base, server = stub_server
+    await rehoster.rehost_html(f'<img src="{base}/large.png">')
+    server.hits.clear()
+    uploaded = dict(rehoster.s3_client.objects)
+
+    html = f'<img src="{base}/large.png"><img src="{base}/large-copy.png">'
+    result = await rehoster.rehost_html(html, download=False)
+
+    assert server.hits == []
+    assert rehoster.s3_client.objects == uploaded
+    assert f'src="{PUBLIC_URL}/' in result
+    assert f'src="{base}/large-copy.png"' in result
+
+
+def test_create_rehoster_skips_without_public_url(monkeypatch):
+    monkeypatch.setattr(settings, "S3_PUBLIC_URL", "")
+    assert image_rehost_service.create_image_rehoster(FakeS3Client()) is None
+
+    monkeypatch.setattr(settings, "S3_PUBLIC_URL", PUBLIC_URL)
+    assert isinstance(image_rehost_service.create_image_rehoster(FakeS3Client()), ImageRehoster)
@@ -0,0 +1,58 @@
+"""内存检索索引增量更新：回看窗口内没有变化的文章不重复索引；标记删除过多时重建"""
+
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import update
+
+from app.models import Article, ArticleChunk
+from app.services import search_index as search_index_module
+from app.services.search_index import SearchIndex
+
+pytestmark = pytest.mark.anyio
+
+
+def _dead(index):
+    return index._docs.size - index._docs.alive_count
+
+
+async def test_refresh_skips_articles_already_indexed(db_sessionmaker, seed_articles, tmp_path):
+    ids = await seed_articles(5)
+    index = SearchIndex(str(tmp_path / "search_index"))
+    async with db_sessionmaker() as db:
+        index._install(*await index._build_in_memory(db))
+
+        # 快照水位之后的回看窗口内的文章只重新索引一次
+        assert await index.refresh(db) == 5
+        dead = _dead(index)
+        for _ in range(3):
+            assert await index.refresh(db) == 0
+        assert _dead(index) == dead
+
+        await db.execute(
+            update(Article).where(Article.id == ids[0]).values(updated_at=Article.updated_at + timedelta(seconds=1))
+        )
+        db.add(ArticleChunk(article_id=ids[1], chunk_index=0, chunk_text="新的分块"))
+        await db.commit()
+
+        assert await index.refresh(db) == 2
+        assert await index.refresh(db) == 0
+        assert _dead(index) == dead + 2
+    assert [hit.article_id for hit in index.search("新的分块")] == [ids[1]]
+
+
+async def test_compact_drops_dead_documents(db_sessionmaker, seed_articles, tmp_path, monkeypatch):
+    await seed_articles(5)
+    index = SearchIndex(str(tmp_path / "search_index"))
+    async with db_sessionmaker() as db:
+        index._install(*await index._build_in_memory(db))
+        await index.refresh(db)
+        assert not index.needs_compaction()
+
+        monkeypatch.setattr(search_index_module, "COMPACT_MIN_DEAD_DOCS", 1)
+        assert index.needs_compaction()
+        await index.compact(db)
+
+    assert _dead(index) == 0
+    assert index._delta == {}
+    assert index.report()["documents"] == 5
@@ -0,0 +1,30 @@
+"""HTML 翻译：sanitize_html 生成的样式块不送去翻译"""
+
+import pytest
+
+from app.services import translation_service
+from app.utils.html_sanitizer import sanitize_html
+
+
+@pytest.mark.anyio
+async def test_style_block_is_not_translated(monkeypatch):
+    sent = []
+
+    async def fake_translate(text):
+        sent.append(text)
+        return text.replace("Hello", "你好")
+
+    monkeypatch.setattr(translation_service, "translate_text_to_chinese", fake_translate)
+    html = sanitize_html('<p style="color:red">Hello world</p><p>Second paragraph</p>')
+
+    result = await translation_service.translate_html_content(html)
+
+    assert all("color" not in text for text in sent)
+    assert result.startswith("<style>.mn") and "{color:red}</style>" in result
+    assert "你好 world" in result
+
+
+def test_style_block_does_not_count_as_foreign_text():
+    html = "<style>.mn1a2b3c4d{color:#333;font-size:15px;text-align:center}</style><p>中文正文内容</p>"
+
+    assert translation_service.detect_chinese_content(html)